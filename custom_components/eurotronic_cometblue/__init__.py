@@ -2,34 +2,70 @@
 
 from __future__ import annotations
 
+import asyncio
+from collections.abc import Awaitable, Callable
 from datetime import datetime
 import logging
+from time import monotonic
+from typing import Any
 
 from bleak.exc import BleakError
 from eurotronic_cometblue_ha import AsyncCometBlue
-
-from homeassistant.components.bluetooth import async_ble_device_from_address
-from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import CONF_ADDRESS, CONF_PIN, Platform
+import voluptuous as vol
+
+from homeassistant.components.bluetooth import (
+    BluetoothCallbackMatcher,
+    BluetoothChange,
+    BluetoothScanningMode,
+    BluetoothServiceInfoBleak,
+    async_ble_device_from_address,
+    async_register_callback,
+)
+from homeassistant.config_entries import ConfigEntry, ConfigEntryState
+from homeassistant.const import CONF_ADDRESS, CONF_DEVICES, CONF_PIN, Platform
 from homeassistant.core import (
+    CALLBACK_TYPE,
     HomeAssistant,
     ServiceCall,
     ServiceResponse,
     SupportsResponse,
     callback,
 )
-from homeassistant.exceptions import ConfigEntryError, ConfigEntryNotReady
+from homeassistant.exceptions import (
+    ConfigEntryAuthFailed,
+    ConfigEntryNotReady,
+    ServiceValidationError,
+)
 from homeassistant.helpers import (
     config_validation as cv,
     device_registry as dr,
     entity_registry as er,
     service,
 )
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.entity import Entity
 from homeassistant.helpers.typing import ConfigType
-
-from .const import CONF_ALL_DAYS, DOMAIN
-from .coordinator import CometBlueConfigEntry, CometBlueDataUpdateCoordinator
+from homeassistant.util.hass_dict import HassKey
+
+from .command_queue import async_remove_command_queue
+from .const import (
+    CONF_ALL_DAYS,
+    CONF_FLEET,
+    CONF_PROFILE,
+    DOMAIN,
+    MAX_CONCURRENT_CONNECTIONS,
+    SIGNAL_COORDINATOR_CHANGED,
+)
+from .coordinator import (
+    CometBlueConfigEntry,
+    CometBlueDataUpdateCoordinator,
+    ScheduleWrite,
+)
 from .entity import CometBlueBluetoothEntity
+from .fleet import DATA_FLEET_HEALTH, CometBlueFleetHealth
+from .handoff import async_pop_setup_handoff
+from .schedule import WeekSchedule
+from .schedule_profiles import DATA_SCHEDULE_PROFILES, CometBlueScheduleProfiles
 from .utils import (
     SERVICE_DATETIME_SCHEMA,
     SERVICE_HOLIDAY_SCHEMA,
@@ -42,8 +78,15 @@ PLATFORMS: list[Platform] = [
     Platform.NUMBER,
     Platform.SENSOR,
 ]
+ZONE_PLATFORMS: list[Platform] = [Platform.CLIMATE]
+FLEET_PLATFORMS: list[Platform] = [Platform.SENSOR]
 LOGGER = logging.getLogger(__name__)
 
+# Advertisement callbacks of entries waiting for their device, by entry ID
+DATA_ADVERTISEMENT_WAITERS: HassKey[dict[str, CALLBACK_TYPE]] = HassKey(
+    f"{DOMAIN}_advertisement_waiters"
+)
+
 
 @callback
 def _async_migrate_options_if_missing(hass: HomeAssistant, entry: ConfigEntry) -> None:
@@ -98,41 +141,136 @@ async def _async_migrate_entries(
     return True
 
 
+async def async_migrate_entry(
+    hass: HomeAssistant, config_entry: CometBlueConfigEntry
+) -> bool:
+    """Migrate an entry created by an older version once."""
+    if config_entry.version > 1:
+        # Downgrade from a future version
+        return False
+
+    if config_entry.minor_version < 2:
+        LOGGER.debug(
+            "Migrating %s from version %s.%s",
+            config_entry.title,
+            config_entry.version,
+            config_entry.minor_version,
+        )
+        _async_migrate_options_if_missing(hass, config_entry)
+        await _async_migrate_entries(hass, config_entry)
+        hass.config_entries.async_update_entry(config_entry, minor_version=2)
+
+    return True
+
+
+@callback
+def _async_setup_on_advertisement(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Set up the entry again as soon as its device advertises.
+
+    Without this, a TRV coming into range would only be set up with the
+    next setup retry, which backs off to 80 seconds.
+    """
+    waiters = hass.data.setdefault(DATA_ADVERTISEMENT_WAITERS, {})
+    if entry.entry_id in waiters:
+        return
+
+    @callback
+    def _async_advertisement(
+        service_info: BluetoothServiceInfoBleak, change: BluetoothChange
+    ) -> None:
+        if entry.state is ConfigEntryState.SETUP_IN_PROGRESS:
+            # Setup raises ConfigEntryNotReady right after registering
+            return
+        _async_stop_waiting_for_advertisement(hass, entry)
+        # Unloading a retrying entry doesn't call async_unload_entry
+        if entry.state is ConfigEntryState.SETUP_RETRY:
+            LOGGER.debug(
+                "%s advertised via %s, setting up",
+                service_info.address,
+                service_info.source,
+            )
+            hass.config_entries.async_schedule_reload(entry.entry_id)
+
+    @callback
+    def _async_state_changed() -> None:
+        # Unloading or disabling a retrying entry doesn't call async_unload_entry
+        if entry.state is ConfigEntryState.NOT_LOADED:
+            _async_stop_waiting_for_advertisement(hass, entry)
+
+    unsub_advertisement = async_register_callback(
+        hass,
+        _async_advertisement,
+        BluetoothCallbackMatcher(address=entry.data[CONF_ADDRESS], connectable=True),
+        BluetoothScanningMode.PASSIVE,
+    )
+    unsub_state_changed = entry.async_on_state_change(_async_state_changed)
+
+    @callback
+    def _async_unsub() -> None:
+        unsub_advertisement()
+        # Not while the entry calls its state change listeners
+        hass.loop.call_soon(unsub_state_changed)
+
+    waiters[entry.entry_id] = _async_unsub
+
+
+@callback
+def _async_stop_waiting_for_advertisement(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> None:
+    """Remove the advertisement callback of an entry, if any."""
+    if unsub := hass.data.get(DATA_ADVERTISEMENT_WAITERS, {}).pop(entry.entry_id, None):
+        unsub()
+
+
 async def async_setup_entry(hass: HomeAssistant, entry: CometBlueConfigEntry) -> bool:
     """Set up Eurotronic Comet Blue from a config entry."""
+    if CONF_DEVICES in entry.data:
+        # Zones only control the coordinators of TRV entries
+        await hass.config_entries.async_forward_entry_setups(entry, ZONE_PLATFORMS)
+        return True
+    if CONF_FLEET in entry.data:
+        await hass.config_entries.async_forward_entry_setups(entry, FLEET_PLATFORMS)
+        return True
 
-    _async_migrate_options_if_missing(hass, entry)
-
-    await _async_migrate_entries(hass, entry)
+    setup_start = monotonic()
 
     address = entry.data[CONF_ADDRESS]
 
     ble_device = async_ble_device_from_address(hass, entry.data[CONF_ADDRESS])
 
     if not ble_device:
+        _async_setup_on_advertisement(hass, entry)
         raise ConfigEntryNotReady(
             f"Couldn't find a nearby device for address: {entry.data[CONF_ADDRESS]}"
         )
 
+    _async_stop_waiting_for_advertisement(hass, entry)
+
     cometblue_device = AsyncCometBlue(
         device=ble_device,
         pin=int(entry.data[CONF_PIN]),
     )
-    try:
-        async with cometblue_device:
-            ble_device_info = await cometblue_device.get_device_info_async()
-            try:
-                # Device only returns battery level if PIN is correct
-                await cometblue_device.get_battery_async()
-            except TimeoutError as ex:
-                # This likely means PIN was incorrect on Linux and ESPHome backends
-                raise ConfigEntryError(
-                    "Failed to read battery level, likely due to incorrect PIN"
-                ) from ex
-    except BleakError as ex:
-        raise ConfigEntryNotReady(
-            f"Failed to get device info from '{cometblue_device.device.address}'"
-        ) from ex
+    device_info_start = monotonic()
+    # A config flow that just validated the PIN already read everything
+    if handoff := async_pop_setup_handoff(hass, address):
+        ble_device_info = handoff.device_info
+    else:
+        try:
+            async with cometblue_device:
+                ble_device_info = await cometblue_device.get_device_info_async()
+                try:
+                    # Device only returns battery level if PIN is correct
+                    await cometblue_device.get_battery_async()
+                except TimeoutError as ex:
+                    # This likely means PIN was incorrect on Linux and ESPHome backends
+                    raise ConfigEntryAuthFailed(
+                        "Failed to read battery level, likely due to incorrect PIN"
+                    ) from ex
+        except BleakError as ex:
+            raise ConfigEntryNotReady(
+                f"Failed to get device info from '{cometblue_device.device.address}'"
+            ) from ex
 
     device_registry = dr.async_get(hass)
     device_registry.async_get_or_create(
@@ -148,17 +286,93 @@ async def async_setup_entry(hass: HomeAssistant, entry: CometBlueConfigEntry) ->
         hass,
         entry,
         cometblue_device,
+        initial_data=handoff.data if handoff else None,
     )
+    first_refresh_start = monotonic()
     await coordinator.async_config_entry_first_refresh()
     entry.runtime_data = coordinator
 
+    platforms_start = monotonic()
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    coordinator.async_set_entities_added()
+    entry.async_on_unload(entry.add_update_listener(_async_update_listener))
+    async_dispatcher_send(hass, SIGNAL_COORDINATOR_CHANGED, address, coordinator)
+
+    setup_end = monotonic()
+    LOGGER.debug(
+        "Set up %s in %.3fs (device lookup: %.3fs, device info: %.3fs,"
+        " first refresh: %.3fs, platforms: %.3fs)",
+        address,
+        setup_end - setup_start,
+        device_info_start - setup_start,
+        first_refresh_start - device_info_start,
+        platforms_start - first_refresh_start,
+        setup_end - platforms_start,
+    )
 
     return True
 
 
+def _device_service[_R](
+    func: Callable[[CometBlueBluetoothEntity, ServiceCall], Awaitable[_R]],
+) -> Callable[[Entity, ServiceCall], Awaitable[_R]]:
+    """Reject calls of a device service targeting a zone."""
+
+    async def handler(entity: Entity, service_call: ServiceCall) -> _R:
+        if not isinstance(entity, CometBlueBluetoothEntity):
+            raise ServiceValidationError(
+                f"'{service_call.service}' is not supported by zone {entity.entity_id},"
+                " target its TRVs instead"
+            )
+        return await func(entity, service_call)
+
+    return handler
+
+
+def _service_schedule(data: dict[str, Any]) -> WeekSchedule:
+    """Return the weekday schedule of validated service data."""
+    try:
+        return WeekSchedule.from_weekdays(
+            {
+                day: {k: v.isoformat() for k, v in sched.items()}
+                for day, sched in data.items()
+                if sched is not None and day in CONF_ALL_DAYS
+            },
+            exact=True,
+        )
+    except ValueError as ex:
+        raise ServiceValidationError(str(ex)) from ex
+
+
+async def _async_get_coordinators(
+    hass: HomeAssistant, service_call: ServiceCall
+) -> dict[str, CometBlueDataUpdateCoordinator]:
+    """Return the coordinators of the targeted TRVs, or all without a target."""
+    requested = (
+        await service.async_extract_entity_ids(service_call)
+        if any(field in service_call.data for field in cv.ENTITY_SERVICE_FIELDS)
+        else None
+    )
+    entity_registry = er.async_get(hass)
+    coordinators: dict[str, CometBlueDataUpdateCoordinator] = {}
+    for entry in hass.config_entries.async_loaded_entries(DOMAIN):
+        if CONF_ADDRESS not in entry.data:
+            continue
+        entity_id = entity_registry.async_get_entity_id(
+            Platform.CLIMATE, DOMAIN, entry.runtime_data.address
+        )
+        if entity_id and (requested is None or entity_id in requested):
+            coordinators[entity_id] = entry.runtime_data
+    return coordinators
+
+
 async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
     """Set up Eurotronic Comet Blue entity services."""
+    schedule_profiles = CometBlueScheduleProfiles(hass)
+    await schedule_profiles.async_load()
+    hass.data[DATA_SCHEDULE_PROFILES] = schedule_profiles
+    hass.data[DATA_FLEET_HEALTH] = CometBlueFleetHealth(hass)
+    hass.data[DATA_FLEET_HEALTH].async_start()
 
     async def set_datetime(
         entity: CometBlueBluetoothEntity, service_call: ServiceCall
@@ -174,10 +388,8 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
         entity: CometBlueBluetoothEntity, service_call: ServiceCall
     ) -> ServiceResponse:
         """Service call to retrieve the schedule from the device."""
-        return await entity.coordinator.send_command(
-            entity.coordinator.device.get_multiple_async,
-            {"values": ["weekdays"]},
-        )
+        schedule = await entity.coordinator.async_read_schedule()
+        return schedule.as_weekdays() if schedule else {}
 
     async def set_schedule(
         entity: CometBlueBluetoothEntity, service_call: ServiceCall
@@ -194,15 +406,14 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
                 day,
                 service_call.data.get(day),
             )
-        values = {
-            day: {k: v.strftime("%H:%M") for k, v in sched.items()}
-            for day, sched in service_call.data.items()
-            if sched is not None and day in CONF_ALL_DAYS
-        }
-        await entity.coordinator.send_command(
-            entity.coordinator.device.set_weekdays_async,
-            {"values": values},
+        written = await entity.coordinator.async_write_schedule(
+            _service_schedule(service_call.data)
         )
+        # The device no longer has the schedule of a profile
+        schedule_profiles.async_record_write(
+            entity.coordinator.address, None, queued=not written
+        )
+        entity.coordinator.async_update_listeners()
 
     async def set_holiday(
         entity: CometBlueBluetoothEntity, service_call: ServiceCall
@@ -236,6 +447,152 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
             },
         )
 
+    async def get_queued_commands(
+        entity: CometBlueBluetoothEntity, service_call: ServiceCall
+    ) -> ServiceResponse:
+        """Service call to retrieve commands waiting for the device."""
+        return {
+            "commands": [
+                command.as_dict()
+                for command in entity.coordinator.command_queue.commands
+            ]
+        }
+
+    async def clear_queued_commands(
+        entity: CometBlueBluetoothEntity, service_call: ServiceCall
+    ) -> None:
+        """Service call to drop commands waiting for the device."""
+        LOGGER.info(
+            "Clearing %s queued command(s) for %s",
+            len(entity.coordinator.command_queue),
+            entity.entity_id,
+        )
+        entity.coordinator.async_clear_command_queue()
+
+    async def profile_device(
+        entity: CometBlueBluetoothEntity, service_call: ServiceCall
+    ) -> ServiceResponse:
+        """Service call to poll the device once and return timings of each phase."""
+        return await entity.coordinator.async_profile()
+
+    async def get_schedules(service_call: ServiceCall) -> ServiceResponse:
+        """Service call to retrieve the schedules of all or the targeted devices."""
+        coordinators = await _async_get_coordinators(hass, service_call)
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_CONNECTIONS)
+
+        async def async_get_schedule(
+            coordinator: CometBlueDataUpdateCoordinator,
+        ) -> dict[str, dict[str, str]]:
+            if (schedule := coordinator.cached_schedule) is None:
+                async with semaphore:
+                    schedule = await coordinator.async_read_schedule()
+            return schedule.as_weekdays() if schedule else {}
+
+        results = await asyncio.gather(
+            *(async_get_schedule(coordinator) for coordinator in coordinators.values()),
+            return_exceptions=True,
+        )
+        response: dict[str, Any] = {"schedules": {}, "errors": {}}
+        for entity_id, result in zip(coordinators, results, strict=True):
+            if isinstance(result, BaseException):
+                response["errors"][entity_id] = str(result)
+            else:
+                response["schedules"][entity_id] = result
+        return response
+
+    async def set_schedule_profile(service_call: ServiceCall) -> None:
+        """Service call to store a named weekday schedule."""
+        schedule = _service_schedule(service_call.data)
+        if not schedule:
+            raise ServiceValidationError(
+                f"Schedule profile '{service_call.data[CONF_PROFILE]}' needs at"
+                " least one weekday"
+            )
+        schedule_profiles.async_set(service_call.data[CONF_PROFILE], schedule)
+
+    async def delete_schedule_profile(service_call: ServiceCall) -> None:
+        """Service call to remove a named weekday schedule."""
+        try:
+            schedule_profiles.async_delete(service_call.data[CONF_PROFILE])
+        except KeyError as ex:
+            raise ServiceValidationError(
+                f"Unknown schedule profile '{service_call.data[CONF_PROFILE]}'"
+            ) from ex
+
+    async def apply_schedule_profile(service_call: ServiceCall) -> ServiceResponse:
+        """Service call to write a schedule profile to the devices not having it."""
+        name = service_call.data[CONF_PROFILE]
+        if (schedule := schedule_profiles.profiles.get(name)) is None:
+            raise ServiceValidationError(f"Unknown schedule profile '{name}'")
+        coordinators = await _async_get_coordinators(hass, service_call)
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_CONNECTIONS)
+
+        async def async_apply(
+            coordinator: CometBlueDataUpdateCoordinator,
+        ) -> ScheduleWrite:
+            async with semaphore:
+                return await coordinator.async_apply_schedule(schedule)
+
+        results = await asyncio.gather(
+            *(async_apply(coordinator) for coordinator in coordinators.values()),
+            return_exceptions=True,
+        )
+        response: dict[str, Any] = {
+            **{result: [] for result in ScheduleWrite},
+            "errors": {},
+        }
+        for (entity_id, coordinator), result in zip(
+            coordinators.items(), results, strict=True
+        ):
+            if isinstance(result, BaseException):
+                response["errors"][entity_id] = str(result)
+                continue
+            response[result].append(entity_id)
+            schedule_profiles.async_record_write(
+                coordinator.address, name, queued=result is ScheduleWrite.QUEUED
+            )
+            coordinator.async_update_listeners()
+        LOGGER.info(
+            "Applied schedule profile '%s': %s written, %s unchanged, %s queued,"
+            " %s failed",
+            name,
+            len(response[ScheduleWrite.WRITTEN]),
+            len(response[ScheduleWrite.UNCHANGED]),
+            len(response[ScheduleWrite.QUEUED]),
+            len(response["errors"]),
+        )
+        return response
+
+    hass.services.async_register(
+        DOMAIN,
+        "set_schedule_profile",
+        set_schedule_profile,
+        schema=vol.Schema(
+            {vol.Required(CONF_PROFILE): cv.string, **SERVICE_SCHEDULE_SCHEMA}
+        ),
+    )
+    hass.services.async_register(
+        DOMAIN,
+        "delete_schedule_profile",
+        delete_schedule_profile,
+        schema=vol.Schema({vol.Required(CONF_PROFILE): cv.string}),
+    )
+    hass.services.async_register(
+        DOMAIN,
+        "apply_schedule_profile",
+        apply_schedule_profile,
+        schema=vol.Schema(
+            {vol.Required(CONF_PROFILE): cv.string, **cv.ENTITY_SERVICE_FIELDS}
+        ),
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        "get_schedules",
+        get_schedules,
+        schema=vol.Schema(cv.ENTITY_SERVICE_FIELDS),
+        supports_response=SupportsResponse.ONLY,
+    )
     service.async_register_platform_entity_service(
         hass,
         DOMAIN,
@@ -243,7 +600,7 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
         entity_domain="climate",
         schema=cv.make_entity_service_schema(SERVICE_DATETIME_SCHEMA),
         supports_response=SupportsResponse.NONE,
-        func=set_datetime,
+        func=_device_service(set_datetime),
     )
     service.async_register_platform_entity_service(
         hass,
@@ -252,7 +609,7 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
         entity_domain="climate",
         schema=None,
         supports_response=SupportsResponse.ONLY,
-        func=get_schedule,
+        func=_device_service(get_schedule),
     )
     service.async_register_platform_entity_service(
         hass,
@@ -261,7 +618,7 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
         entity_domain="climate",
         schema=cv.make_entity_service_schema(SERVICE_SCHEDULE_SCHEMA),
         supports_response=SupportsResponse.NONE,
-        func=set_schedule,
+        func=_device_service(set_schedule),
     )
     service.async_register_platform_entity_service(
         hass,
@@ -270,12 +627,63 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
         entity_domain="climate",
         schema=cv.make_entity_service_schema(SERVICE_HOLIDAY_SCHEMA),
         supports_response=SupportsResponse.NONE,
-        func=set_holiday,
+        func=_device_service(set_holiday),
+    )
+    service.async_register_platform_entity_service(
+        hass,
+        DOMAIN,
+        "get_queued_commands",
+        entity_domain="climate",
+        schema=None,
+        supports_response=SupportsResponse.ONLY,
+        func=_device_service(get_queued_commands),
+    )
+    service.async_register_platform_entity_service(
+        hass,
+        DOMAIN,
+        "clear_queued_commands",
+        entity_domain="climate",
+        schema=None,
+        supports_response=SupportsResponse.NONE,
+        func=_device_service(clear_queued_commands),
+    )
+    service.async_register_platform_entity_service(
+        hass,
+        DOMAIN,
+        "profile_device",
+        entity_domain="climate",
+        schema=None,
+        supports_response=SupportsResponse.ONLY,
+        func=_device_service(profile_device),
     )
 
     return True
 
 
+async def _async_update_listener(
+    hass: HomeAssistant, entry: CometBlueConfigEntry
+) -> None:
+    """Apply changed options to the running coordinator."""
+    entry.runtime_data.async_apply_options()
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
-    return await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
+    if CONF_DEVICES in entry.data:
+        return await hass.config_entries.async_unload_platforms(entry, ZONE_PLATFORMS)
+    if CONF_FLEET in entry.data:
+        return await hass.config_entries.async_unload_platforms(entry, FLEET_PLATFORMS)
+
+    if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
+        async_dispatcher_send(
+            hass, SIGNAL_COORDINATOR_CHANGED, entry.data[CONF_ADDRESS], None
+        )
+    return unload_ok
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove persisted data of a config entry."""
+    await async_remove_command_queue(hass, entry.entry_id)
+    _async_stop_waiting_for_advertisement(hass, entry)
+    if CONF_ADDRESS in entry.data and DATA_SCHEDULE_PROFILES in hass.data:
+        hass.data[DATA_SCHEDULE_PROFILES].async_assign(entry.data[CONF_ADDRESS], None)
@@ -2,9 +2,14 @@
 
 from __future__ import annotations
 
+import asyncio
+from collections.abc import Callable
+from functools import partial
 import logging
+from statistics import mean
 from typing import Any
 
+from homeassistant.components import bluetooth
 from homeassistant.components.climate import (
     ATTR_TARGET_TEMP_HIGH,
     ATTR_TARGET_TEMP_LOW,
@@ -17,19 +22,43 @@ from homeassistant.components.climate import (
     ClimateEntityFeature,
     HVACMode,
 )
-from homeassistant.const import ATTR_TEMPERATURE, PRECISION_HALVES, UnitOfTemperature
-from homeassistant.core import HomeAssistant
-from homeassistant.exceptions import ServiceValidationError
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import (
+    ATTR_TEMPERATURE,
+    CONF_ADDRESS,
+    CONF_DEVICES,
+    PRECISION_HALVES,
+    UnitOfTemperature,
+)
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
+from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddConfigEntryEntitiesCallback
 
-from .coordinator import CometBlueConfigEntry, CometBlueDataUpdateCoordinator
+from .const import (
+    DATA_HOLIDAY,
+    DATA_SCHEDULE,
+    DATA_TEMPERATURES,
+    DOMAIN,
+    MAX_TEMP,
+    MIN_TEMP,
+    SIGNAL_COORDINATOR_CHANGED,
+)
+from .coordinator import (
+    CometBlueConfigEntry,
+    CometBlueCoordinatorData,
+    CometBlueDataUpdateCoordinator,
+)
 from .entity import CometBlueBluetoothEntity
+from .schedule_profiles import DATA_SCHEDULE_PROFILES
 
 LOGGER = logging.getLogger(__name__)
 
 PARALLEL_UPDATES = 1
-MIN_TEMP = 7.5
-MAX_TEMP = 28.5
+ATTR_QUEUED_COMMANDS = "queued_commands"
+ATTR_MISSING_DEVICES = "missing_devices"
+ATTR_SCHEDULE_PROFILE = "schedule_profile"
 
 
 async def async_setup_entry(
@@ -39,10 +68,92 @@ async def async_setup_entry(
 ) -> None:
     """Set up the client entities."""
 
+    if CONF_DEVICES in entry.data:
+        async_add_entities([CometBlueZoneClimateEntity(entry)])
+        return
+
     coordinator = entry.runtime_data
     async_add_entities([CometBlueClimateEntity(coordinator)])
 
 
+def hvac_mode_from_data(data: CometBlueCoordinatorData) -> HVACMode:
+    """Return the hvac operation mode of a TRV."""
+    if data.temperatures["manualTemp"] == MIN_TEMP:
+        return HVACMode.OFF
+    if data.temperatures["manualTemp"] == MAX_TEMP:
+        return HVACMode.HEAT
+    return HVACMode.AUTO
+
+
+def preset_mode_from_data(data: CometBlueCoordinatorData) -> str:
+    """Return the preset mode of a TRV."""
+    # presets have an order in which they are displayed on TRV:
+    # away, boost, comfort, eco, none (manual)
+    target_temperature = data.temperatures["manualTemp"]
+    if data.holiday_active and target_temperature == data.holiday.get("temperature"):
+        return PRESET_AWAY
+    if target_temperature == MAX_TEMP:
+        return PRESET_BOOST
+    if target_temperature == data.temperatures["targetTempHigh"]:
+        return PRESET_COMFORT
+    if target_temperature == data.temperatures["targetTempLow"]:
+        return PRESET_ECO
+    return PRESET_NONE
+
+
+def preset_temperature(preset_mode: str, data: CometBlueCoordinatorData) -> float:
+    """Return the temperature to set on a TRV for a preset mode."""
+    if preset_mode in [PRESET_NONE, PRESET_AWAY]:
+        raise ServiceValidationError(
+            f"Unable to set preset '{preset_mode}', display only."
+        )
+    if preset_mode == PRESET_ECO:
+        return data.temperatures["targetTempLow"]
+    if preset_mode == PRESET_COMFORT:
+        return data.temperatures["targetTempHigh"]
+    if preset_mode == PRESET_BOOST:
+        return MAX_TEMP
+    raise ServiceValidationError(f"Unsupported preset_mode '{preset_mode}'")
+
+
+def hvac_mode_temperature(hvac_mode: HVACMode, data: CometBlueCoordinatorData) -> float:
+    """Return the temperature to set on a TRV for a hvac mode."""
+    if hvac_mode == HVACMode.OFF:
+        return MIN_TEMP
+    if hvac_mode == HVACMode.HEAT:
+        return MAX_TEMP
+    if hvac_mode == HVACMode.AUTO:
+        return data.temperatures["targetTempLow"]
+    raise ServiceValidationError(f"Unknown HVAC mode '{hvac_mode}'")
+
+
+async def async_set_device_temperature(
+    coordinator: CometBlueDataUpdateCoordinator,
+    temperature: float | None,
+    target_temp_low: float | None = None,
+    target_temp_high: float | None = None,
+) -> None:
+    """Send new target temperatures to a TRV."""
+    if preset_mode_from_data(coordinator.data) == PRESET_AWAY:
+        raise ServiceValidationError(
+            "Cannot adjust TRV remotely, manually disable 'holiday' mode on TRV first"
+        )
+
+    await coordinator.send_command(
+        coordinator.device.set_temperature_async,
+        {
+            "values": {
+                # manual temperature always needs to be set, otherwise TRV will turn OFF
+                "manualTemp": temperature
+                or coordinator.data.temperatures["manualTemp"],
+                # other temperatures can be left unchanged by setting them to None
+                "targetTempLow": target_temp_low,
+                "targetTempHigh": target_temp_high,
+            }
+        },
+    )
+
+
 class CometBlueClimateEntity(CometBlueBluetoothEntity, ClimateEntity):
     """A Comet Blue Climate climate entity."""
 
@@ -70,7 +181,11 @@ class CometBlueClimateEntity(CometBlueBluetoothEntity, ClimateEntity):
     def __init__(self, coordinator: CometBlueDataUpdateCoordinator) -> None:
         """Initialize CometBlueClimateEntity."""
 
-        super().__init__(coordinator)
+        # The schedule is used to refresh right after the TRV switched temperatures
+        super().__init__(
+            coordinator,
+            frozenset({DATA_TEMPERATURES, DATA_HOLIDAY, DATA_SCHEDULE}),
+        )
         self._attr_unique_id = coordinator.address
 
     @property
@@ -93,55 +208,35 @@ class CometBlueClimateEntity(CometBlueBluetoothEntity, ClimateEntity):
         """Return the lower bound target temperature."""
         return self.coordinator.data.temperatures["targetTempLow"]
 
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the state attributes."""
+        schedule_profiles = self.hass.data[DATA_SCHEDULE_PROFILES]
+        return {
+            ATTR_QUEUED_COMMANDS: len(self.coordinator.command_queue),
+            ATTR_SCHEDULE_PROFILE: schedule_profiles.assignments.get(
+                self.coordinator.address
+            ),
+        }
+
     @property
     def hvac_mode(self) -> HVACMode | None:
         """Return hvac operation mode."""
-        if self.target_temperature == MIN_TEMP:
-            return HVACMode.OFF
-        if self.target_temperature == MAX_TEMP:
-            return HVACMode.HEAT
-        return HVACMode.AUTO
+        return hvac_mode_from_data(self.coordinator.data)
 
     @property
     def preset_mode(self) -> str | None:
         """Return the current preset mode, e.g., home, away, temp."""
-        # presets have an order in which they are displayed on TRV:
-        # away, boost, comfort, eco, none (manual)
-        if (
-            self.coordinator.data.holiday.get("start") is None
-            and self.coordinator.data.holiday.get("end") is not None
-            and self.target_temperature
-            == self.coordinator.data.holiday.get("temperature")
-        ):
-            return PRESET_AWAY
-        if self.target_temperature == MAX_TEMP:
-            return PRESET_BOOST
-        if self.target_temperature == self.target_temperature_high:
-            return PRESET_COMFORT
-        if self.target_temperature == self.target_temperature_low:
-            return PRESET_ECO
-        return PRESET_NONE
+        return preset_mode_from_data(self.coordinator.data)
 
     async def async_set_temperature(self, **kwargs: Any) -> None:
         """Set new target temperatures."""
 
-        if self.preset_mode == PRESET_AWAY:
-            raise ServiceValidationError(
-                "Cannot adjust TRV remotely, manually disable 'holiday' mode on TRV first"
-            )
-
-        await self.coordinator.send_command(
-            self.coordinator.device.set_temperature_async,
-            {
-                "values": {
-                    # manual temperature always needs to be set, otherwise TRV will turn OFF
-                    "manualTemp": kwargs.get(ATTR_TEMPERATURE)
-                    or self.target_temperature,
-                    # other temperatures can be left unchanged by setting them to None
-                    "targetTempLow": kwargs.get(ATTR_TARGET_TEMP_LOW),
-                    "targetTempHigh": kwargs.get(ATTR_TARGET_TEMP_HIGH),
-                }
-            },
+        await async_set_device_temperature(
+            self.coordinator,
+            kwargs.get(ATTR_TEMPERATURE),
+            kwargs.get(ATTR_TARGET_TEMP_LOW),
+            kwargs.get(ATTR_TARGET_TEMP_HIGH),
         )
         await self.coordinator.async_request_refresh()
 
@@ -150,34 +245,16 @@ class CometBlueClimateEntity(CometBlueBluetoothEntity, ClimateEntity):
 
         if self.preset_modes and preset_mode not in self.preset_modes:
             raise ServiceValidationError(f"Unsupported preset_mode '{preset_mode}'")
-        if preset_mode in [PRESET_NONE, PRESET_AWAY]:
-            raise ServiceValidationError(
-                f"Unable to set preset '{preset_mode}', display only."
-            )
-        if preset_mode == PRESET_ECO:
-            return await self.async_set_temperature(
-                temperature=self.target_temperature_low
-            )
-        if preset_mode == PRESET_COMFORT:
-            return await self.async_set_temperature(
-                temperature=self.target_temperature_high
-            )
-        if preset_mode == PRESET_BOOST:
-            return await self.async_set_temperature(temperature=MAX_TEMP)
-        return None
+        await self.async_set_temperature(
+            temperature=preset_temperature(preset_mode, self.coordinator.data)
+        )
 
     async def async_set_hvac_mode(self, hvac_mode: HVACMode) -> None:
         """Set new target hvac mode."""
 
-        if hvac_mode == HVACMode.OFF:
-            return await self.async_set_temperature(temperature=MIN_TEMP)
-        if hvac_mode == HVACMode.HEAT:
-            return await self.async_set_temperature(temperature=MAX_TEMP)
-        if hvac_mode == HVACMode.AUTO:
-            return await self.async_set_temperature(
-                temperature=self.target_temperature_low
-            )
-        raise ServiceValidationError(f"Unknown HVAC mode '{hvac_mode}'")
+        await self.async_set_temperature(
+            temperature=hvac_mode_temperature(hvac_mode, self.coordinator.data)
+        )
 
     async def async_turn_on(self) -> None:
         """Turn the entity on."""
@@ -186,3 +263,237 @@ class CometBlueClimateEntity(CometBlueBluetoothEntity, ClimateEntity):
     async def async_turn_off(self) -> None:
         """Turn the entity off."""
         await self.async_set_hvac_mode(HVACMode.OFF)
+
+
+class CometBlueZoneClimateEntity(ClimateEntity):
+    """A climate entity controlling all Comet Blue TRVs of a zone at once."""
+
+    _attr_has_entity_name = True
+    _attr_should_poll = False
+    _attr_min_temp = MIN_TEMP
+    _attr_max_temp = MAX_TEMP
+    _attr_name = None
+    _attr_hvac_modes = [HVACMode.AUTO, HVACMode.HEAT, HVACMode.OFF]
+    _attr_preset_modes = [
+        PRESET_COMFORT,
+        PRESET_ECO,
+        PRESET_BOOST,
+        PRESET_AWAY,
+        PRESET_NONE,
+    ]
+    _attr_supported_features: ClimateEntityFeature = (
+        ClimateEntityFeature.TARGET_TEMPERATURE
+        | ClimateEntityFeature.PRESET_MODE
+        | ClimateEntityFeature.TURN_ON
+        | ClimateEntityFeature.TURN_OFF
+    )
+    _attr_target_temperature_step = PRECISION_HALVES
+    _attr_temperature_unit = UnitOfTemperature.CELSIUS
+
+    def __init__(self, entry: ConfigEntry) -> None:
+        """Initialize CometBlueZoneClimateEntity."""
+        self._addresses: list[str] = entry.data[CONF_DEVICES]
+        self._coordinators: dict[str, CometBlueDataUpdateCoordinator] = {}
+        self._unsub_coordinators: list[CALLBACK_TYPE] = []
+        self._attr_unique_id = entry.entry_id
+        self._attr_device_info = DeviceInfo(
+            identifiers={(DOMAIN, entry.entry_id)},
+            name=entry.title,
+            manufacturer="Eurotronic",
+            model="Comet Blue zone",
+        )
+
+    async def async_added_to_hass(self) -> None:
+        """Subscribe to the coordinators of the zone's TRVs."""
+        await super().async_added_to_hass()
+        # TRVs set up later are picked up through the dispatcher signal
+        for entry in self.hass.config_entries.async_loaded_entries(DOMAIN):
+            if entry.data.get(CONF_ADDRESS) in self._addresses:
+                self._coordinators[entry.data[CONF_ADDRESS]] = entry.runtime_data
+        self._async_subscribe_coordinators()
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass,
+                SIGNAL_COORDINATOR_CHANGED,
+                self._async_handle_coordinator_changed,
+            )
+        )
+        self.async_on_remove(self._async_unsubscribe_coordinators)
+
+    @callback
+    def _async_subscribe_coordinators(self) -> None:
+        """Listen to updates of all TRVs of the zone."""
+        self._async_unsubscribe_coordinators()
+        self._unsub_coordinators = [
+            coordinator.async_add_listener(
+                self.async_write_ha_state,
+                frozenset({DATA_TEMPERATURES, DATA_HOLIDAY}),
+            )
+            for coordinator in self._coordinators.values()
+        ]
+
+    @callback
+    def _async_unsubscribe_coordinators(self) -> None:
+        """Stop listening to updates of the TRVs."""
+        for unsub in self._unsub_coordinators:
+            unsub()
+        self._unsub_coordinators = []
+
+    @callback
+    def _async_handle_coordinator_changed(
+        self, address: str, coordinator: CometBlueDataUpdateCoordinator | None
+    ) -> None:
+        """Handle a TRV being set up or unloaded."""
+        if address not in self._addresses:
+            return
+        if coordinator is None:
+            self._coordinators.pop(address, None)
+        else:
+            self._coordinators[address] = coordinator
+        self._async_subscribe_coordinators()
+        self.async_write_ha_state()
+
+    @property
+    def _members(self) -> list[CometBlueCoordinatorData]:
+        """Return the data of all loaded TRVs of the zone."""
+        return [
+            coordinator.data
+            for coordinator in self._coordinators.values()
+            if coordinator.data and coordinator.data.temperatures
+        ]
+
+    @property
+    def available(self) -> bool:
+        """Return if at least one TRV of the zone is available."""
+        return any(
+            bluetooth.async_address_present(self.hass, address, connectable=True)
+            for address in self._coordinators
+        )
+
+    @property
+    def current_temperature(self) -> float | None:
+        """Return the mean current temperature of the zone."""
+        temperatures = [
+            data.temperatures["currentTemp"]
+            for data in self._members
+            if data.temperatures.get("currentTemp") is not None
+        ]
+        return round(mean(temperatures), 1) if temperatures else None
+
+    @property
+    def target_temperature(self) -> float | None:
+        """Return the mean target temperature of the zone."""
+        temperatures = [
+            data.temperatures["manualTemp"]
+            for data in self._members
+            if data.temperatures.get("manualTemp") is not None
+        ]
+        if not temperatures:
+            return None
+        # Round to the precision of the TRVs
+        return round(mean(temperatures) * 2) / 2
+
+    @property
+    def hvac_mode(self) -> HVACMode | None:
+        """Return the hvac mode shared by all TRVs, AUTO if they differ."""
+        modes = {hvac_mode_from_data(data) for data in self._members}
+        if not modes:
+            return None
+        return modes.pop() if len(modes) == 1 else HVACMode.AUTO
+
+    @property
+    def preset_mode(self) -> str | None:
+        """Return the preset mode shared by all TRVs, none if they differ."""
+        presets = {preset_mode_from_data(data) for data in self._members}
+        if not presets:
+            return None
+        return presets.pop() if len(presets) == 1 else PRESET_NONE
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the state attributes."""
+        return {
+            ATTR_MISSING_DEVICES: [
+                address
+                for address in self._addresses
+                if address not in self._coordinators
+            ]
+        }
+
+    async def _async_fan_out(
+        self, temperature_fn: Callable[[CometBlueCoordinatorData], float | None]
+    ) -> None:
+        """Set a temperature on all TRVs of the zone concurrently.
+
+        Each TRV is connected through its own coordinator, so the zone is
+        updated in one device round trip. TRVs that failed are reported
+        after the others were refreshed.
+        """
+        coordinators = list(self._coordinators.values())
+        if not coordinators:
+            raise HomeAssistantError(f"No TRV of {self.entity_id} is set up")
+
+        async def async_set(coordinator: CometBlueDataUpdateCoordinator) -> None:
+            await async_set_device_temperature(
+                coordinator, temperature_fn(coordinator.data)
+            )
+
+        results = await asyncio.gather(
+            *(async_set(coordinator) for coordinator in coordinators),
+            return_exceptions=True,
+        )
+        failures = {
+            coordinator.address: result
+            for coordinator, result in zip(coordinators, results, strict=True)
+            if isinstance(result, BaseException)
+        }
+        await asyncio.gather(
+            *(
+                coordinator.async_request_refresh()
+                for coordinator in coordinators
+                if coordinator.address not in failures
+            )
+        )
+        if failures:
+            for address, ex in failures.items():
+                LOGGER.debug(
+                    "Failed to update %s in %s: %s (%s)",
+                    address,
+                    self.entity_id,
+                    type(ex).__name__,
+                    ex,
+                )
+            raise HomeAssistantError(
+                f"Failed to update {len(failures)} of {len(coordinators)} TRVs: "
+                + ", ".join(f"{address} ({ex})" for address, ex in failures.items())
+            )
+
+    async def async_set_temperature(self, **kwargs: Any) -> None:
+        """Set new target temperature on all TRVs."""
+        temperature = kwargs.get(ATTR_TEMPERATURE)
+        await self._async_fan_out(lambda _data: temperature)
+
+    async def async_set_preset_mode(self, preset_mode: str) -> None:
+        """Set new target preset mode on all TRVs."""
+        if self.preset_modes and preset_mode not in self.preset_modes:
+            raise ServiceValidationError(f"Unsupported preset_mode '{preset_mode}'")
+        if preset_mode in [PRESET_NONE, PRESET_AWAY]:
+            raise ServiceValidationError(
+                f"Unable to set preset '{preset_mode}', display only."
+            )
+        # Eco and comfort temperatures are configured per TRV
+        await self._async_fan_out(partial(preset_temperature, preset_mode))
+
+    async def async_set_hvac_mode(self, hvac_mode: HVACMode) -> None:
+        """Set new target hvac mode on all TRVs."""
+        if hvac_mode not in self.hvac_modes:
+            raise ServiceValidationError(f"Unknown HVAC mode '{hvac_mode}'")
+        await self._async_fan_out(partial(hvac_mode_temperature, hvac_mode))
+
+    async def async_turn_on(self) -> None:
+        """Turn all TRVs on."""
+        await self.async_set_hvac_mode(HVACMode.AUTO)
+
+    async def async_turn_off(self) -> None:
+        """Turn all TRVs off."""
+        await self.async_set_hvac_mode(HVACMode.OFF)
@@ -0,0 +1,139 @@
+"""Persisted queue of commands for Comet Blue devices that are out of range."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN
+
+STORAGE_VERSION = 1
+SAVE_DELAY = 1
+# Payload keys holding datetimes, stored as ISO strings
+DATETIME_KEYS = {"date", "start", "end"}
+
+
+def _storage_key(entry_id: str) -> str:
+    """Return the storage key of the command queue of a config entry."""
+    return f"{DOMAIN}.{entry_id}.command_queue"
+
+
+def _parse_datetimes(payload: dict[str, Any]) -> dict[str, Any]:
+    """Parse stored ISO strings back to datetimes."""
+    return {
+        k: _parse_datetimes(v)
+        if isinstance(v, dict)
+        else dt_util.parse_datetime(v)
+        if k in DATETIME_KEYS and isinstance(v, str)
+        else v
+        for k, v in payload.items()
+    }
+
+
+@dataclass
+class QueuedCommand:
+    """A command waiting to be sent to the device."""
+
+    function: str
+    payload: dict[str, Any]
+    queued: datetime
+
+    def replay_payload(self) -> dict[str, Any]:
+        """Return the payload to send when the command is replayed."""
+        if self.function == "set_datetime_async" and self.payload.get("date"):
+            # Keep the device clock correct instead of setting the time of queueing
+            return {"date": self.payload["date"] + (dt_util.utcnow() - self.queued)}
+        return self.payload
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a serializable representation."""
+        return {
+            "function": self.function,
+            "payload": self.payload,
+            "queued": self.queued.isoformat(),
+        }
+
+
+class CometBlueCommandQueue:
+    """Queue of pending commands of a device, persisted across restarts.
+
+    Temperature commands are merged so the latest value of each field wins,
+    other commands (schedules, holidays) are replayed in the order received.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """Initialize the command queue."""
+        self._store: Store[list[dict[str, Any]]] = Store(
+            hass, STORAGE_VERSION, _storage_key(entry_id)
+        )
+        self.commands: list[QueuedCommand] = []
+
+    def __len__(self) -> int:
+        """Return the number of pending commands."""
+        return len(self.commands)
+
+    async def async_load(self) -> None:
+        """Load pending commands from storage."""
+        self.commands = [
+            QueuedCommand(
+                function=command["function"],
+                payload=_parse_datetimes(command["payload"]),
+                queued=dt_util.parse_datetime(command["queued"]) or dt_util.utcnow(),
+            )
+            for command in await self._store.async_load() or []
+        ]
+
+    @callback
+    def async_add(self, function: str, payload: dict[str, Any]) -> None:
+        """Add a command, replacing pending values it supersedes."""
+        now = dt_util.utcnow()
+        if function == "set_temperature_async":
+            # Unchanged temperatures are sent as None and must not overwrite pending values
+            values = {k: v for k, v in payload["values"].items() if v is not None}
+            for command in self.commands:
+                if command.function == function:
+                    command.payload["values"].update(values)
+                    command.queued = now
+                    break
+            else:
+                self.commands.append(QueuedCommand(function, {"values": values}, now))
+        else:
+            replace_all = function == "set_datetime_async"
+            self.commands = [
+                command
+                for command in self.commands
+                if command.function != function
+                or (not replace_all and command.payload != payload)
+            ]
+            self.commands.append(QueuedCommand(function, payload, now))
+        self._async_schedule_save()
+
+    @callback
+    def async_pop(self) -> QueuedCommand:
+        """Remove and return the oldest pending command."""
+        command = self.commands.pop(0)
+        self._async_schedule_save()
+        return command
+
+    @callback
+    def async_clear(self) -> None:
+        """Remove all pending commands."""
+        self.commands.clear()
+        self._async_schedule_save()
+
+    @callback
+    def _async_schedule_save(self) -> None:
+        """Schedule saving the pending commands."""
+        self._store.async_delay_save(
+            lambda: [command.as_dict() for command in self.commands], SAVE_DELAY
+        )
+
+
+async def async_remove_command_queue(hass: HomeAssistant, entry_id: str) -> None:
+    """Remove the persisted command queue of a config entry."""
+    await Store(hass, STORAGE_VERSION, _storage_key(entry_id)).async_remove()
@@ -2,10 +2,12 @@
 
 from __future__ import annotations
 
+from collections.abc import Mapping
 import logging
 from typing import Any
 
-from eurotronic_cometblue_ha import AsyncCometBlue
+from bleak.exc import BleakError
+from eurotronic_cometblue_ha import AsyncCometBlue, InvalidByteValueError
 from eurotronic_cometblue_ha.const import SERVICE
 from habluetooth import BluetoothServiceInfoBleak
 import voluptuous as vol
@@ -14,16 +16,52 @@ from homeassistant.components.bluetooth import (
     async_ble_device_from_address,
     async_discovered_service_info,
 )
-from homeassistant.config_entries import ConfigFlow, ConfigFlowResult
-from homeassistant.const import CONF_ADDRESS, CONF_PIN
+from homeassistant.config_entries import (
+    SOURCE_RECONFIGURE,
+    ConfigEntry,
+    ConfigFlow,
+    ConfigFlowResult,
+    OptionsFlow,
+)
+from homeassistant.const import (
+    CONF_ADDRESS,
+    CONF_DEVICES,
+    CONF_NAME,
+    CONF_PIN,
+    CONF_SCAN_INTERVAL,
+    UnitOfTime,
+)
+from homeassistant.core import callback
+from homeassistant.data_entry_flow import section
 from homeassistant.helpers.device_registry import format_mac
 from homeassistant.helpers.selector import (
+    NumberSelector,
+    NumberSelectorConfig,
+    NumberSelectorMode,
+    SelectOptionDict,
+    SelectSelector,
+    SelectSelectorConfig,
     TextSelector,
     TextSelectorConfig,
     TextSelectorType,
 )
 
-from .const import DOMAIN
+from .const import (
+    CONF_ADVANCED,
+    CONF_FLEET,
+    CONF_OFFLINE_QUEUE,
+    CONF_PERFORMANCE_PROFILE,
+    CONF_RECORD_SESSIONS,
+    CONF_RETRY_AFTER,
+    CONF_RETRY_COUNT,
+    CONF_RETRY_INTERVAL,
+    CONF_SWEEP_POLLING,
+    DOMAIN,
+)
+from .coordinator import CometBlueCoordinatorData
+from .handoff import async_store_setup_handoff
+from .schedule import WeekSchedule
+from .tuning import PerformanceProfile
 
 LOGGER = logging.getLogger(__name__)
 
@@ -36,6 +74,62 @@ DATA_SCHEMA = vol.Schema(
         ),
     }
 )
+OPTIONS_SCHEMA = vol.Schema(
+    {
+        vol.Optional(
+            CONF_PERFORMANCE_PROFILE, default=PerformanceProfile.BALANCED
+        ): SelectSelector(
+            SelectSelectorConfig(
+                options=list(PerformanceProfile),
+                translation_key=CONF_PERFORMANCE_PROFILE,
+            )
+        ),
+        vol.Optional(CONF_OFFLINE_QUEUE, default=False): bool,
+        vol.Optional(CONF_SWEEP_POLLING, default=False): bool,
+        vol.Optional(CONF_RECORD_SESSIONS, default=False): bool,
+        # Overrides of the values of the performance profile, unset if empty
+        vol.Required(CONF_ADVANCED): section(
+            vol.Schema(
+                {
+                    vol.Optional(CONF_SCAN_INTERVAL): NumberSelector(
+                        NumberSelectorConfig(
+                            min=1,
+                            max=60,
+                            mode=NumberSelectorMode.BOX,
+                            unit_of_measurement=UnitOfTime.MINUTES,
+                        )
+                    ),
+                    vol.Optional(CONF_RETRY_COUNT): vol.All(
+                        NumberSelector(
+                            NumberSelectorConfig(
+                                min=1, max=10, mode=NumberSelectorMode.BOX
+                            )
+                        ),
+                        vol.Coerce(int),
+                    ),
+                    vol.Optional(CONF_RETRY_INTERVAL): NumberSelector(
+                        NumberSelectorConfig(
+                            min=0.5,
+                            max=60,
+                            step=0.5,
+                            mode=NumberSelectorMode.BOX,
+                            unit_of_measurement=UnitOfTime.SECONDS,
+                        )
+                    ),
+                    vol.Optional(CONF_RETRY_AFTER): NumberSelector(
+                        NumberSelectorConfig(
+                            min=10,
+                            max=3600,
+                            mode=NumberSelectorMode.BOX,
+                            unit_of_measurement=UnitOfTime.SECONDS,
+                        )
+                    ),
+                }
+            ),
+            {"collapsed": True},
+        ),
+    }
+)
 
 
 def name_from_discovery(discovery: BluetoothServiceInfoBleak | None) -> str:
@@ -51,6 +145,7 @@ class CometBlueConfigFlow(ConfigFlow, domain=DOMAIN):
     """Handle a config flow for CometBlue."""
 
     VERSION = 1
+    MINOR_VERSION = 2
 
     _existing_entry_data: dict[str, Any] = {}
 
@@ -59,9 +154,25 @@ class CometBlueConfigFlow(ConfigFlow, domain=DOMAIN):
         self._discovery_info: BluetoothServiceInfoBleak | None = None
         self._discovered_devices: dict[str, BluetoothServiceInfoBleak] = {}
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry: ConfigEntry) -> CometBlueOptionsFlow:
+        """Get the options flow for this handler."""
+        return CometBlueOptionsFlow()
+
+    @classmethod
+    @callback
+    def async_supports_options_flow(cls, config_entry: ConfigEntry) -> bool:
+        """Return options flow support for this handler, only TRVs have options."""
+        return CONF_ADDRESS in config_entry.data
+
     async def _try_connect(self, user_input: dict[str, Any]) -> dict[str, str]:
         """Verify connection to the device with the provided PIN and read initial data."""
-        device_address = self._discovery_info.address if self._discovery_info else ""
+        device_address = (
+            self._discovery_info.address
+            if self._discovery_info
+            else self._existing_entry_data.get(CONF_ADDRESS, "")
+        )
         try:
             ble_device = async_ble_device_from_address(self.hass, device_address)
             LOGGER.info("Testing connection for device at address %s", device_address)
@@ -76,7 +187,7 @@ class CometBlueConfigFlow(ConfigFlow, domain=DOMAIN):
             async with cometblue_device:
                 try:
                     # Device only returns battery level if PIN is correct
-                    await cometblue_device.get_battery_async()
+                    battery = await cometblue_device.get_battery_async()
                 except TimeoutError:
                     # This likely means PIN was incorrect on Linux and ESPHome backends
                     LOGGER.debug(
@@ -84,14 +195,40 @@ class CometBlueConfigFlow(ConfigFlow, domain=DOMAIN):
                         exc_info=True,
                     )
                     return {"base": "invalid_pin"}
+                await self._async_read_setup_data(cometblue_device, battery)
         except TimeoutError:
             LOGGER.debug("Connection to device timed out", exc_info=True)
             return {"base": "timeout_connect"}
-        except Exception:  # noqa: BLE001
+        except Exception:
             LOGGER.debug("Failed to connect to device", exc_info=True)
             return {"base": "cannot_connect"}
         return {}
 
+    async def _async_read_setup_data(
+        self, cometblue_device: AsyncCometBlue, battery: int
+    ) -> None:
+        """Read what the entry setup needs while connected anyway.
+
+        The setup then neither connects for the device info nor for the
+        first refresh. Failures are left to the setup to retry.
+        """
+        try:
+            device_info = await cometblue_device.get_device_info_async()
+            data = CometBlueCoordinatorData(
+                temperatures=await cometblue_device.get_temperature_async(),
+                holiday=await cometblue_device.get_holiday_async(1) or {},
+                battery=battery,
+                schedule=WeekSchedule.from_weekdays(
+                    await cometblue_device.get_multiple_async(["weekdays"])
+                ),
+            )
+        except (InvalidByteValueError, TimeoutError, BleakError):
+            LOGGER.debug("Failed to read initial data for setup", exc_info=True)
+            return
+        async_store_setup_handoff(
+            self.hass, cometblue_device.device.address, device_info, data
+        )
+
     def _create_entry(
         self,
         pin: str,
@@ -118,6 +255,11 @@ class CometBlueConfigFlow(ConfigFlow, domain=DOMAIN):
 
         if user_input is not None:
             errors = await self._try_connect(user_input)
+            if not errors and self.source == SOURCE_RECONFIGURE:
+                return self.async_update_reload_and_abort(
+                    self._get_reconfigure_entry(),
+                    data_updates={CONF_PIN: user_input[CONF_PIN]},
+                )
             if not errors:
                 return self._create_entry(user_input[CONF_PIN])
 
@@ -186,11 +328,131 @@ class CometBlueConfigFlow(ConfigFlow, domain=DOMAIN):
     ) -> ConfigFlowResult:
         """Handle a flow initialized by the user."""
 
-        return await self.async_step_pick_device()
+        return self.async_show_menu(
+            step_id="user", menu_options=["pick_device", "zone", "fleet"]
+        )
+
+    async def async_step_fleet(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Handle the step to add the fleet health summary of all TRVs."""
+        await self.async_set_unique_id(CONF_FLEET)
+        if any(
+            CONF_FLEET in entry.data
+            for entry in self._async_current_entries(include_ignore=False)
+        ):
+            return self.async_abort(reason="fleet_already_configured")
+        if user_input is not None:
+            return self.async_create_entry(
+                title="Comet Blue fleet", data={CONF_FLEET: True}
+            )
+        return self.async_show_form(step_id="fleet")
+
+    async def async_step_zone(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Handle the step to group several TRVs into a zone."""
+
+        errors: dict[str, str] = {}
+        devices = {
+            entry.data[CONF_ADDRESS]: entry.title
+            for entry in self._async_current_entries(include_ignore=False)
+            if CONF_ADDRESS in entry.data
+        }
+        if len(devices) < 2:
+            return self.async_abort(reason="not_enough_devices")
+
+        if user_input is not None:
+            if len(user_input[CONF_DEVICES]) < 2:
+                errors[CONF_DEVICES] = "zone_too_small"
+            elif self.source == SOURCE_RECONFIGURE:
+                return self.async_update_reload_and_abort(
+                    self._get_reconfigure_entry(),
+                    title=user_input[CONF_NAME],
+                    data=user_input,
+                )
+            else:
+                return self.async_create_entry(
+                    title=user_input[CONF_NAME], data=user_input
+                )
+
+        schema = vol.Schema(
+            {
+                vol.Required(CONF_NAME): TextSelector(),
+                vol.Required(CONF_DEVICES): SelectSelector(
+                    SelectSelectorConfig(
+                        options=[
+                            SelectOptionDict(value=address, label=title)
+                            for address, title in devices.items()
+                        ],
+                        multiple=True,
+                    )
+                ),
+            }
+        )
+        return self.async_show_form(
+            step_id="zone",
+            data_schema=self.add_suggested_values_to_schema(
+                schema, user_input or self._existing_entry_data
+            ),
+            errors=errors,
+        )
 
     async def async_step_reconfigure(
         self, user_input: dict[str, Any] | None = None
     ) -> ConfigFlowResult:
         """Handle a reconfiguration flow initialized by the user."""
         self._existing_entry_data = dict(self._get_reconfigure_entry().data)
+        if CONF_DEVICES in self._existing_entry_data:
+            return await self.async_step_zone()
+        if CONF_FLEET in self._existing_entry_data:
+            return self.async_abort(reason="fleet_not_reconfigurable")
         return await self.async_step_bluetooth_confirm()
+
+    async def async_step_reauth(
+        self, entry_data: Mapping[str, Any]
+    ) -> ConfigFlowResult:
+        """Handle a reauthentication flow after the device rejected the PIN."""
+        self._existing_entry_data = dict(entry_data)
+        return await self.async_step_reauth_confirm()
+
+    async def async_step_reauth_confirm(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Handle entering the new PIN."""
+
+        errors: dict[str, str] = {}
+
+        if user_input is not None:
+            errors = await self._try_connect(user_input)
+            if not errors:
+                return self.async_update_reload_and_abort(
+                    self._get_reauth_entry(),
+                    data_updates={CONF_PIN: user_input[CONF_PIN]},
+                )
+
+        return self.async_show_form(
+            step_id="reauth_confirm",
+            data_schema=DATA_SCHEMA,
+            errors=errors,
+            description_placeholders={"name": self._get_reauth_entry().title},
+        )
+
+
+class CometBlueOptionsFlow(OptionsFlow):
+    """Handle options for a CometBlue device."""
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Manage the options."""
+
+        if user_input is not None:
+            return self.async_create_entry(data=user_input)
+
+        return self.async_show_form(
+            step_id="init",
+            data_schema=self.add_suggested_values_to_schema(
+                OPTIONS_SCHEMA, self.config_entry.options
+            ),
+        )
@@ -7,6 +7,14 @@ DOMAIN: Final = "eurotronic_cometblue"
 CONF_DATETIME: Final = "datetime"
 CONF_SCHEDULE: Final = "schedule"
 CONF_RETRY_COUNT: Final = "retry_count"
+CONF_RETRY_INTERVAL: Final = "retry_interval"
+CONF_RETRY_AFTER: Final = "retry_after"
+CONF_PERFORMANCE_PROFILE: Final = "performance_profile"
+CONF_ADVANCED: Final = "advanced"
+CONF_OFFLINE_QUEUE: Final = "offline_queue"
+CONF_SWEEP_POLLING: Final = "sweep_polling"
+CONF_RECORD_SESSIONS: Final = "record_sessions"
+CONF_FLEET: Final = "fleet"
 
 
 CONF_MONDAY: Final = "monday"
@@ -21,6 +29,17 @@ CONF_START: Final = "start"
 CONF_END: Final = "end"
 CONF_TEMPERATURE: Final = "temperature"
 
+# Ordered like datetime.weekday()
+CONF_WEEKDAYS: Final = (
+    CONF_MONDAY,
+    CONF_TUESDAY,
+    CONF_WEDNESDAY,
+    CONF_THURSDAY,
+    CONF_FRIDAY,
+    CONF_SATURDAY,
+    CONF_SUNDAY,
+)
+CONF_PROFILE: Final = "profile"
 CONF_ALL_DAYS: Final = {
     CONF_MONDAY,
     CONF_TUESDAY,
@@ -32,3 +51,21 @@ CONF_ALL_DAYS: Final = {
 }
 
 MAX_RETRIES: Final = 3
+# Connections opened at the same time by fleet-wide services. Most adapters
+# and ESPHome proxies only have three connection slots.
+MAX_CONCURRENT_CONNECTIONS: Final = 3
+
+MIN_TEMP: Final = 7.5
+MAX_TEMP: Final = 28.5
+
+# Data read by the coordinator, requested by entities as coordinator context
+DATA_TEMPERATURES: Final = "temperatures"
+DATA_HOLIDAY: Final = "holiday"
+DATA_BATTERY: Final = "battery"
+DATA_SCHEDULE: Final = "schedule"
+ALL_DATA: Final = frozenset(
+    {DATA_TEMPERATURES, DATA_HOLIDAY, DATA_BATTERY, DATA_SCHEDULE}
+)
+
+# Sent with (address, coordinator or None) when a TRV is set up or unloaded
+SIGNAL_COORDINATOR_CHANGED: Final = f"{DOMAIN}_coordinator_changed"
@@ -3,29 +3,152 @@
 from __future__ import annotations
 
 import asyncio
-from collections.abc import Awaitable, Callable
-from dataclasses import dataclass, field
-from datetime import timedelta
+from collections import deque
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterator
+from contextlib import AsyncExitStack, asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field, replace
+from datetime import datetime, timedelta
+from enum import StrEnum
+from functools import partial
 import logging
+from time import monotonic
 from typing import Any
 
 from bleak.exc import BleakError
 from eurotronic_cometblue_ha import AsyncCometBlue, InvalidByteValueError
 
+from homeassistant.components import bluetooth
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
-from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.exceptions import (
+    ConfigEntryAuthFailed,
+    HomeAssistantError,
+    ServiceValidationError,
+)
+from homeassistant.helpers.event import async_track_point_in_time
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
 
-from .const import MAX_RETRIES
+from .command_queue import CometBlueCommandQueue, QueuedCommand
+from .const import (
+    ALL_DATA,
+    CONF_OFFLINE_QUEUE,
+    CONF_RECORD_SESSIONS,
+    CONF_SWEEP_POLLING,
+    DATA_BATTERY,
+    DATA_HOLIDAY,
+    DATA_SCHEDULE,
+    DATA_TEMPERATURES,
+)
+from .errors import (
+    CometBlueCommunicationError,
+    CometBlueErrorKind,
+    CometBlueOperationTimeoutError,
+    RetryPolicy,
+    classify_error,
+)
+from .history import TemperatureHistory
+from .latency import PIN_CHECK_TIMEOUT, DeviceLatency, SessionProfile, SessionTimings
+from .link import LinkQuality
+from .schedule import WeekSchedule, next_schedule_switch
+from .schedule_profiles import DATA_SCHEDULE_PROFILES
+from .session_trace import (
+    RecordedCall,
+    RecordedSession,
+    SessionRecorder,
+    encode_error,
+    encode_value,
+)
+from .sweep import async_get_sweep_poller
+from .tuning import SCAN_INTERVAL, PollTuning
 
-SCAN_INTERVAL = timedelta(minutes=5)
 LOGGER = logging.getLogger(__name__)
-COMMAND_RETRY_INTERVAL = 2.5
+# The weekday schedule rarely changes and is only used to predict switch points
+SCHEDULE_REFRESH_INTERVAL = timedelta(hours=24)
+# The battery level drives the connection budget, even without a battery sensor
+BATTERY_REFRESH_INTERVAL = timedelta(hours=1)
+# Reads not needed to control the TRV are deferred while the battery budget
+# stretches polling: the holiday is read hourly, the schedule every three days
+DEFERRED_HOLIDAY_INTERVAL = timedelta(hours=1)
+DEFERRED_SCHEDULE_INTERVAL = timedelta(days=3)
+# Give the TRV some time to apply the new setpoint after a switch point
+SWITCH_REFRESH_DELAY = timedelta(minutes=1)
+# Advertisements arrive every few seconds, don't retry a failed replay on each of them
+QUEUE_REPLAY_COOLDOWN = timedelta(minutes=1)
+# Allowed connections per day by minimum battery level. Polling every
+# SCAN_INTERVAL needs 288 connections a day, commands come on top. Budgets
+# scale with the poll interval of the performance profile.
+CONNECTION_BUDGETS: tuple[tuple[int, int], ...] = (
+    (50, 400),
+    (30, 192),
+    (15, 96),
+    (0, 48),
+)
+CONNECTION_BUDGET_WINDOW = timedelta(days=1)
+# Transient and invalid data errors are retried as tuned by the options
+RETRY_POLICIES: dict[CometBlueErrorKind, RetryPolicy] = {
+    # Retrying with the same PIN can't succeed
+    CometBlueErrorKind.WRONG_PIN: RetryPolicy(attempts=1, delay=0, retry_after=60),
+    # bleak-retry-connector already retried, wait for the next advertisement
+    CometBlueErrorKind.DEVICE_NOT_FOUND: RetryPolicy(
+        attempts=1, delay=0, retry_after=60
+    ),
+    # Slots are freed as soon as sessions to other devices finish
+    CometBlueErrorKind.NO_CONNECTION_SLOT: RetryPolicy(
+        attempts=2, delay=10, retry_after=30
+    ),
+}
+# Consecutive sessions timing out after writing the PIN before asking for a new PIN
+PIN_FAILURE_THRESHOLD = 2
+# Seconds a poll waits for a better advertisement if the link is likely to fail
+LINK_RECOVERY_WAIT = 15
+# Set while a poll is profiled to record the timings of its sessions
+SESSION_PROFILE: ContextVar[SessionProfile | None] = ContextVar(
+    "session_profile", default=None
+)
+# Set while a call is recorded to add its sessions
+RECORDED_CALL: ContextVar[RecordedCall | None] = ContextVar(
+    "recorded_call", default=None
+)
+
+# Result of a read that joined a session which ended before running it
+_NOT_READ: Any = object()
+# Result of a write queued until the device is reachable again
+COMMAND_QUEUED: Any = object()
 
 type CometBlueConfigEntry = ConfigEntry[CometBlueDataUpdateCoordinator]
 
 
+def _read_key(
+    function: Callable[..., Any], args: tuple[Any, ...], kwargs: dict[str, Any]
+) -> tuple[str, str] | None:
+    """Return what identifies a read of the device, None for writes."""
+    if not function.__name__.startswith("get_"):
+        return None
+    return function.__name__, repr((args, sorted(kwargs.items())))
+
+
+def battery_connection_budget(
+    battery: int | None, scan_interval: timedelta = SCAN_INTERVAL
+) -> int:
+    """Return the allowed connections per day for a battery level."""
+    budget = next(
+        budget
+        for min_battery, budget in CONNECTION_BUDGETS
+        if battery is None or battery >= min_battery
+    )
+    return max(1, round(budget * (SCAN_INTERVAL / scan_interval)))
+
+
+class ScheduleWrite(StrEnum):
+    """Outcome of applying a weekday schedule to a device."""
+
+    WRITTEN = "written"
+    UNCHANGED = "unchanged"
+    QUEUED = "queued"
+
+
 @dataclass
 class CometBlueCoordinatorData:
     """Data stored by the coordinator."""
@@ -33,78 +156,744 @@ class CometBlueCoordinatorData:
     temperatures: dict[str, float | int] = field(default_factory=dict)
     holiday: dict = field(default_factory=dict)
     battery: int | None = None
+    schedule: WeekSchedule = WeekSchedule()
+
+    @property
+    def holiday_active(self) -> bool:
+        """Return if the holiday (away) mode is currently active."""
+        return self.holiday.get("start") is None and self.holiday.get("end") is not None
 
 
 class CometBlueDataUpdateCoordinator(DataUpdateCoordinator[CometBlueCoordinatorData]):
     """Class to manage fetching data."""
 
+    config_entry: CometBlueConfigEntry
+
     def __init__(
         self,
         hass: HomeAssistant,
         entry: CometBlueConfigEntry,
         cometblue: AsyncCometBlue,
+        initial_data: CometBlueCoordinatorData | None = None,
     ) -> None:
-        """Initialize global data updater."""
+        """Initialize global data updater.
+
+        `initial_data` is returned by the first refresh instead of reading
+        the device, e.g. if the config flow just read it.
+        """
+        self.tuning = PollTuning.from_options(entry.options)
         super().__init__(
             hass=hass,
             config_entry=entry,
             logger=LOGGER,
-            name=f"Comet Blue {cometblue.client.address}",
-            update_interval=SCAN_INTERVAL,
+            name=f"Comet Blue {cometblue.device.address}",
+            update_interval=self.tuning.scan_interval,
         )
         self.device = cometblue
-        self.address = cometblue.client.address
+        self.address = cometblue.device.address
+        # Only one BLE session per device at a time
+        self._session_lock = asyncio.Lock()
+        self._schedule_updated: datetime | None = None
+        # Last time the battery level and the holiday were read
+        self._read_updated: dict[str, datetime] = {}
+        self._unsub_switch_refresh: CALLBACK_TYPE | None = None
+        self.command_queue = CometBlueCommandQueue(hass, entry.entry_id)
+        self._queue_replay_running = False
+        self._queue_replay_last: datetime | None = None
+        self.connection_count = 0
+        # Sessions started again after a failed one
+        self.retry_count = 0
+        # Monotonic timestamps of the connections within CONNECTION_BUDGET_WINDOW
+        self._connections: deque[float] = deque()
+        self._pin_failures = 0
+        self.latency = DeviceLatency()
+        self._session_timings: SessionTimings | None = None
+        # Set once the device answered in the current session, i.e. accepted the PIN
+        self._session_answered = False
+        self.temperature_history = TemperatureHistory()
+        self._initial_data = initial_data
+        # Set once the platforms added the entities, which then declare the data to read
+        self._entities_added = False
+        # Interval kept by the battery budget, polled by the sweep in sweep mode
+        self.poll_interval = self.tuning.scan_interval
+        self._last_poll: float | None = None
+        # Monotonic time of the last poll that read the device successfully
+        self.last_success: float | None = None
+        self._unsub_sweep: CALLBACK_TYPE | None = None
+        self.link_quality = LinkQuality()
+        self._link_recovered = asyncio.Event()
+        self.session_recorder: SessionRecorder | None = None
+        self._session_record: RecordedSession | None = None
+        # Results of reads in flight, shared by identical reads
+        self._pending_reads: dict[tuple[str, str], asyncio.Future[Any]] = {}
+        # Reads joining the open session, run before it disconnects
+        self._session_reads: (
+            list[tuple[Callable[..., Awaitable[Any]], dict[str, Any], asyncio.Future]]
+            | None
+        ) = None
+
+    async def _async_setup(self) -> None:
+        """Load queued commands and watch for advertisements of the device."""
+        await self.command_queue.async_load()
+        self.config_entry.async_on_unload(
+            bluetooth.async_register_callback(
+                self.hass,
+                self._async_handle_bluetooth_event,
+                bluetooth.BluetoothCallbackMatcher(address=self.address),
+                bluetooth.BluetoothScanningMode.PASSIVE,
+            )
+        )
+        self.async_apply_options()
+
+    @callback
+    def async_apply_options(self) -> None:
+        """Apply the options of the config entry without reloading."""
+        if self.config_entry.options.get(CONF_SWEEP_POLLING):
+            if self._unsub_sweep is None:
+                self._unsub_sweep = async_get_sweep_poller(self.hass).async_add(self)
+        elif self._unsub_sweep is not None:
+            self._unsub_sweep()
+            self._unsub_sweep = None
+        if not self.config_entry.options.get(CONF_RECORD_SESSIONS):
+            self.session_recorder = None
+        elif self.session_recorder is None:
+            self.session_recorder = SessionRecorder(self.hass, self.address)
+            LOGGER.info(
+                "Recording sessions of %s to %s", self.name, self.session_recorder.path
+            )
+        self.tuning = PollTuning.from_options(self.config_entry.options)
+        self._async_apply_connection_budget(self.data or CometBlueCoordinatorData())
+        self._async_update_poll_interval()
+
+    @callback
+    def _async_update_poll_interval(self) -> None:
+        """Poll on an own timer unless the device is part of the sweep."""
+        self.update_interval = None if self._unsub_sweep else self.poll_interval
+        if self._unsub_sweep:
+            async_get_sweep_poller(self.hass).async_update_interval()
+
+    def poll_due(self, tolerance: timedelta) -> bool:
+        """Return if the poll interval (minus tolerance) passed since the last poll."""
+        return (
+            self._last_poll is None
+            or monotonic() - self._last_poll
+            >= (self.poll_interval - tolerance).total_seconds()
+        )
 
     async def send_command(
         self,
         function: Callable[..., Awaitable[dict[str, Any] | None]],
         payload: dict[str, Any],
     ) -> dict[str, Any] | None:
-        """Send command to device."""
+        """Send command to device.
+
+        Reads share the result of an identical read in flight, or join the
+        open session instead of connecting again after it. Writes queued
+        until the device is reachable again return COMMAND_QUEUED.
+        """
+        with self._record_call(
+            "command", function=function.__name__, payload=encode_value(payload)
+        ):
+            if (key := _read_key(function, (), payload)) is None:
+                return await self._async_send_command(function, payload)
+            while (pending := self._pending_reads.get(key)) is not None:
+                LOGGER.debug(
+                    "Sharing '%s' of %s with a running read",
+                    function.__name__,
+                    self.name,
+                )
+                try:
+                    return await asyncio.shield(pending)
+                except asyncio.CancelledError:
+                    task = asyncio.current_task()
+                    if not pending.cancelled() or (task and task.cancelling()):
+                        raise
+                    # Only the task making the read was cancelled, read again
+            return await self._async_shared(key, self._async_read(function, payload))
 
+    async def _async_read(
+        self,
+        function: Callable[..., Awaitable[dict[str, Any] | None]],
+        payload: dict[str, Any],
+    ) -> dict[str, Any] | None:
+        """Read in the open session if there is one, else in an own session."""
+        if self._session_reads is not None:
+            joined = self.hass.loop.create_future()
+            self._session_reads.append((function, payload, joined))
+            if (result := await joined) is not _NOT_READ:
+                return result
+        return await self._async_send_command(function, payload)
+
+    async def _async_shared[_T](
+        self, key: tuple[str, str], awaitable: Awaitable[_T]
+    ) -> _T:
+        """Await a read, sharing its result with identical reads meanwhile."""
+        future: asyncio.Future[_T] = self.hass.loop.create_future()
+        self._pending_reads[key] = future
+        try:
+            result = await awaitable
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as ex:
+            future.set_exception(ex)
+            # Raised here, don't log it again if no other read waited for it
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            del self._pending_reads[key]
+
+    async def _async_send_command(
+        self,
+        function: Callable[..., Awaitable[dict[str, Any] | None]],
+        payload: dict[str, Any],
+    ) -> dict[str, Any] | None:
+        """Send a command, retrying and queueing it as its error allows."""
         LOGGER.debug("Updating device %s with '%s'", self.name, payload)
-        retry_count = 0
-        while retry_count < MAX_RETRIES:
+        attempt = 0
+        while True:
+            attempt += 1
             try:
-                async with self.device:
-                    return await function(**payload)
-            except (InvalidByteValueError, TimeoutError, BleakError) as ex:
-                retry_count += 1
-                if retry_count >= MAX_RETRIES:
+                async with self._async_session():
+                    return await self._async_timed(function, **payload)
+            except CometBlueCommunicationError as ex:
+                policy = self._retry_policy(ex.kind)
+                if attempt < policy.attempts:
+                    LOGGER.info(
+                        "Retry sending command to %s after %s error: %s",
+                        self.name,
+                        ex.kind,
+                        ex,
+                    )
+                    await asyncio.sleep(policy.delay)
+                    self.retry_count += 1
+                    continue
+                if self.pin_rejected:
                     raise HomeAssistantError(
-                        f"Error sending command to '{self.name}': {ex}"
+                        f"'{self.name}' rejected the PIN, please enter the correct PIN"
                     ) from ex
-                LOGGER.info(
-                    "Retry sending command to %s after %s (%s)",
-                    self.name,
-                    type(ex).__name__,
-                    ex,
-                )
-                await asyncio.sleep(COMMAND_RETRY_INTERVAL)
+                # Only queue commands that failed because the device was unreachable
+                if ex.kind not in (
+                    CometBlueErrorKind.WRONG_PIN,
+                    CometBlueErrorKind.INVALID_DATA,
+                ) and self._async_queue_command(function, payload):
+                    return COMMAND_QUEUED
+                raise HomeAssistantError(
+                    f"Error sending command to '{self.name}': {ex}"
+                ) from ex
             except ValueError as ex:
                 raise ServiceValidationError(
                     f"Invalid payload '{payload}' for '{self.name}': {ex}"
                 ) from ex
-        return None
+
+    @asynccontextmanager
+    async def _async_session(self) -> AsyncIterator[AsyncCometBlue]:
+        """Open a BLE session, only one per device at a time.
+
+        Communication errors are raised as CometBlueCommunicationError,
+        classified by their cause.
+        """
+        lock_requested = monotonic()
+        async with self._session_lock:
+            self.connection_count += 1
+            self._connections.append(monotonic())
+            connected = False
+            session_start = monotonic()
+            timings = SessionTimings(lock_wait=session_start - lock_requested)
+            if (profile := SESSION_PROFILE.get()) is not None:
+                profile.sessions.append(timings)
+            self._session_timings = timings
+            record = (
+                call.add_session(timings.lock_wait)
+                if (call := RECORDED_CALL.get()) is not None
+                else None
+            )
+            self._session_record = record
+            self._session_reads = []
+            self._session_answered = False
+            source = self.link_quality.source
+            # Cancel hung sessions so the next command gets its turn
+            deadline = asyncio.timeout(self.latency.session.timeout)
+            try:
+                async with deadline, AsyncExitStack() as stack:
+                    async with asyncio.timeout(self.latency.connect.timeout):
+                        await stack.enter_async_context(self.device)
+                    timings.connect = monotonic() - session_start
+                    self.latency.connect.add(timings.connect)
+                    if record is not None:
+                        record.connect = timings.connect
+                    connected = True
+                    if source is not None:
+                        self.link_quality.add_connect(source, True)
+                    yield self.device
+                    await self._async_run_session_reads()
+            except (InvalidByteValueError, TimeoutError, BleakError) as ex:
+                if deadline.expired():
+                    LOGGER.debug(
+                        "Session with %s exceeded its deadline of %.1fs",
+                        self.name,
+                        self.latency.session.timeout,
+                    )
+                    kind = CometBlueErrorKind.TRANSIENT
+                else:
+                    kind = classify_error(ex, connected)
+                if not connected and source is not None:
+                    self.link_quality.add_connect(source, False)
+                if not connected and record is not None:
+                    record.connect = monotonic() - session_start
+                    record.connect_error = encode_error(ex)
+                if kind is CometBlueErrorKind.WRONG_PIN:
+                    self._async_handle_pin_failure()
+                timings.error = f"{kind}: {type(ex).__name__} ({ex})"
+                raise CometBlueCommunicationError(kind, ex) from ex
+            finally:
+                timings.total = monotonic() - session_start
+                self._session_timings = None
+                if record is not None:
+                    record.total = timings.total
+                    self._session_record = None
+                # Reads that could not join read in a session of their own
+                for _, _, joined in self._session_reads:
+                    if not joined.done():
+                        joined.set_result(_NOT_READ)
+                self._session_reads = None
+            self.latency.session.add(timings.total)
+            self._pin_failures = 0
+
+    async def _async_run_session_reads(self) -> None:
+        """Run the reads that joined the session."""
+        while self._session_reads:
+            function, payload, joined = self._session_reads.pop(0)
+            if joined.done():
+                # The read was cancelled meanwhile
+                continue
+            try:
+                result = await self._async_timed(function, **payload)
+            except (InvalidByteValueError, TimeoutError, BleakError) as ex:
+                # The read retries in its own session, the connection may be gone
+                LOGGER.debug(
+                    "'%s' joining the session of %s failed: %s",
+                    function.__name__,
+                    self.name,
+                    ex,
+                )
+                if not joined.done():
+                    joined.set_result(_NOT_READ)
+                return
+            if not joined.done():
+                joined.set_result(result)
+
+    async def _async_timed[_T](
+        self, function: Callable[..., Awaitable[_T]], *args: Any, **kwargs: Any
+    ) -> _T:
+        """Run a GATT operation with a timeout derived from its observed latency.
+
+        Reads share their result with identical reads made meanwhile.
+        """
+        if (
+            key := _read_key(function, args, kwargs)
+        ) is not None and key not in self._pending_reads:
+            return await self._async_shared(
+                key, self._async_run_timed(function, *args, **kwargs)
+            )
+        return await self._async_run_timed(function, *args, **kwargs)
+
+    async def _async_run_timed[_T](
+        self, function: Callable[..., Awaitable[_T]], *args: Any, **kwargs: Any
+    ) -> _T:
+        """Run a GATT operation, recording its duration and outcome."""
+        tracker = self.latency.operation(function.__name__)
+        timeout = tracker.timeout
+        if not self._session_answered:
+            timeout = max(timeout, PIN_CHECK_TIMEOUT)
+        operation = (
+            self._session_record.add_operation(function.__name__, args, kwargs)
+            if self._session_record is not None
+            else None
+        )
+        operation_timeout = asyncio.timeout(timeout)
+        start = monotonic()
+        try:
+            async with operation_timeout:
+                result = await function(*args, **kwargs)
+        except Exception as ex:
+            if operation is not None:
+                operation.error = encode_error(ex)
+            # Only timeouts raised by the library itself hint at a wrong PIN
+            if isinstance(ex, TimeoutError) and operation_timeout.expired():
+                # Let the timeout grow if the device became slower, e.g. moved to another proxy
+                tracker.add(timeout)
+                raise CometBlueOperationTimeoutError(
+                    f"'{function.__name__}' took longer than {timeout:.1f}s"
+                ) from ex
+            raise
+        else:
+            tracker.add(monotonic() - start)
+            self._session_answered = True
+            if operation is not None:
+                operation.result = encode_value(result)
+        finally:
+            if self._session_timings is not None:
+                self._session_timings.operations.append(
+                    (function.__name__, monotonic() - start)
+                )
+            if operation is not None:
+                operation.duration = monotonic() - start
+        return result
+
+    @contextmanager
+    def _record_call(self, kind: str, **details: Any) -> Iterator[None]:
+        """Record the sessions of a call to the trace file, if enabled.
+
+        Calls made by a recorded call, e.g. retries, belong to it.
+        """
+        if self.session_recorder is None or RECORDED_CALL.get() is not None:
+            yield
+            return
+        recorder = self.session_recorder
+        call = RecordedCall(address=self.address, kind=kind, details=details)
+        token = RECORDED_CALL.set(call)
+        try:
+            yield
+        except Exception as ex:
+            call.error = encode_error(ex)
+            raise
+        finally:
+            RECORDED_CALL.reset(token)
+            call.duration = monotonic() - call.started
+            # Calls answered from the cache did not talk to the device
+            if call.sessions:
+                recorder.async_add(call)
+
+    async def async_profile(self) -> dict[str, Any]:
+        """Poll the device once and return the duration of each phase."""
+        service_info = bluetooth.async_last_service_info(
+            self.hass, self.address, connectable=True
+        )
+        scanner = (
+            bluetooth.async_scanner_by_source(self.hass, service_info.source)
+            if service_info
+            else None
+        )
+        profile = SessionProfile()
+        # Only sessions of this task are recorded, commands running meanwhile are not
+        token = SESSION_PROFILE.set(profile)
+        start = monotonic()
+        try:
+            await self.async_refresh()
+        finally:
+            SESSION_PROFILE.reset(token)
+        total = monotonic() - start
+        return {
+            "success": self.last_update_success,
+            "error": None if self.last_update_success else str(self.last_exception),
+            "total": round(total, 3),
+            # Time between sessions, waiting before retries
+            "retry_wait": round(
+                total
+                - sum(
+                    session.lock_wait + (session.total or 0)
+                    for session in profile.sessions
+                ),
+                3,
+            ),
+            "retries": max(0, len(profile.sessions) - 1),
+            "source": service_info.source if service_info else None,
+            "scanner": scanner.name if scanner else None,
+            "rssi": service_info.rssi if service_info else None,
+            "advertisement_age": round(monotonic() - service_info.time, 1)
+            if service_info
+            else None,
+            "sessions": [session.as_dict() for session in profile.sessions],
+            "timeouts": self.latency.timeouts(),
+            "link": self.link_quality.as_dict(),
+        }
+
+    def _retry_policy(self, kind: CometBlueErrorKind) -> RetryPolicy:
+        """Return how often and how fast to retry after an error."""
+        return RETRY_POLICIES.get(kind) or self.tuning.retry_policy(kind)
+
+    @property
+    def pin_rejected(self) -> bool:
+        """Return if the device repeatedly rejected the configured PIN."""
+        return self._pin_failures >= PIN_FAILURE_THRESHOLD
+
+    @callback
+    def _async_handle_pin_failure(self) -> None:
+        """Ask for a new PIN if the device keeps rejecting it."""
+        self._pin_failures += 1
+        if self.pin_rejected:
+            LOGGER.warning("%s rejected the PIN, starting reauthentication", self.name)
+            self.config_entry.async_start_reauth(self.hass)
+
+    @property
+    def connection_budget(self) -> int:
+        """Return the allowed connections per day for the reported battery level."""
+        return battery_connection_budget(
+            self.data.battery if self.data else None, self.tuning.scan_interval
+        )
+
+    @property
+    def connections_in_window(self) -> int:
+        """Return the number of connections within the budget window."""
+        window_start = monotonic() - CONNECTION_BUDGET_WINDOW.total_seconds()
+        while self._connections and self._connections[0] < window_start:
+            self._connections.popleft()
+        return len(self._connections)
+
+    @property
+    def budget_constrained(self) -> bool:
+        """Return if the battery does not allow polling at the regular interval."""
+        return (
+            self.connection_budget * self.tuning.scan_interval
+            < CONNECTION_BUDGET_WINDOW
+        )
+
+    @callback
+    def _async_apply_connection_budget(self, data: CometBlueCoordinatorData) -> None:
+        """Stretch the poll interval so the connection budget is kept."""
+        budget = battery_connection_budget(data.battery, self.tuning.scan_interval)
+        update_interval = max(
+            self.tuning.scan_interval, CONNECTION_BUDGET_WINDOW / budget
+        )
+        if self.connections_in_window >= budget:
+            # Wait until the oldest connection leaves the window
+            update_interval = max(
+                update_interval,
+                timedelta(
+                    seconds=self._connections[0]
+                    + CONNECTION_BUDGET_WINDOW.total_seconds()
+                    - monotonic()
+                ),
+            )
+        if update_interval != self.poll_interval:
+            LOGGER.debug(
+                "Polling %s every %s (battery: %s%%, budget: %s connections/day)",
+                self.name,
+                update_interval,
+                data.battery,
+                budget,
+            )
+            self.poll_interval = update_interval
+            self._async_update_poll_interval()
+
+    @callback
+    def _async_queue_command(
+        self,
+        function: Callable[..., Awaitable[dict[str, Any] | None]],
+        payload: dict[str, Any],
+    ) -> bool:
+        """Queue a write command until the device is reachable again, if enabled."""
+        if not self.config_entry.options.get(
+            CONF_OFFLINE_QUEUE
+        ) or not function.__name__.startswith("set_"):
+            return False
+        LOGGER.warning(
+            "Device %s is not reachable, queueing '%s' with '%s'",
+            self.name,
+            function.__name__,
+            payload,
+        )
+        self.command_queue.async_add(function.__name__, payload)
+        self.async_update_listeners()
+        return True
+
+    @callback
+    def async_clear_command_queue(self) -> None:
+        """Drop all queued commands."""
+        self.command_queue.async_clear()
+        self.hass.data[DATA_SCHEDULE_PROFILES].async_resolve_pending(
+            self.address, written=False
+        )
+        self.async_update_listeners()
+
+    @callback
+    def _async_handle_bluetooth_event(
+        self,
+        service_info: bluetooth.BluetoothServiceInfoBleak,
+        change: bluetooth.BluetoothChange,
+    ) -> None:
+        """Track the link and replay queued commands when the device advertises."""
+        # Always connect via the path of the latest advertisement
+        self.device.device = service_info.device
+        self.link_quality.add_advertisement(
+            service_info.time, service_info.source, service_info.rssi
+        )
+        if self.link_quality.poor_link_reason() is None:
+            self._link_recovered.set()
+        if (
+            not self.command_queue
+            or self._queue_replay_running
+            or (
+                self._queue_replay_last is not None
+                and dt_util.utcnow() - self._queue_replay_last < QUEUE_REPLAY_COOLDOWN
+            )
+        ):
+            return
+        self._queue_replay_running = True
+        self.config_entry.async_create_background_task(
+            self.hass,
+            self._async_replay_command_queue(),
+            name=f"{self.name} - replay command queue",
+        )
+
+    async def _async_replay_command_queue(self) -> None:
+        """Send all queued commands in a single session."""
+        LOGGER.info(
+            "Replaying %s queued command(s) for %s", len(self.command_queue), self.name
+        )
+        self._queue_replay_last = dt_util.utcnow()
+        try:
+            with self._record_call("command_queue"):
+                async with self._async_session():
+                    while self.command_queue:
+                        command = self.command_queue.commands[0]
+                        written = True
+                        try:
+                            await self._async_timed(
+                                getattr(self.device, command.function),
+                                **command.replay_payload(),
+                            )
+                        except InvalidByteValueError:
+                            raise
+                        except ValueError as ex:
+                            LOGGER.warning(
+                                "Dropping invalid queued command '%s' for %s: %s",
+                                command.function,
+                                self.name,
+                                ex,
+                            )
+                            written = False
+                        self.command_queue.async_pop()
+                        if command.function == "set_weekdays_async":
+                            self._async_handle_replayed_schedule(command, written)
+        except CometBlueCommunicationError as ex:
+            LOGGER.info(
+                "Failed to replay queued commands for %s after %s error: %s",
+                self.name,
+                ex.kind,
+                ex,
+            )
+        finally:
+            self._queue_replay_running = False
+            self.async_update_listeners()
+        if not self.command_queue:
+            await self.async_request_refresh()
+
+    @callback
+    def _async_handle_replayed_schedule(
+        self, command: QueuedCommand, written: bool
+    ) -> None:
+        """Update the cache and the profile once a queued schedule write was sent."""
+        if written:
+            self.async_update_schedule(
+                WeekSchedule.from_weekdays(command.payload["values"])
+            )
+        # The last queued schedule write decides the profile of the device
+        if not any(
+            queued.function == command.function
+            for queued in self.command_queue.commands
+        ):
+            self.hass.data[DATA_SCHEDULE_PROFILES].async_resolve_pending(
+                self.address, written
+            )
+
+    @callback
+    def async_set_entities_added(self) -> None:
+        """Read only the data the entities need from now on."""
+        self._entities_added = True
+
+    @property
+    def read_plan(self) -> set[str]:
+        """Return the data required by the enabled entities and the budget."""
+        # Before the platforms added the entities (first refresh), read everything
+        read_plan = (
+            set().union(*self.async_contexts())
+            if self._entities_added
+            else set(ALL_DATA)
+        )
+        if self._read_outdated(DATA_BATTERY, BATTERY_REFRESH_INTERVAL):
+            read_plan.add(DATA_BATTERY)
+        if self.budget_constrained and not self._read_outdated(
+            DATA_HOLIDAY, DEFERRED_HOLIDAY_INTERVAL
+        ):
+            read_plan.discard(DATA_HOLIDAY)
+        return read_plan
+
+    def _read_outdated(self, name: str, interval: timedelta) -> bool:
+        """Return if data last read more than `interval` ago should be read again."""
+        return (
+            updated := self._read_updated.get(name)
+        ) is None or dt_util.utcnow() - updated > interval
 
     async def _async_update_data(self) -> CometBlueCoordinatorData:
         """Poll the device."""
+        with self._record_call("poll", read_plan=sorted(self.read_plan)):
+            return await self._async_poll()
+
+    async def _async_poll(self) -> CometBlueCoordinatorData:
+        """Read the data required by the entities, retrying as the errors allow."""
+        self._last_poll = monotonic()
         data: CometBlueCoordinatorData = CometBlueCoordinatorData()
+        read_plan = self.read_plan
+        if self._initial_data is not None:
+            data, self._initial_data = self._initial_data, None
+            if data.schedule:
+                self._schedule_updated = dt_util.utcnow()
+            if data.battery is not None:
+                self._read_updated[DATA_BATTERY] = dt_util.utcnow()
+            self._read_updated[DATA_HOLIDAY] = dt_util.utcnow()
+            read_plan = set()
+        LOGGER.debug("Reading %s from %s", ", ".join(sorted(read_plan)), self.name)
 
-        retry_count = 0
+        attempt = 0
+        completed = not read_plan
+        if not completed:
+            await self._async_wait_for_link()
+        # Don't spend retries on a link that is likely to fail
+        poor_link = self.link_quality.poor_link_reason() is not None
 
-        while retry_count < MAX_RETRIES and not data.temperatures:
+        while not completed:
+            attempt += 1
             try:
-                async with self.device:
+                async with self._async_session():
                     # temperatures are required and must trigger a retry if not available
-                    if not data.temperatures:
-                        data.temperatures = await self.device.get_temperature_async()
+                    if DATA_TEMPERATURES in read_plan and not data.temperatures:
+                        data.temperatures = await self._async_timed(
+                            self.device.get_temperature_async
+                        )
+                    completed = True
                     # holiday is optional and should not trigger a retry
                     try:
-                        if not data.holiday:
-                            data.holiday = await self.device.get_holiday_async(1) or {}
-                        if not data.battery:
-                            data.battery = await self.device.get_battery_async()
+                        if DATA_HOLIDAY in read_plan and not data.holiday:
+                            data.holiday = (
+                                await self._async_timed(
+                                    self.device.get_holiday_async, 1
+                                )
+                                or {}
+                            )
+                            self._read_updated[DATA_HOLIDAY] = dt_util.utcnow()
+                        if DATA_BATTERY in read_plan and not data.battery:
+                            data.battery = await self._async_timed(
+                                self.device.get_battery_async
+                            )
+                            self._read_updated[DATA_BATTERY] = dt_util.utcnow()
+                        if (
+                            DATA_SCHEDULE in read_plan
+                            and not data.schedule
+                            and self._schedule_outdated()
+                        ):
+                            data.schedule = WeekSchedule.from_weekdays(
+                                await self._async_timed(
+                                    self.device.get_multiple_async,
+                                    values=["weekdays"],
+                                )
+                            )
+                            self._schedule_updated = dt_util.utcnow()
+                            self._log_schedule_changes(data.schedule)
                     except InvalidByteValueError as ex:
                         LOGGER.warning(
                             "Failed to retrieve optional data for %s: %s (%s)",
@@ -112,28 +901,221 @@ class CometBlueDataUpdateCoordinator(DataUpdateCoordinator[CometBlueCoordinatorD
                             type(ex).__name__,
                             ex,
                         )
-            except (InvalidByteValueError, TimeoutError, BleakError) as ex:
-                retry_count += 1
-                if retry_count >= MAX_RETRIES:
+            except CometBlueCommunicationError as ex:
+                if self.pin_rejected:
+                    raise ConfigEntryAuthFailed(
+                        f"'{self.name}' rejected the PIN"
+                    ) from ex
+                policy = self._retry_policy(ex.kind)
+                if poor_link or attempt >= policy.attempts:
                     raise UpdateFailed(
-                        f"Error retrieving data: {ex}", retry_after=30
+                        f"Error retrieving data: {ex}", retry_after=policy.retry_after
                     ) from ex
                 LOGGER.info(
-                    "Retry updating %s after error: %s (%s)",
+                    "Retry updating %s after %s error: %s",
                     self.name,
-                    type(ex).__name__,
+                    ex.kind,
                     ex,
                 )
-                await asyncio.sleep(COMMAND_RETRY_INTERVAL)
+                await asyncio.sleep(policy.delay)
+                self.retry_count += 1
             except Exception as ex:
                 raise UpdateFailed(
-                    f"({type(ex).__name__}) {ex}", retry_after=30
+                    f"({type(ex).__name__}) {ex}",
+                    retry_after=self.tuning.retry_after,
                 ) from ex
 
-        # If one value was not retrieved correctly, keep the old value
+        if data.temperatures:
+            self._record_temperatures(data.temperatures)
+        # If one value was not retrieved correctly or not at all, keep the old value
+        if not data.temperatures:
+            data.temperatures = self.data.temperatures if self.data else {}
         if not data.holiday:
             data.holiday = self.data.holiday if self.data else {}
         if not data.battery:
             data.battery = self.data.battery if self.data else None
+        if not data.schedule:
+            data.schedule = self.data.schedule if self.data else WeekSchedule()
         LOGGER.debug("Received data for %s: %s", self.name, data)
+        self._async_apply_connection_budget(data)
+        self._async_schedule_switch_refresh(data)
+        self.last_success = monotonic()
         return data
+
+    async def _async_wait_for_link(self) -> None:
+        """Wait a bit for a better advertisement if a connection would likely fail."""
+        if (reason := self.link_quality.poor_link_reason()) is None:
+            return
+        LOGGER.debug(
+            "Waiting up to %ss for a better link to %s: %s",
+            LINK_RECOVERY_WAIT,
+            self.name,
+            reason,
+        )
+        self._link_recovered.clear()
+        try:
+            async with asyncio.timeout(LINK_RECOVERY_WAIT):
+                await self._link_recovered.wait()
+        except TimeoutError:
+            LOGGER.debug("Link to %s did not recover, polling once", self.name)
+
+    def _record_temperatures(self, temperatures: dict[str, float | int]) -> None:
+        """Add temperatures read from the device to the history."""
+        current = temperatures.get("currentTemp")
+        target = temperatures.get("manualTemp")
+        if current is not None and target is not None:
+            self.temperature_history.add(monotonic(), current, target)
+
+    def _schedule_outdated(self) -> bool:
+        """Return if the cached weekday schedule should be read again."""
+        interval = (
+            DEFERRED_SCHEDULE_INTERVAL
+            if self.budget_constrained
+            else SCHEDULE_REFRESH_INTERVAL
+        )
+        return (
+            self._schedule_updated is None
+            or dt_util.utcnow() - self._schedule_updated > interval
+        )
+
+    def _log_schedule_changes(self, schedule: WeekSchedule) -> None:
+        """Log days of a schedule read from the device that differ from the cache."""
+        if (
+            self.data
+            and self.data.schedule
+            and (changed := self.data.schedule.changes(schedule))
+        ):
+            LOGGER.debug(
+                "Schedule of %s changed on the device: %s",
+                self.name,
+                ", ".join(changed),
+            )
+
+    @property
+    def cached_schedule(self) -> WeekSchedule | None:
+        """Return the weekday schedule if the cached copy is recent enough."""
+        if not self.data or not self.data.schedule or self._schedule_outdated():
+            return None
+        return self.data.schedule
+
+    async def async_read_schedule(self) -> WeekSchedule | None:
+        """Read the weekday schedule from the device and update the cache."""
+        weekdays = await self.send_command(
+            self.device.get_multiple_async,
+            {"values": ["weekdays"]},
+        )
+        if not weekdays:
+            return None
+        schedule = WeekSchedule.from_weekdays(weekdays)
+        self._log_schedule_changes(schedule)
+        self.async_update_schedule(schedule)
+        return self.data.schedule
+
+    async def async_write_schedule(self, schedule: WeekSchedule) -> bool:
+        """Write the days of a weekday schedule to the device.
+
+        Returns False if the write was queued until the device is reachable,
+        the cache is then updated once the queued write was sent.
+        """
+        if (
+            await self.send_command(
+                self.device.set_weekdays_async, {"values": schedule.as_weekdays()}
+            )
+            is COMMAND_QUEUED
+        ):
+            return False
+        self.async_update_schedule(schedule)
+        return True
+
+    async def async_apply_schedule(self, schedule: WeekSchedule) -> ScheduleWrite:
+        """Write a weekday schedule unless the device already has it."""
+        current = self.cached_schedule or await self.async_read_schedule()
+        if current and not current.changes(schedule):
+            return ScheduleWrite.UNCHANGED
+        if not await self.async_write_schedule(schedule):
+            return ScheduleWrite.QUEUED
+        return ScheduleWrite.WRITTEN
+
+    @callback
+    def async_update_schedule(self, schedule: WeekSchedule) -> None:
+        """Update the cached weekday schedule after it was read or written."""
+        self.data.schedule = self.data.schedule.merge(schedule)
+        self._schedule_updated = dt_util.utcnow()
+        self._async_schedule_switch_refresh(self.data)
+
+    @callback
+    def _async_schedule_switch_refresh(self, data: CometBlueCoordinatorData) -> None:
+        """Schedule a targeted read right after the next switch point of the TRV."""
+        self._async_unsub_switch_refresh()
+        # The TRV does not follow its schedule while on holiday
+        if data.holiday_active or not data.temperatures:
+            return
+        if (switch := next_schedule_switch(data.schedule, dt_util.now())) is None:
+            return
+        switch_time, comfort = switch
+        LOGGER.debug(
+            "Next switch point for %s at %s (%s)",
+            self.name,
+            switch_time,
+            "comfort" if comfort else "eco",
+        )
+        self._unsub_switch_refresh = async_track_point_in_time(
+            self.hass,
+            partial(self._async_handle_switch_refresh, comfort),
+            switch_time + SWITCH_REFRESH_DELAY,
+        )
+
+    @callback
+    def _async_unsub_switch_refresh(self) -> None:
+        """Cancel a scheduled switch point refresh."""
+        if self._unsub_switch_refresh:
+            self._unsub_switch_refresh()
+            self._unsub_switch_refresh = None
+
+    async def _async_handle_switch_refresh(self, comfort: bool, _now: datetime) -> None:
+        """Read the temperatures after a switch point, falling back to the prediction."""
+        self._unsub_switch_refresh = None
+        if not self.data:
+            return
+
+        data = replace(self.data)
+        expected = data.temperatures["targetTempHigh" if comfort else "targetTempLow"]
+        if self.budget_constrained:
+            # Save the connection and rely on the prediction until the next poll
+            LOGGER.debug("Assuming %s switched to %s", self.name, expected)
+            data.temperatures = {**data.temperatures, "manualTemp": expected}
+        else:
+            try:
+                with self._record_call("switch_refresh", comfort=comfort):
+                    async with self._async_session():
+                        data.temperatures = await self._async_timed(
+                            self.device.get_temperature_async
+                        )
+            except CometBlueCommunicationError as ex:
+                LOGGER.debug(
+                    "Failed to read %s after switch point, assuming %s: %s",
+                    self.name,
+                    expected,
+                    ex,
+                )
+                data.temperatures = {**data.temperatures, "manualTemp": expected}
+            else:
+                self._record_temperatures(data.temperatures)
+                if data.temperatures["manualTemp"] != expected:
+                    LOGGER.debug(
+                        "%s did not switch to the expected %s, found %s",
+                        self.name,
+                        expected,
+                        data.temperatures["manualTemp"],
+                    )
+
+        self.async_set_updated_data(data)
+        self._async_schedule_switch_refresh(data)
+
+    async def async_shutdown(self) -> None:
+        """Cancel any scheduled call, and ignore new runs."""
+        await super().async_shutdown()
+        self._async_unsub_switch_refresh()
+        if self._unsub_sweep is not None:
+            self._unsub_sweep()
+            self._unsub_sweep = None
@@ -6,7 +6,7 @@ from homeassistant.components import bluetooth
 from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from . import DOMAIN
+from .const import DOMAIN
 from .coordinator import CometBlueDataUpdateCoordinator
 
 LOGGER = logging.getLogger(__name__)
@@ -17,9 +17,16 @@ class CometBlueBluetoothEntity(CoordinatorEntity[CometBlueDataUpdateCoordinator]
 
     _attr_has_entity_name = True
 
-    def __init__(self, coordinator: CometBlueDataUpdateCoordinator) -> None:
-        """Initialize coordinator entity."""
-        super().__init__(coordinator)
+    def __init__(
+        self,
+        coordinator: CometBlueDataUpdateCoordinator,
+        required_data: frozenset[str],
+    ) -> None:
+        """Initialize coordinator entity.
+
+        The coordinator only reads the data required by enabled entities.
+        """
+        super().__init__(coordinator, context=required_data)
         # Full DeviceInfo is added to DeviceRegistry in __init__.py, so we only
         # set identifiers here to link the entity to the device
         self._attr_device_info = DeviceInfo(
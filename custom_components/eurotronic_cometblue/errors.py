@@ -0,0 +1,64 @@
+"""Classification of Comet Blue communication errors."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from enum import StrEnum
+
+from bleak_retry_connector import BleakNotFoundError, BleakOutOfConnectionSlotsError
+from eurotronic_cometblue_ha import InvalidByteValueError
+
+
+class CometBlueErrorKind(StrEnum):
+    """Kinds of communication errors, each with its own retry policy."""
+
+    WRONG_PIN = "wrong_pin"
+    DEVICE_NOT_FOUND = "device_not_found"
+    NO_CONNECTION_SLOT = "no_connection_slot"
+    TRANSIENT = "transient"
+    INVALID_DATA = "invalid_data"
+
+
+@dataclass(frozen=True, kw_only=True)
+class RetryPolicy:
+    """How often and how fast to retry after an error."""
+
+    attempts: int
+    # Seconds to wait before the next attempt
+    delay: float
+    # Seconds until the next poll after all attempts failed
+    retry_after: float
+
+
+class CometBlueCommunicationError(Exception):
+    """Error communicating with a Comet Blue device."""
+
+    def __init__(self, kind: CometBlueErrorKind, error: Exception) -> None:
+        """Initialize the error from the original exception."""
+        super().__init__(f"{type(error).__name__} ({error})")
+        self.kind = kind
+
+
+class CometBlueOperationTimeoutError(TimeoutError):
+    """A GATT operation exceeded the timeout derived from its observed latency."""
+
+
+def classify_error(error: Exception, connected: bool) -> CometBlueErrorKind:
+    """Return the kind of an error raised during a BLE session.
+
+    `connected` is True if the error was raised after the connection was
+    established and the PIN was written.
+    """
+    if isinstance(error, InvalidByteValueError):
+        return CometBlueErrorKind.INVALID_DATA
+    if isinstance(error, BleakOutOfConnectionSlotsError):
+        return CometBlueErrorKind.NO_CONNECTION_SLOT
+    if isinstance(error, BleakNotFoundError):
+        return CometBlueErrorKind.DEVICE_NOT_FOUND
+    if isinstance(error, CometBlueOperationTimeoutError):
+        # A slow answer, unlike no answer at all
+        return CometBlueErrorKind.TRANSIENT
+    if isinstance(error, TimeoutError) and connected:
+        # The TRV does not answer GATT requests if the PIN was wrong
+        return CometBlueErrorKind.WRONG_PIN
+    return CometBlueErrorKind.TRANSIENT
@@ -0,0 +1,174 @@
+"""Health of all Comet Blue devices, kept up to date from coordinator updates."""
+
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import timedelta
+from functools import partial
+from time import monotonic
+from typing import TYPE_CHECKING
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+from homeassistant.util.hass_dict import HassKey
+
+from .const import DOMAIN, SIGNAL_COORDINATOR_CHANGED
+
+if TYPE_CHECKING:
+    from .coordinator import CometBlueDataUpdateCoordinator
+
+# Battery level (%) below which a TRV counts as low on battery
+LOW_BATTERY = 20
+# Window of the connection and retry rates
+RATE_WINDOW = timedelta(hours=1)
+
+DATA_FLEET_HEALTH: HassKey[CometBlueFleetHealth] = HassKey(f"{DOMAIN}_fleet_health")
+
+
+@dataclass
+class _DeviceHealth:
+    """Last known state of a device and its counters at the last update."""
+
+    unsub: CALLBACK_TYPE
+    reachable: bool = False
+    low_battery: bool = False
+    connections: int = 0
+    retries: int = 0
+
+
+class _RateWindow:
+    """Sum of counts added within RATE_WINDOW."""
+
+    def __init__(self) -> None:
+        self._counts: deque[tuple[float, int]] = deque()
+        self._total = 0
+
+    def add(self, count: int) -> None:
+        if count:
+            self._counts.append((monotonic(), count))
+            self._total += count
+
+    @property
+    def total(self) -> int:
+        window_start = monotonic() - RATE_WINDOW.total_seconds()
+        while self._counts and self._counts[0][0] < window_start:
+            self._total -= self._counts.popleft()[1]
+        return self._total
+
+
+class CometBlueFleetHealth:
+    """Summary of the health of all devices.
+
+    Each coordinator update only adjusts the totals by the difference to
+    the previous update of that device, so reading the summary does not
+    depend on the number of devices.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the fleet health."""
+        self.hass = hass
+        self._devices: dict[str, _DeviceHealth] = {}
+        # Monotonic time of the last successful poll, the oldest first
+        self._last_success: dict[str, float] = {}
+        self._connections = _RateWindow()
+        self._retries = _RateWindow()
+        self._listeners: set[Callable[[], None]] = set()
+        self.reachable = 0
+        self.low_battery = 0
+
+    @callback
+    def async_start(self) -> CALLBACK_TYPE:
+        """Track devices as they are set up and unloaded."""
+        return async_dispatcher_connect(
+            self.hass, SIGNAL_COORDINATOR_CHANGED, self._async_coordinator_changed
+        )
+
+    @callback
+    def async_add_listener(self, update_callback: Callable[[], None]) -> CALLBACK_TYPE:
+        """Call `update_callback` whenever the summary changed."""
+        self._listeners.add(update_callback)
+        return lambda: self._listeners.discard(update_callback)
+
+    @callback
+    def _async_update_listeners(self) -> None:
+        for update_callback in list(self._listeners):
+            update_callback()
+
+    @callback
+    def _async_coordinator_changed(
+        self, address: str, coordinator: CometBlueDataUpdateCoordinator | None
+    ) -> None:
+        """Add a device that was set up, remove one that was unloaded."""
+        if (device := self._devices.pop(address, None)) is not None:
+            device.unsub()
+            self.reachable -= device.reachable
+            self.low_battery -= device.low_battery
+            self._last_success.pop(address, None)
+        if coordinator is not None:
+            self._devices[address] = _DeviceHealth(
+                unsub=coordinator.async_add_listener(
+                    partial(self._async_update_device, address, coordinator),
+                    # The coordinator reads the battery level for its own
+                    # connection budget, whether or not its sensor is enabled
+                    frozenset(),
+                ),
+                connections=coordinator.connection_count,
+                retries=coordinator.retry_count,
+            )
+            self._async_update_device(address, coordinator)
+        else:
+            self._async_update_listeners()
+
+    @callback
+    def _async_update_device(
+        self, address: str, coordinator: CometBlueDataUpdateCoordinator
+    ) -> None:
+        """Apply the changes of a device since its previous update."""
+        device = self._devices[address]
+        reachable = coordinator.last_update_success
+        battery = coordinator.data.battery if coordinator.data else None
+        low_battery = battery is not None and battery < LOW_BATTERY
+        self.reachable += reachable - device.reachable
+        self.low_battery += low_battery - device.low_battery
+        device.reachable = reachable
+        device.low_battery = low_battery
+
+        self._connections.add(coordinator.connection_count - device.connections)
+        self._retries.add(coordinator.retry_count - device.retries)
+        device.connections = coordinator.connection_count
+        device.retries = coordinator.retry_count
+
+        if (
+            coordinator.last_success is not None
+            and self._last_success.get(address) != coordinator.last_success
+        ):
+            # Move the device to the end, keeping the oldest poll first
+            self._last_success.pop(address, None)
+            self._last_success[address] = coordinator.last_success
+        self._async_update_listeners()
+
+    @property
+    def unreachable(self) -> int:
+        """Return the number of devices whose last poll failed."""
+        return len(self._devices) - self.reachable
+
+    @property
+    def oldest_poll_age(self) -> float | None:
+        """Return the seconds since the least recent successful poll of a device."""
+        if not self._last_success:
+            return None
+        return monotonic() - next(iter(self._last_success.values()))
+
+    @property
+    def connections_per_hour(self) -> int:
+        """Return the connections of all devices within the last hour."""
+        return self._connections.total
+
+    @property
+    def retry_rate(self) -> float | None:
+        """Return the share of connections within the last hour that were retries."""
+        if not (connections := self._connections.total):
+            return None
+        return self._retries.total / connections
@@ -0,0 +1,59 @@
+"""Data read by the config flow, handed to the setup of the new entry."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import timedelta
+from time import monotonic
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.util.hass_dict import HassKey
+
+from .const import DOMAIN
+
+if TYPE_CHECKING:
+    from .coordinator import CometBlueCoordinatorData
+
+# Older data is read again by the entry setup
+HANDOFF_MAX_AGE = timedelta(minutes=5)
+
+DATA_SETUP_HANDOFF: HassKey[dict[str, CometBlueSetupHandoff]] = HassKey(
+    f"{DOMAIN}_setup_handoff"
+)
+
+
+@dataclass
+class CometBlueSetupHandoff:
+    """Device info and initial data read while validating the PIN."""
+
+    device_info: dict[str, Any]
+    data: CometBlueCoordinatorData
+    created: float
+
+
+@callback
+def async_store_setup_handoff(
+    hass: HomeAssistant,
+    address: str,
+    device_info: dict[str, Any],
+    data: CometBlueCoordinatorData,
+) -> None:
+    """Keep data read by the config flow for the setup of the entry."""
+    hass.data.setdefault(DATA_SETUP_HANDOFF, {})[address] = CometBlueSetupHandoff(
+        device_info, data, monotonic()
+    )
+
+
+@callback
+def async_pop_setup_handoff(
+    hass: HomeAssistant, address: str
+) -> CometBlueSetupHandoff | None:
+    """Return and forget the data read by the config flow, if still recent."""
+    handoff = hass.data.get(DATA_SETUP_HANDOFF, {}).pop(address, None)
+    if (
+        handoff is None
+        or monotonic() - handoff.created > HANDOFF_MAX_AGE.total_seconds()
+    ):
+        return None
+    return handoff
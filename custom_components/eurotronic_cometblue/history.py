@@ -0,0 +1,98 @@
+"""Recent temperature samples of a Comet Blue device."""
+
+from __future__ import annotations
+
+from array import array
+from collections.abc import Iterator
+from datetime import timedelta
+
+# Eight hours of samples at the regular poll interval
+HISTORY_SIZE = 96
+# Samples used for the heating rate
+HEATING_RATE_WINDOW = timedelta(hours=1)
+MIN_HEATING_RATE_SAMPLES = 3
+
+
+class TemperatureHistory:
+    """Fixed-size ring buffer of current and target temperature samples.
+
+    Timestamps are monotonic seconds. The heating rate is the slope of a
+    linear regression of the current temperature over HEATING_RATE_WINDOW,
+    kept up to date with running sums as samples are added and expire.
+    """
+
+    def __init__(
+        self, size: int = HISTORY_SIZE, rate_window: timedelta = HEATING_RATE_WINDOW
+    ) -> None:
+        """Initialize an empty history."""
+        self._size = size
+        self._rate_window = rate_window.total_seconds()
+        self._times = array("d", bytes(8 * size))
+        self._current = array("d", bytes(8 * size))
+        self._target = array("d", bytes(8 * size))
+        # Sequence numbers of the next sample and of the oldest sample in the rate window
+        self._added = 0
+        self._rate_start = 0
+        # Regression sums over the rate window, time in hours since the first sample
+        self._origin: float | None = None
+        self._sum_t = 0.0
+        self._sum_y = 0.0
+        self._sum_tt = 0.0
+        self._sum_ty = 0.0
+
+    def __len__(self) -> int:
+        """Return the number of stored samples."""
+        return min(self._added, self._size)
+
+    def add(self, timestamp: float, current: float, target: float) -> None:
+        """Add a sample, overwriting the oldest one if the buffer is full."""
+        if self._origin is None:
+            self._origin = timestamp
+        # Samples about to be overwritten leave the rate window first
+        while self._rate_start <= self._added - self._size:
+            self._remove_from_rate(self._rate_start)
+        index = self._added % self._size
+        self._times[index] = timestamp
+        self._current[index] = current
+        self._target[index] = target
+        self._added += 1
+
+        t = (timestamp - self._origin) / 3600
+        self._sum_t += t
+        self._sum_y += current
+        self._sum_tt += t * t
+        self._sum_ty += t * current
+        while (
+            self._rate_start < self._added - 1
+            and self._times[self._rate_start % self._size]
+            < timestamp - self._rate_window
+        ):
+            self._remove_from_rate(self._rate_start)
+
+    def _remove_from_rate(self, sequence: int) -> None:
+        """Remove the oldest sample of the rate window from the running sums."""
+        index = sequence % self._size
+        t = (self._times[index] - (self._origin or 0)) / 3600
+        current = self._current[index]
+        self._sum_t -= t
+        self._sum_y -= current
+        self._sum_tt -= t * t
+        self._sum_ty -= t * current
+        self._rate_start = sequence + 1
+
+    @property
+    def heating_rate(self) -> float | None:
+        """Return the change of the current temperature in °C per hour."""
+        samples = self._added - self._rate_start
+        if samples < MIN_HEATING_RATE_SAMPLES:
+            return None
+        denominator = samples * self._sum_tt - self._sum_t * self._sum_t
+        if denominator <= 0:
+            return None
+        return (samples * self._sum_ty - self._sum_t * self._sum_y) / denominator
+
+    def samples(self) -> Iterator[tuple[float, float, float]]:
+        """Return (timestamp, current, target) of the stored samples, oldest first."""
+        for sequence in range(self._added - len(self), self._added):
+            index = sequence % self._size
+            yield self._times[index], self._current[index], self._target[index]
@@ -0,0 +1,119 @@
+"""Latency tracking and adaptive timeouts for Comet Blue devices."""
+
+from __future__ import annotations
+
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any
+
+from bleak_retry_connector import BLEAK_TIMEOUT
+
+# Number of recent durations kept per operation
+LATENCY_SAMPLES = 50
+# Use the ceiling until enough durations were observed
+MIN_SAMPLES = 5
+TIMEOUT_PERCENTILE = 0.95
+TIMEOUT_FACTOR = 3
+
+# (floor, ceiling) of the timeouts in seconds. bleak-retry-connector tries
+# to connect up to four times, the library waits up to 20s per GATT request.
+CONNECT_TIMEOUT_LIMITS = (10.0, 90.0)
+OPERATION_TIMEOUT_LIMITS = (5.0, 60.0)
+SESSION_DEADLINE_LIMITS = (30.0, 180.0)
+# The TRV does not answer GATT requests if the PIN was wrong. The first
+# operation of a session waits longer than the library, so an unanswered
+# request ends with the library's timeout, which hints at a wrong PIN.
+PIN_CHECK_TIMEOUT = BLEAK_TIMEOUT + 5
+
+
+class LatencyTracker:
+    """Recent durations of an operation and the timeout derived from them."""
+
+    def __init__(self, limits: tuple[float, float]) -> None:
+        """Initialize the tracker with the (floor, ceiling) of the timeout."""
+        self.floor, self.ceiling = limits
+        self._samples: deque[float] = deque(maxlen=LATENCY_SAMPLES)
+
+    def __len__(self) -> int:
+        """Return the number of observed durations."""
+        return len(self._samples)
+
+    def add(self, duration: float) -> None:
+        """Add the duration of a completed operation in seconds."""
+        self._samples.append(duration)
+
+    def percentile(self, percentile: float) -> float | None:
+        """Return a percentile (0..1) of the observed durations."""
+        if not self._samples:
+            return None
+        samples = sorted(self._samples)
+        return samples[min(len(samples) - 1, int(percentile * len(samples)))]
+
+    @property
+    def timeout(self) -> float:
+        """Return the timeout for the next run of the operation."""
+        if len(self._samples) < MIN_SAMPLES:
+            return self.ceiling
+        # Percentile is always set with enough samples
+        slow = self.percentile(TIMEOUT_PERCENTILE) or self.ceiling
+        return min(self.ceiling, max(self.floor, slow * TIMEOUT_FACTOR))
+
+
+@dataclass
+class DeviceLatency:
+    """Latency trackers of a device for connecting, sessions and each operation."""
+
+    connect: LatencyTracker = field(
+        default_factory=lambda: LatencyTracker(CONNECT_TIMEOUT_LIMITS)
+    )
+    session: LatencyTracker = field(
+        default_factory=lambda: LatencyTracker(SESSION_DEADLINE_LIMITS)
+    )
+    operations: dict[str, LatencyTracker] = field(default_factory=dict)
+
+    def operation(self, name: str) -> LatencyTracker:
+        """Return the tracker of a GATT operation, e.g. `get_temperature_async`."""
+        if name not in self.operations:
+            self.operations[name] = LatencyTracker(OPERATION_TIMEOUT_LIMITS)
+        return self.operations[name]
+
+    def timeouts(self) -> dict[str, Any]:
+        """Return the current timeouts in seconds."""
+        return {
+            "connect": self.connect.timeout,
+            "session": self.session.timeout,
+            "operations": {
+                name: tracker.timeout for name, tracker in self.operations.items()
+            },
+        }
+
+
+@dataclass
+class SessionTimings:
+    """Durations in seconds of the phases of one BLE session."""
+
+    lock_wait: float
+    connect: float | None = None
+    operations: list[tuple[str, float]] = field(default_factory=list)
+    total: float | None = None
+    error: str | None = None
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a serializable representation, rounded to milliseconds."""
+        return {
+            "lock_wait": round(self.lock_wait, 3),
+            "connect": None if self.connect is None else round(self.connect, 3),
+            "operations": [
+                {"name": name, "duration": round(duration, 3)}
+                for name, duration in self.operations
+            ],
+            "total": None if self.total is None else round(self.total, 3),
+            "error": self.error,
+        }
+
+
+@dataclass
+class SessionProfile:
+    """Timings of all sessions of an instrumented poll, including retries."""
+
+    sessions: list[SessionTimings] = field(default_factory=list)
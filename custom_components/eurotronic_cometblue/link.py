@@ -0,0 +1,104 @@
+"""Link quality of a Comet Blue device, per adapter or proxy."""
+
+from __future__ import annotations
+
+from collections import deque
+from statistics import fmean, pstdev
+from typing import Any
+
+# One RSSI sample per interval, advertisements arrive every few seconds
+RSSI_SAMPLE_INTERVAL = 30.0
+# An hour of RSSI samples
+RSSI_SAMPLES = 120
+MIN_RSSI_SAMPLES = 10
+# An advertisement this far below the mean RSSI is a dip of the link
+RSSI_DIP_STDEVS = 2
+# Connections rarely succeed below this RSSI (dBm), whatever the history
+WEAK_RSSI = -95
+# Recent connection attempts kept per adapter
+CONNECT_SAMPLES = 20
+MIN_CONNECT_SAMPLES = 5
+POOR_SUCCESS_RATE = 0.5
+
+
+class LinkQuality:
+    """RSSI history and connection success rate by adapter of a device.
+
+    Used to predict if a connection attempt through an adapter is likely
+    to fail, so polls can wait for a better advertisement and don't spend
+    retries on a bad link.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty link model."""
+        self._rssi: deque[int] = deque(maxlen=RSSI_SAMPLES)
+        self._last_sample: float | None = None
+        # Outcomes of recent connection attempts, by adapter source
+        self._connects: dict[str, deque[bool]] = {}
+        self.source: str | None = None
+        self.rssi: int | None = None
+
+    def add_advertisement(self, timestamp: float, source: str, rssi: int) -> None:
+        """Record the adapter and RSSI of an advertisement."""
+        self.source = source
+        self.rssi = rssi
+        if (
+            self._last_sample is None
+            or timestamp - self._last_sample >= RSSI_SAMPLE_INTERVAL
+        ):
+            self._rssi.append(rssi)
+            self._last_sample = timestamp
+
+    def add_connect(self, source: str, success: bool) -> None:
+        """Record the outcome of a connection attempt through an adapter."""
+        if source not in self._connects:
+            self._connects[source] = deque(maxlen=CONNECT_SAMPLES)
+        self._connects[source].append(success)
+
+    @property
+    def rssi_mean(self) -> float | None:
+        """Return the mean RSSI of the recent advertisements."""
+        return fmean(self._rssi) if self._rssi else None
+
+    def success_rate(self, source: str | None = None) -> float | None:
+        """Return the share of successful connections, of one or all adapters."""
+        outcomes = (
+            list(self._connects.get(source, ()))
+            if source is not None
+            else [
+                outcome for connects in self._connects.values() for outcome in connects
+            ]
+        )
+        return sum(outcomes) / len(outcomes) if outcomes else None
+
+    def poor_link_reason(self) -> str | None:
+        """Return why a connection now is likely to fail, None if it is not."""
+        if self.rssi is not None and self.rssi < WEAK_RSSI:
+            return f"weak signal ({self.rssi} dBm)"
+        if self.rssi is not None and len(self._rssi) >= MIN_RSSI_SAMPLES:
+            mean = fmean(self._rssi)
+            if self.rssi < mean - RSSI_DIP_STDEVS * max(pstdev(self._rssi), 1):
+                return f"signal dip ({self.rssi} dBm, mean {mean:.0f} dBm)"
+        if (
+            self.source is not None
+            and len(self._connects.get(self.source, ())) >= MIN_CONNECT_SAMPLES
+            and (rate := self.success_rate(self.source)) is not None
+            and rate < POOR_SUCCESS_RATE
+        ):
+            return f"{rate:.0%} of the connections via {self.source} succeeded"
+        return None
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a serializable summary."""
+        rssi_mean = self.rssi_mean
+        return {
+            "source": self.source,
+            "rssi": self.rssi,
+            "rssi_mean": None if rssi_mean is None else round(rssi_mean, 1),
+            "success_rates": {
+                source: round(rate, 2)
+                for source in self._connects
+                if (rate := self.success_rate(source)) is not None
+            },
+            "poor_link": self.poor_link_reason(),
+        }
@@ -19,7 +19,7 @@ from homeassistant.const import PRECISION_HALVES, UnitOfTemperature, UnitOfTime
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddConfigEntryEntitiesCallback
 
-from .climate import MAX_TEMP, MIN_TEMP
+from .const import DATA_TEMPERATURES, MAX_TEMP, MIN_TEMP
 from .coordinator import CometBlueDataUpdateCoordinator
 from .entity import CometBlueBluetoothEntity
 
@@ -122,7 +122,7 @@ class CometBlueNumberEntity(CometBlueBluetoothEntity, NumberEntity):
     ) -> None:
         """Initialize CometBlueNumberEntity."""
 
-        super().__init__(coordinator)
+        super().__init__(coordinator, frozenset({DATA_TEMPERATURES}))
         self.entity_description = description
         self._attr_unique_id = f"{coordinator.address}-{description.key}"
 
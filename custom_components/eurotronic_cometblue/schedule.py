@@ -0,0 +1,173 @@
+"""Comet Blue weekday schedule helpers."""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from dataclasses import dataclass
+from datetime import datetime, time, timedelta
+
+from .const import CONF_END, CONF_START, CONF_WEEKDAYS
+
+# The TRV stores switch times in 10 minute steps
+SLOT_MINUTES = 10
+SLOTS_PER_DAY = 24 * 60 // SLOT_MINUTES
+# Heating periods per day the TRV can store
+MAX_PERIODS = 4
+
+
+def _slot(value: str) -> int:
+    """Return the slot of a HH:MM time, truncated like the TRV does."""
+    hour, minute = value.split(":")[:2]
+    return int(hour) * 60 // SLOT_MINUTES + int(minute) // SLOT_MINUTES
+
+
+def _slot_time(slot: int) -> time:
+    """Return the start time of a slot."""
+    return time(*divmod(slot * SLOT_MINUTES, 60))
+
+
+def _periods(mask: int) -> list[tuple[int, int]]:
+    """Return the (start, end) slots of the runs of set bits of a day."""
+    periods = []
+    slot = 0
+    while mask >> slot:
+        # Skip to the next set bit, then to the next cleared bit
+        start = slot + ((mask >> slot) & -(mask >> slot)).bit_length() - 1
+        end = start + (~(mask >> start) & ((mask >> start) + 1)).bit_length() - 1
+        periods.append((start, end))
+        slot = end
+    return periods
+
+
+@dataclass(frozen=True, slots=True)
+class WeekSchedule:
+    """Weekday schedule with one bitmask of 10 minute slots per day.
+
+    Bit n of a day is set if the TRV heats to the comfort temperature from
+    n * 10 minutes after midnight. Days not part of the schedule, e.g. of
+    an update of single days, are None. Schedules that heat at the same
+    times are equal, however their periods were written.
+    """
+
+    days: tuple[int | None, ...] = (None,) * len(CONF_WEEKDAYS)
+
+    @classmethod
+    def from_weekdays(
+        cls,
+        weekdays: Mapping[str, Mapping[str, str | None] | None],
+        *,
+        exact: bool = False,
+    ) -> WeekSchedule:
+        """Create from `{"monday": {"start1": "HH:MM", "end1": "HH:MM"}, ...}`.
+
+        Times are truncated to slots, and adjacent periods merge like on the
+        TRV. With `exact`, periods that would change raise a ValueError.
+        """
+        days: list[int | None] = []
+        for weekday in CONF_WEEKDAYS:
+            if (day := weekdays.get(weekday)) is None:
+                days.append(None)
+                continue
+            mask = 0
+            requested: list[tuple[time, time]] = []
+            for i in range(1, MAX_PERIODS + 1):
+                start = day.get(f"{CONF_START}{i}")
+                end = day.get(f"{CONF_END}{i}")
+                if not start or not end:
+                    continue
+                if exact:
+                    requested.append(
+                        (time.fromisoformat(start), time.fromisoformat(end))
+                    )
+                if _slot(start) < _slot(end):
+                    mask |= (1 << _slot(end)) - (1 << _slot(start))
+            if exact and requested != [
+                (_slot_time(start), _slot_time(end)) for start, end in _periods(mask)
+            ]:
+                raise ValueError(
+                    f"{weekday} can't be stored by the TRV as requested, it"
+                    f" switches in steps of {SLOT_MINUTES} minutes between"
+                    " periods that don't touch"
+                )
+            days.append(mask)
+        return cls(tuple(days))
+
+    def as_weekdays(self) -> dict[str, dict[str, str]]:
+        """Return the days of the schedule as `set_weekdays_async` payload."""
+        weekdays: dict[str, dict[str, str]] = {}
+        for weekday, mask in zip(CONF_WEEKDAYS, self.days, strict=True):
+            if mask is None:
+                continue
+            periods = _periods(mask)
+            if len(periods) > MAX_PERIODS:
+                raise ValueError(
+                    f"{weekday} has {len(periods)} heating periods,"
+                    f" the TRV stores up to {MAX_PERIODS}"
+                )
+            weekdays[weekday] = {}
+            for i, (start, end) in enumerate(periods, 1):
+                weekdays[weekday][f"{CONF_START}{i}"] = _slot_time(start).strftime(
+                    "%H:%M"
+                )
+                weekdays[weekday][f"{CONF_END}{i}"] = _slot_time(end).strftime("%H:%M")
+        return weekdays
+
+    def __bool__(self) -> bool:
+        """Return if the schedule contains any day."""
+        return any(mask is not None for mask in self.days)
+
+    def merge(self, other: WeekSchedule) -> WeekSchedule:
+        """Return this schedule with the days of `other` written over it."""
+        return WeekSchedule(
+            tuple(
+                mask if mask is not None else own
+                for own, mask in zip(self.days, other.days, strict=True)
+            )
+        )
+
+    def changes(self, other: WeekSchedule) -> list[str]:
+        """Return the days writing `other` over this schedule would change."""
+        return [
+            weekday
+            for weekday, own, mask in zip(
+                CONF_WEEKDAYS, self.days, other.days, strict=True
+            )
+            if mask is not None and mask != own
+        ]
+
+    def switch_points(self, weekday: int) -> list[tuple[time, bool]]:
+        """Return the switch times of a day (0 is Monday) and if they start comfort."""
+        switches: list[tuple[time, bool]] = []
+        for start, end in _periods(self.days[weekday] or 0):
+            switches.append((_slot_time(start), True))
+            if end < SLOTS_PER_DAY:
+                switches.append((_slot_time(end), False))
+        return switches
+
+    def as_storage(self) -> list[str | None]:
+        """Return a JSON serializable form, a hex string per day."""
+        return [None if mask is None else f"{mask:x}" for mask in self.days]
+
+    @classmethod
+    def from_storage(cls, days: list[str | None]) -> WeekSchedule:
+        """Create from the form returned by `as_storage`."""
+        return cls(tuple(None if mask is None else int(mask, 16) for mask in days))
+
+
+def next_schedule_switch(
+    schedule: WeekSchedule, now: datetime
+) -> tuple[datetime, bool] | None:
+    """Return the next switch point of a weekday schedule after `now`.
+
+    The boolean is True if the TRV switches to the comfort temperature
+    (`targetTempHigh`) and False if it switches to the eco temperature
+    (`targetTempLow`).
+    """
+    # Look one week ahead, including the remainder of today
+    for offset in range(len(CONF_WEEKDAYS) + 1):
+        day = now.date() + timedelta(days=offset)
+        for switch_time, comfort in schedule.switch_points(day.weekday()):
+            switch = datetime.combine(day, switch_time, tzinfo=now.tzinfo)
+            if switch > now:
+                return switch, comfort
+    return None
@@ -0,0 +1,125 @@
+"""Named weekday schedule profiles shared by all Comet Blue devices."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+from homeassistant.util.hass_dict import HassKey
+
+from .const import DOMAIN
+from .schedule import WeekSchedule
+
+STORAGE_VERSION = 1
+STORAGE_KEY = f"{DOMAIN}.schedule_profiles"
+SAVE_DELAY = 1
+
+DATA_SCHEDULE_PROFILES: HassKey[CometBlueScheduleProfiles] = HassKey(
+    f"{DOMAIN}_schedule_profiles"
+)
+
+
+class CometBlueScheduleProfiles:
+    """Weekday schedules stored by name, and the profile each device has.
+
+    Profiles are validated once when they are stored, so applying them to
+    many devices only needs to compare and write.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the schedule profiles."""
+        self._store: Store[dict[str, Any]] = Store(hass, STORAGE_VERSION, STORAGE_KEY)
+        self.profiles: dict[str, WeekSchedule] = {}
+        # Profile by device address
+        self.assignments: dict[str, str] = {}
+        # Profile by device address of the last schedule write that is queued
+        # until the device is reachable, None if not a profile
+        self.pending: dict[str, str | None] = {}
+
+    async def async_load(self) -> None:
+        """Load profiles and assignments from storage."""
+        data = await self._store.async_load() or {}
+        self.profiles = {
+            name: WeekSchedule.from_storage(days)
+            for name, days in data.get("profiles", {}).items()
+        }
+        self.assignments = data.get("assignments", {})
+        self.pending = data.get("pending", {})
+
+    @callback
+    def async_set(self, name: str, schedule: WeekSchedule) -> None:
+        """Add or replace a profile."""
+        self.profiles[name] = schedule
+        # Devices got the previous version of the profile
+        self._async_drop_profile(name)
+        self._async_schedule_save()
+
+    @callback
+    def async_delete(self, name: str) -> None:
+        """Remove a profile."""
+        self.profiles.pop(name)
+        self._async_drop_profile(name)
+        self._async_schedule_save()
+
+    @callback
+    def _async_drop_profile(self, name: str) -> None:
+        """Forget which devices have or will have a profile."""
+        self.assignments = {
+            address: profile
+            for address, profile in self.assignments.items()
+            if profile != name
+        }
+        # Queued writes are still sent, but no longer write a known profile
+        self.pending = {
+            address: None if profile == name else profile
+            for address, profile in self.pending.items()
+        }
+
+    @callback
+    def async_assign(self, address: str, name: str | None) -> None:
+        """Record the profile a device has, None if it has an own schedule."""
+        if self.assignments.get(address) == name:
+            return
+        if name is None:
+            self.assignments.pop(address, None)
+        else:
+            self.assignments[address] = name
+        self._async_schedule_save()
+
+    @callback
+    def async_record_write(self, address: str, name: str | None, queued: bool) -> None:
+        """Record the profile written to a device, None if not a profile.
+
+        Queued writes are assigned once they were sent to the device.
+        """
+        if queued:
+            self.pending[address] = name
+            self._async_schedule_save()
+        else:
+            self.async_assign(address, name)
+
+    @callback
+    def async_resolve_pending(self, address: str, written: bool) -> None:
+        """Assign the profile of a queued schedule write once it was sent or dropped."""
+        if address not in self.pending:
+            return
+        name = self.pending.pop(address)
+        if written:
+            self.async_assign(address, name)
+        self._async_schedule_save()
+
+    @callback
+    def _async_schedule_save(self) -> None:
+        """Schedule saving profiles and assignments."""
+        self._store.async_delay_save(
+            lambda: {
+                "profiles": {
+                    name: schedule.as_storage()
+                    for name, schedule in self.profiles.items()
+                },
+                "assignments": self.assignments,
+                "pending": self.pending,
+            },
+            SAVE_DELAY,
+        )
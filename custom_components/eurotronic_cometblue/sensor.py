@@ -2,26 +2,156 @@
 
 from __future__ import annotations
 
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
 from homeassistant.components.sensor import (
     SensorDeviceClass,
     SensorEntity,
     SensorEntityDescription,
+    SensorStateClass,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import PERCENTAGE
+from homeassistant.const import (
+    PERCENTAGE,
+    SIGNAL_STRENGTH_DECIBELS_MILLIWATT,
+    EntityCategory,
+    UnitOfTemperature,
+    UnitOfTime,
+)
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers.device_registry import DeviceEntryType, DeviceInfo
 from homeassistant.helpers.entity_platform import AddConfigEntryEntitiesCallback
 
+from .const import CONF_FLEET, DATA_BATTERY, DATA_TEMPERATURES, DOMAIN
 from .coordinator import CometBlueDataUpdateCoordinator
 from .entity import CometBlueBluetoothEntity
+from .fleet import DATA_FLEET_HEALTH, CometBlueFleetHealth
 
 PARALLEL_UPDATES = 0
 
+
+@dataclass(frozen=True, kw_only=True)
+class CometBlueSensorEntityDescription(SensorEntityDescription):
+    """Describes a Comet Blue sensor entity."""
+
+    required_data: frozenset[str]
+    value_fn: Callable[[CometBlueDataUpdateCoordinator], float | None]
+    attributes_fn: Callable[[CometBlueDataUpdateCoordinator], dict[str, Any]] | None = (
+        None
+    )
+
+
+def _success_rate(coordinator: CometBlueDataUpdateCoordinator) -> float | None:
+    """Return the share of successful connections in percent."""
+    rate = coordinator.link_quality.success_rate()
+    return None if rate is None else round(rate * 100)
+
+
 DESCRIPTIONS = [
-    SensorEntityDescription(
+    CometBlueSensorEntityDescription(
         key="battery",
         device_class=SensorDeviceClass.BATTERY,
         native_unit_of_measurement=PERCENTAGE,
+        required_data=frozenset({DATA_BATTERY}),
+        value_fn=lambda coordinator: coordinator.data.battery,
+    ),
+    CometBlueSensorEntityDescription(
+        key="connections",
+        translation_key="connections",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        required_data=frozenset(),
+        value_fn=lambda coordinator: coordinator.connection_count,
+    ),
+    CometBlueSensorEntityDescription(
+        key="heating_rate",
+        translation_key="heating_rate",
+        native_unit_of_measurement=f"{UnitOfTemperature.CELSIUS}/h",
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=1,
+        required_data=frozenset({DATA_TEMPERATURES}),
+        value_fn=lambda coordinator: coordinator.temperature_history.heating_rate,
+    ),
+    CometBlueSensorEntityDescription(
+        key="rssi",
+        device_class=SensorDeviceClass.SIGNAL_STRENGTH,
+        native_unit_of_measurement=SIGNAL_STRENGTH_DECIBELS_MILLIWATT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=0,
+        required_data=frozenset(),
+        value_fn=lambda coordinator: coordinator.link_quality.rssi_mean,
+    ),
+    CometBlueSensorEntityDescription(
+        key="connect_success_rate",
+        translation_key="connect_success_rate",
+        native_unit_of_measurement=PERCENTAGE,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        state_class=SensorStateClass.MEASUREMENT,
+        required_data=frozenset(),
+        value_fn=_success_rate,
+        attributes_fn=lambda coordinator: coordinator.link_quality.as_dict(),
+    ),
+]
+
+
+@dataclass(frozen=True, kw_only=True)
+class CometBlueFleetSensorEntityDescription(SensorEntityDescription):
+    """Describes a sensor summarizing all Comet Blue devices."""
+
+    value_fn: Callable[[CometBlueFleetHealth], float | None]
+
+
+def _retry_rate(fleet: CometBlueFleetHealth) -> float | None:
+    """Return the share of connections that were retries in percent."""
+    rate = fleet.retry_rate
+    return None if rate is None else round(rate * 100, 1)
+
+
+FLEET_DESCRIPTIONS = [
+    CometBlueFleetSensorEntityDescription(
+        key="reachable",
+        translation_key="reachable",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda fleet: fleet.reachable,
+    ),
+    CometBlueFleetSensorEntityDescription(
+        key="unreachable",
+        translation_key="unreachable",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda fleet: fleet.unreachable,
+    ),
+    CometBlueFleetSensorEntityDescription(
+        key="oldest_poll_age",
+        translation_key="oldest_poll_age",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        suggested_unit_of_measurement=UnitOfTime.MINUTES,
+        suggested_display_precision=0,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda fleet: fleet.oldest_poll_age,
+    ),
+    CometBlueFleetSensorEntityDescription(
+        key="connections_per_hour",
+        translation_key="connections_per_hour",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda fleet: fleet.connections_per_hour,
+    ),
+    CometBlueFleetSensorEntityDescription(
+        key="retry_rate",
+        translation_key="retry_rate",
+        native_unit_of_measurement=PERCENTAGE,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=_retry_rate,
+    ),
+    CometBlueFleetSensorEntityDescription(
+        key="low_battery",
+        translation_key="low_battery",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda fleet: fleet.low_battery,
     ),
 ]
 
@@ -32,6 +162,13 @@ async def async_setup_entry(
     async_add_entities: AddConfigEntryEntitiesCallback,
 ) -> None:
     """Set up Comet Blue Bluetooth sensor based on a config entry."""
+    if CONF_FLEET in entry.data:
+        async_add_entities(
+            CometBlueFleetSensorEntity(hass.data[DATA_FLEET_HEALTH], entry, description)
+            for description in FLEET_DESCRIPTIONS
+        )
+        return
+
     coordinator: CometBlueDataUpdateCoordinator = entry.runtime_data
 
     entities: list[CometBlueSensorEntity] = [
@@ -44,20 +181,64 @@ async def async_setup_entry(
 class CometBlueSensorEntity(CometBlueBluetoothEntity, SensorEntity):
     """Representation of a sensor."""
 
+    entity_description: CometBlueSensorEntityDescription
+
     def __init__(
         self,
         coordinator: CometBlueDataUpdateCoordinator,
-        description: SensorEntityDescription,
+        description: CometBlueSensorEntityDescription,
     ) -> None:
         """Initialize CometBlueSensorEntity."""
 
-        super().__init__(coordinator)
+        super().__init__(coordinator, description.required_data)
         self.entity_description = description
         self._attr_unique_id = f"{coordinator.address}-{description.key}"
 
     @property
     def native_value(self) -> float | None:
         """Return the entity value to represent the entity state."""
-        if self.entity_description.key == "battery":
-            return self.coordinator.data.battery
-        return None
+        return self.entity_description.value_fn(self.coordinator)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Return the state attributes."""
+        if self.entity_description.attributes_fn is None:
+            return None
+        return self.entity_description.attributes_fn(self.coordinator)
+
+
+class CometBlueFleetSensorEntity(SensorEntity):
+    """Sensor summarizing the health of all devices."""
+
+    _attr_has_entity_name = True
+    _attr_should_poll = False
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    entity_description: CometBlueFleetSensorEntityDescription
+
+    def __init__(
+        self,
+        fleet: CometBlueFleetHealth,
+        entry: ConfigEntry,
+        description: CometBlueFleetSensorEntityDescription,
+    ) -> None:
+        """Initialize CometBlueFleetSensorEntity."""
+        self._fleet = fleet
+        self.entity_description = description
+        self._attr_unique_id = f"{entry.entry_id}-{description.key}"
+        self._attr_device_info = DeviceInfo(
+            identifiers={(DOMAIN, entry.entry_id)},
+            name=entry.title,
+            manufacturer="Eurotronic",
+            model="Comet Blue fleet",
+            entry_type=DeviceEntryType.SERVICE,
+        )
+
+    async def async_added_to_hass(self) -> None:
+        """Update whenever a device reported a change."""
+        await super().async_added_to_hass()
+        self.async_on_remove(self._fleet.async_add_listener(self.async_write_ha_state))
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the entity value to represent the entity state."""
+        return self.entity_description.value_fn(self._fleet)
@@ -0,0 +1,224 @@
+"""Recording of the BLE sessions of Comet Blue devices for offline replay."""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass, field
+from datetime import datetime
+import json
+from pathlib import Path
+from time import monotonic
+from typing import Any, Self
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN
+
+# Directory in the configuration directory with one trace file per device
+TRACE_DIRECTORY = f"{DOMAIN}_traces"
+
+
+def encode_value(value: Any) -> Any:
+    """Return a JSON serializable representation of a library value."""
+    if isinstance(value, datetime):
+        return {"__datetime__": value.isoformat()}
+    if isinstance(value, (bytes, bytearray)):
+        return {"__bytes__": value.hex()}
+    if isinstance(value, dict):
+        return {key: encode_value(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [encode_value(item) for item in value]
+    return value
+
+
+def decode_value(value: Any) -> Any:
+    """Return the library value of an encoded value."""
+    if isinstance(value, dict):
+        if "__datetime__" in value:
+            return datetime.fromisoformat(value["__datetime__"])
+        if "__bytes__" in value:
+            return bytearray.fromhex(value["__bytes__"])
+        return {key: decode_value(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [decode_value(item) for item in value]
+    return value
+
+
+def encode_error(error: BaseException) -> dict[str, str]:
+    """Return the type and message of an error."""
+    return {"type": type(error).__name__, "message": str(error)}
+
+
+@dataclass(kw_only=True)
+class RecordedOperation:
+    """A GATT operation of a session, e.g. `get_temperature_async`."""
+
+    name: str
+    args: list[Any] = field(default_factory=list)
+    kwargs: dict[str, Any] = field(default_factory=dict)
+    duration: float = 0.0
+    result: Any = None
+    error: dict[str, str] | None = None
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a serializable representation."""
+        return {
+            "name": self.name,
+            "args": self.args,
+            "kwargs": self.kwargs,
+            "duration": round(self.duration, 3),
+            "result": self.result,
+            "error": self.error,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> Self:
+        """Return an operation read from a trace."""
+        return cls(**data)
+
+
+@dataclass(kw_only=True)
+class RecordedSession:
+    """Connection, operations and timings of one BLE session."""
+
+    # Seconds since the start of the call
+    start: float
+    lock_wait: float
+    connect: float | None = None
+    connect_error: dict[str, str] | None = None
+    operations: list[RecordedOperation] = field(default_factory=list)
+    total: float | None = None
+
+    def add_operation(
+        self, name: str, args: tuple[Any, ...], kwargs: dict[str, Any]
+    ) -> RecordedOperation:
+        """Add an operation that is about to run."""
+        operation = RecordedOperation(
+            name=name, args=encode_value(args), kwargs=encode_value(kwargs)
+        )
+        self.operations.append(operation)
+        return operation
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a serializable representation."""
+        return {
+            "start": round(self.start, 3),
+            "lock_wait": round(self.lock_wait, 3),
+            "connect": None if self.connect is None else round(self.connect, 3),
+            "connect_error": self.connect_error,
+            "operations": [operation.as_dict() for operation in self.operations],
+            "total": None if self.total is None else round(self.total, 3),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> Self:
+        """Return a session read from a trace."""
+        return cls(
+            **{
+                **data,
+                "operations": [
+                    RecordedOperation.from_dict(operation)
+                    for operation in data["operations"]
+                ],
+            }
+        )
+
+
+@dataclass(kw_only=True)
+class RecordedCall:
+    """A coordinator call and the sessions it opened, including retries.
+
+    `kind` is `poll`, `command`, `switch_refresh` or `command_queue`,
+    `details` are the arguments needed to make the same call again.
+    """
+
+    address: str
+    kind: str
+    details: dict[str, Any] = field(default_factory=dict)
+    time: datetime = field(default_factory=dt_util.utcnow)
+    started: float = field(default_factory=monotonic)
+    duration: float | None = None
+    error: dict[str, str] | None = None
+    sessions: list[RecordedSession] = field(default_factory=list)
+
+    def add_session(self, lock_wait: float) -> RecordedSession:
+        """Add a session that just got the session lock."""
+        session = RecordedSession(
+            start=monotonic() - self.started - lock_wait, lock_wait=lock_wait
+        )
+        self.sessions.append(session)
+        return session
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a serializable representation."""
+        return {
+            "address": self.address,
+            "kind": self.kind,
+            "details": self.details,
+            "time": self.time.isoformat(),
+            "duration": None if self.duration is None else round(self.duration, 3),
+            "error": self.error,
+            "sessions": [session.as_dict() for session in self.sessions],
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> Self:
+        """Return a call read from a trace."""
+        return cls(
+            **{
+                **data,
+                "time": datetime.fromisoformat(data["time"]),
+                "sessions": [
+                    RecordedSession.from_dict(session) for session in data["sessions"]
+                ],
+            }
+        )
+
+
+def load_trace(path: Path) -> list[RecordedCall]:
+    """Return the calls of a trace file, the oldest first."""
+    with path.open(encoding="utf-8") as file:
+        calls = [RecordedCall.from_dict(json.loads(line)) for line in file if line]
+    return sorted(calls, key=lambda call: call.time)
+
+
+class SessionRecorder:
+    """Append the recorded calls of a device to its trace file.
+
+    Calls are written in the executor, in batches if they finish faster
+    than they are written.
+    """
+
+    def __init__(self, hass: HomeAssistant, address: str) -> None:
+        """Initialize the recorder."""
+        self.hass = hass
+        self.path = Path(
+            hass.config.path(TRACE_DIRECTORY, f"{address.replace(':', '')}.jsonl")
+        )
+        self._pending: list[str] = []
+        self._write_task: asyncio.Task[None] | None = None
+
+    @callback
+    def async_add(self, call: RecordedCall) -> None:
+        """Add a finished call to the trace file."""
+        self._pending.append(json.dumps(call.as_dict()))
+        if self._write_task is None:
+            self._write_task = self.hass.async_create_background_task(
+                self._async_write(), name=f"{DOMAIN} write {self.path.name}"
+            )
+
+    async def _async_write(self) -> None:
+        """Write pending calls until none are left."""
+        try:
+            while self._pending:
+                lines, self._pending = self._pending, []
+                await self.hass.async_add_executor_job(self._append, lines)
+        finally:
+            self._write_task = None
+
+    def _append(self, lines: list[str]) -> None:
+        """Append lines to the trace file."""
+        self.path.parent.mkdir(exist_ok=True)
+        with self.path.open("a", encoding="utf-8") as file:
+            file.writelines(f"{line}\n" for line in lines)
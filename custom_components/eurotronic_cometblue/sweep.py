@@ -0,0 +1,159 @@
+"""Domain-wide poller sweeping Comet Blue devices adapter by adapter."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import defaultdict
+from datetime import datetime, timedelta
+import logging
+from time import monotonic
+from typing import TYPE_CHECKING
+
+from homeassistant.components import bluetooth
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.util.hass_dict import HassKey
+
+from .const import DOMAIN
+
+if TYPE_CHECKING:
+    from .coordinator import CometBlueDataUpdateCoordinator
+
+LOGGER = logging.getLogger(__name__)
+
+# Pause between two devices reached through the same adapter
+SWEEP_PACE = 1.0
+# Devices without a known adapter are swept as one group
+UNKNOWN_SOURCE = "unknown"
+
+DATA_SWEEP_POLLER: HassKey[CometBlueSweepPoller] = HassKey(f"{DOMAIN}_sweep_poller")
+
+
+class CometBlueSweepPoller:
+    """Poll devices in sweep mode one adapter group at a time.
+
+    Devices are grouped by the adapter or proxy that received their last
+    advertisement. Groups are swept concurrently, the devices of a group
+    one after another with SWEEP_PACE in between, so each adapter only
+    has one connection to a TRV at a time. Sweeps run as often as the
+    shortest poll interval of the devices, each sweep only polls the
+    devices that are due.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the poller."""
+        self.hass = hass
+        self._coordinators: dict[str, CometBlueDataUpdateCoordinator] = {}
+        self._unsub_interval: CALLBACK_TYPE | None = None
+        self.interval: timedelta | None = None
+        self._sweep_task: asyncio.Task[None] | None = None
+        # Duration of the last sweep in seconds, by adapter
+        self.sweep_durations: dict[str, float] = {}
+
+    @callback
+    def async_add(self, coordinator: CometBlueDataUpdateCoordinator) -> CALLBACK_TYPE:
+        """Add a device to the sweep, returns a callback to remove it again."""
+        self._coordinators[coordinator.address] = coordinator
+        self.async_update_interval()
+
+        @callback
+        def remove() -> None:
+            self._coordinators.pop(coordinator.address, None)
+            if not self._coordinators:
+                self._async_stop()
+            else:
+                self.async_update_interval()
+
+        return remove
+
+    @callback
+    def async_update_interval(self) -> None:
+        """Sweep as often as the shortest poll interval of the devices."""
+        if not self._coordinators:
+            return
+        interval = min(
+            coordinator.poll_interval for coordinator in self._coordinators.values()
+        )
+        if interval == self.interval:
+            return
+        if self._unsub_interval:
+            self._unsub_interval()
+        LOGGER.debug("Sweeping every %s", interval)
+        self.interval = interval
+        self._unsub_interval = async_track_time_interval(
+            self.hass,
+            self._async_start_sweep,
+            interval,
+            name=f"{DOMAIN} sweep",
+        )
+
+    @callback
+    def _async_stop(self) -> None:
+        """Stop sweeping once the last device left."""
+        if self._unsub_interval:
+            self._unsub_interval()
+            self._unsub_interval = None
+            self.interval = None
+        if self._sweep_task:
+            self._sweep_task.cancel()
+            self._sweep_task = None
+        self.hass.data.pop(DATA_SWEEP_POLLER, None)
+
+    @callback
+    def _async_start_sweep(self, _now: datetime) -> None:
+        """Start a sweep unless the previous one is still running."""
+        if self._sweep_task and not self._sweep_task.done():
+            LOGGER.debug("Previous sweep still running, skipping")
+            return
+        self._sweep_task = self.hass.async_create_background_task(
+            self.async_sweep(), name=f"{DOMAIN} sweep"
+        )
+
+    def _groups(self) -> dict[str, list[CometBlueDataUpdateCoordinator]]:
+        """Return the devices due for polling, grouped by adapter."""
+        groups: dict[str, list[CometBlueDataUpdateCoordinator]] = defaultdict(list)
+        tolerance = (self.interval or timedelta()) / 2
+        for coordinator in self._coordinators.values():
+            if not coordinator.poll_due(tolerance):
+                continue
+            service_info = bluetooth.async_last_service_info(
+                self.hass, coordinator.address, connectable=True
+            )
+            groups[service_info.source if service_info else UNKNOWN_SOURCE].append(
+                coordinator
+            )
+        return groups
+
+    async def async_sweep(self) -> None:
+        """Poll all due devices, adapter groups concurrently."""
+        await asyncio.gather(
+            *(
+                self._async_sweep_group(source, coordinators)
+                for source, coordinators in self._groups().items()
+            )
+        )
+
+    async def _async_sweep_group(
+        self, source: str, coordinators: list[CometBlueDataUpdateCoordinator]
+    ) -> None:
+        """Poll the devices reached through one adapter one after another."""
+        start = monotonic()
+        for index, coordinator in enumerate(coordinators):
+            if index:
+                await asyncio.sleep(SWEEP_PACE)
+            await coordinator.async_refresh()
+        self.sweep_durations[source] = monotonic() - start
+        LOGGER.debug(
+            "Swept %s device(s) via %s in %.1fs",
+            len(coordinators),
+            source,
+            self.sweep_durations[source],
+        )
+
+
+@callback
+def async_get_sweep_poller(hass: HomeAssistant) -> CometBlueSweepPoller:
+    """Return the sweep poller, creating it on first use."""
+    if DATA_SWEEP_POLLER not in hass.data:
+        hass.data[DATA_SWEEP_POLLER] = CometBlueSweepPoller(hass)
+    return hass.data[DATA_SWEEP_POLLER]
@@ -0,0 +1,103 @@
+"""Performance profiles tuning how often a Comet Blue device is polled and retried."""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from dataclasses import dataclass, replace
+from datetime import timedelta
+from enum import StrEnum
+from typing import Any
+
+from homeassistant.const import CONF_SCAN_INTERVAL
+
+from .const import (
+    CONF_ADVANCED,
+    CONF_PERFORMANCE_PROFILE,
+    CONF_RETRY_AFTER,
+    CONF_RETRY_COUNT,
+    CONF_RETRY_INTERVAL,
+    MAX_RETRIES,
+)
+from .errors import CometBlueErrorKind, RetryPolicy
+
+SCAN_INTERVAL = timedelta(minutes=5)
+COMMAND_RETRY_INTERVAL = 2.5
+# Seconds until the next poll after a poll failed
+RETRY_AFTER = 30
+# A TRV sending invalid values rarely recovers by retrying more often
+INVALID_DATA_ATTEMPTS = 2
+
+
+class PerformanceProfile(StrEnum):
+    """Trade-offs between battery life and freshness of the data."""
+
+    BATTERY_SAVER = "battery_saver"
+    BALANCED = "balanced"
+    RESPONSIVE = "responsive"
+
+
+@dataclass(frozen=True, kw_only=True)
+class PollTuning:
+    """Poll interval and retries of a device."""
+
+    scan_interval: timedelta
+    # Attempts of a poll or command failing with a transient error
+    retry_count: int
+    # Seconds between two attempts
+    retry_interval: float
+    # Seconds until the next poll after all attempts failed
+    retry_after: float
+
+    @classmethod
+    def from_options(cls, options: Mapping[str, Any]) -> PollTuning:
+        """Return the tuning of a performance profile and its overrides."""
+        tuning = PERFORMANCE_PROFILES[
+            PerformanceProfile(
+                options.get(CONF_PERFORMANCE_PROFILE, PerformanceProfile.BALANCED)
+            )
+        ]
+        advanced = options.get(CONF_ADVANCED, {})
+        if CONF_SCAN_INTERVAL in advanced:
+            tuning = replace(
+                tuning, scan_interval=timedelta(minutes=advanced[CONF_SCAN_INTERVAL])
+            )
+        if CONF_RETRY_COUNT in advanced:
+            tuning = replace(tuning, retry_count=int(advanced[CONF_RETRY_COUNT]))
+        if CONF_RETRY_INTERVAL in advanced:
+            tuning = replace(tuning, retry_interval=advanced[CONF_RETRY_INTERVAL])
+        if CONF_RETRY_AFTER in advanced:
+            tuning = replace(tuning, retry_after=advanced[CONF_RETRY_AFTER])
+        return tuning
+
+    def retry_policy(self, kind: CometBlueErrorKind) -> RetryPolicy:
+        """Return the retry policy of transient and invalid data errors."""
+        attempts = self.retry_count
+        if kind is CometBlueErrorKind.INVALID_DATA:
+            attempts = min(attempts, INVALID_DATA_ATTEMPTS)
+        return RetryPolicy(
+            attempts=attempts, delay=self.retry_interval, retry_after=self.retry_after
+        )
+
+
+PERFORMANCE_PROFILES: dict[PerformanceProfile, PollTuning] = {
+    # Fewer connections, failed polls wait for the next regular poll
+    PerformanceProfile.BATTERY_SAVER: PollTuning(
+        scan_interval=timedelta(minutes=15),
+        retry_count=1,
+        retry_interval=COMMAND_RETRY_INTERVAL,
+        retry_after=300,
+    ),
+    PerformanceProfile.BALANCED: PollTuning(
+        scan_interval=SCAN_INTERVAL,
+        retry_count=MAX_RETRIES,
+        retry_interval=COMMAND_RETRY_INTERVAL,
+        retry_after=RETRY_AFTER,
+    ),
+    # Fresh data for rooms that are controlled closely, e.g. bathrooms
+    PerformanceProfile.RESPONSIVE: PollTuning(
+        scan_interval=timedelta(minutes=2),
+        retry_count=MAX_RETRIES + 1,
+        retry_interval=1.0,
+        retry_after=15,
+    ),
+}
@@ -8,7 +8,6 @@ import voluptuous as vol
 
 import homeassistant.helpers.config_validation as cv
 
-from .climate import MAX_TEMP, MIN_TEMP
 from .const import (
     CONF_ALL_DAYS,
     CONF_DATETIME,
@@ -16,6 +15,8 @@ from .const import (
     CONF_END,
     CONF_START,
     CONF_TEMPERATURE,
+    MAX_TEMP,
+    MIN_TEMP,
 )
 
 
@@ -0,0 +1 @@
+"""Development scripts for the Eurotronic Comet Blue integration."""
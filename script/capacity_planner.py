@@ -0,0 +1,427 @@
+"""Plan how many TRVs a set of Bluetooth adapters and proxies can poll.
+
+Simulates adapters with a limited number of connection slots and TRVs
+with connect and per-operation latencies and failure rates. The real
+coordinators of the integration poll the simulated TRVs, including their
+retry policies and session handling. Reports the shortest poll interval
+the fleet sustains and the expected age of the data. Simulated time runs
+`--speed` times faster than real time. Run from the repository root in a
+Home Assistant environment:
+
+    python -m script.capacity_planner --adapter hci0:3:8 --adapter proxy:3:12:4:0.5:0.05
+
+Each --adapter is NAME:SLOTS:TRVS[:CONNECT[:OPERATION[:FAILURE_RATE]]] with
+latencies in seconds and the failure rate per connect or GATT operation.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from dataclasses import dataclass, field, replace
+from itertools import pairwise
+import logging
+import random
+import tempfile
+from time import monotonic
+from typing import Any, Self
+from unittest.mock import patch
+
+from bleak.exc import BleakError
+from bleak_retry_connector import BleakOutOfConnectionSlotsError
+
+from .profile_startup import (
+    PACKAGE,
+    SimulatedCometBlue,
+    async_create_hass,
+    create_config_entry,
+    simulated_address,
+    simulated_bluetooth,
+)
+
+DEFAULT_CONNECT_LATENCY = 3.0
+DEFAULT_OPERATION_LATENCY = 0.5
+DEFAULT_FAILURE_RATE = 0.02
+# Proxies reject a connection without a free slot almost immediately
+SLOT_REJECT_LATENCY = 0.1
+# Latencies vary by this factor around their mean
+JITTER = 0.5
+# An interval is sustainable if at most this share of polls fail...
+MAX_FAILED_POLLS = 0.05
+# ...and no TRV's data gets older than this many poll intervals
+MAX_STALENESS_INTERVALS = 2
+# Stop the search once the interval is known to within this many seconds
+SEARCH_RESOLUTION = 5
+
+
+@dataclass(frozen=True, kw_only=True)
+class AdapterSpec:
+    """Layout of one adapter or proxy and the TRVs it reaches."""
+
+    name: str
+    slots: int
+    devices: int
+    connect_latency: float = DEFAULT_CONNECT_LATENCY
+    operation_latency: float = DEFAULT_OPERATION_LATENCY
+    failure_rate: float = DEFAULT_FAILURE_RATE
+
+    @classmethod
+    def parse(cls, spec: str) -> Self:
+        """Parse NAME:SLOTS:TRVS[:CONNECT[:OPERATION[:FAILURE_RATE]]]."""
+        name, slots, devices, *latencies = spec.split(":")
+        if len(latencies) > 3:
+            raise argparse.ArgumentTypeError(f"Too many fields in '{spec}'")
+        values = dict(
+            zip(
+                ("connect_latency", "operation_latency", "failure_rate"),
+                map(float, latencies),
+                strict=False,
+            )
+        )
+        return cls(name=name, slots=int(slots), devices=int(devices), **values)
+
+
+@dataclass
+class SimulatedAdapter:
+    """Connection slots of an adapter, shared by the TRVs it reaches."""
+
+    spec: AdapterSpec
+    in_use: int = 0
+    # Simulated seconds slots were in use
+    busy: float = 0.0
+
+
+@dataclass
+class Simulation:
+    """Clock and random source shared by all simulated devices."""
+
+    speed: float
+    rng: random.Random
+    start: float = field(default_factory=monotonic)
+    # Failures are only simulated once all entries are set up
+    failures: bool = False
+
+    def now(self) -> float:
+        """Return the simulated seconds since the start."""
+        return (monotonic() - self.start) * self.speed
+
+    async def sleep(self, seconds: float) -> None:
+        """Sleep for simulated seconds."""
+        await asyncio.sleep(seconds / self.speed)
+
+    async def latency(self, mean: float) -> None:
+        """Sleep for a jittered latency."""
+        await self.sleep(mean * self.rng.uniform(1 - JITTER, 1 + JITTER))
+
+    def fails(self, rate: float) -> bool:
+        """Return if an operation with a failure rate fails this time."""
+        return self.failures and self.rng.random() < rate
+
+
+class PlannedCometBlue(SimulatedCometBlue):
+    """Simulated TRV reached through a SimulatedAdapter."""
+
+    def __init__(
+        self,
+        device: Any,
+        pin: int,
+        adapter: SimulatedAdapter,
+        simulation: Simulation,
+    ) -> None:
+        """Initialize the simulated device."""
+        super().__init__(device, pin, adapter.spec.operation_latency)
+        self.adapter = adapter
+        self.simulation = simulation
+        self._connected: float | None = None
+
+    async def _respond(self, value: Any) -> Any:
+        await self.simulation.latency(self.adapter.spec.operation_latency)
+        if self.simulation.fails(self.adapter.spec.failure_rate):
+            raise BleakError("Simulated disconnect")
+        return value
+
+    async def __aenter__(self) -> Self:
+        """Connect through the adapter if it has a free slot."""
+        self.connections += 1
+        if self.adapter.in_use >= self.adapter.spec.slots:
+            await self.simulation.sleep(SLOT_REJECT_LATENCY)
+            raise BleakOutOfConnectionSlotsError(
+                f"No free connection slot on {self.adapter.spec.name}"
+            )
+        self.adapter.in_use += 1
+        self._connected = self.simulation.now()
+        await self.simulation.latency(self.adapter.spec.connect_latency)
+        if self.simulation.fails(self.adapter.spec.failure_rate):
+            self._release()
+            raise BleakError("Simulated connection failure")
+        return self
+
+    async def __aexit__(self, *args: object) -> None:
+        """Disconnect and free the slot."""
+        self._release()
+
+    def _release(self) -> None:
+        if self._connected is not None:
+            self.adapter.in_use -= 1
+            self.adapter.busy += self.simulation.now() - self._connected
+            self._connected = None
+
+    async def get_multiple_async(self, values: list[str]) -> dict[str, Any]:
+        """Return an empty weekday schedule, which takes seven reads."""
+        for _ in range(6):
+            await self._respond(None)
+        return await self._respond({})
+
+
+@dataclass
+class DeviceResult:
+    """Polls of one simulated TRV during a run."""
+
+    adapter: str
+    polls: int = 0
+    failed: int = 0
+    # Simulated times of the successful polls
+    successes: list[float] = field(default_factory=list)
+
+    def staleness(self, start: float, end: float) -> tuple[float, float]:
+        """Return the mean and maximum age of the data between start and end.
+
+        Times are simulated seconds since the start of the run, data read
+        before the run counts as read at its start.
+        """
+        previous = [time for time in self.successes if time <= start]
+        points = [
+            previous[-1] if previous else 0.0,
+            *(time for time in self.successes if start < time < end),
+            end,
+        ]
+        # The age grows linearly between two successful polls
+        area = sum(
+            ((later - earlier) ** 2 - (max(earlier, start) - earlier) ** 2) / 2
+            for earlier, later in pairwise(points)
+        )
+        return area / (end - start), max(
+            later - earlier for earlier, later in pairwise(points)
+        )
+
+
+@dataclass
+class RunResult:
+    """Outcome of polling the fleet at one interval."""
+
+    interval: float
+    devices: list[DeviceResult]
+    # Simulated seconds the TRVs were polled
+    duration: float
+    utilization: dict[str, float]
+
+    @property
+    def failed_share(self) -> float:
+        """Return the share of failed polls."""
+        polls = sum(device.polls for device in self.devices)
+        return sum(device.failed for device in self.devices) / polls if polls else 0
+
+    def staleness(self) -> tuple[float, float]:
+        """Return the mean and maximum data age over all TRVs."""
+        # Skip the first interval, in which the TRVs start polling at their phase
+        ages = [
+            device.staleness(self.interval, self.duration) for device in self.devices
+        ]
+        return sum(mean for mean, _ in ages) / len(ages), max(high for _, high in ages)
+
+    @property
+    def sustainable(self) -> bool:
+        """Return if the fleet keeps up with the interval."""
+        return (
+            self.failed_share <= MAX_FAILED_POLLS
+            and self.staleness()[1] <= MAX_STALENESS_INTERVALS * self.interval
+        )
+
+
+class CapacityPlanner:
+    """Set up the simulated fleet once and poll it at different intervals."""
+
+    def __init__(self, adapters: list[AdapterSpec], simulation: Simulation) -> None:
+        """Initialize the planner."""
+        self.simulation = simulation
+        self.adapters = {spec.name: SimulatedAdapter(spec) for spec in adapters}
+        self.layout = [spec.name for spec in adapters for _ in range(spec.devices)]
+        self.coordinators: list[Any] = []
+
+    def create_device(self, device: Any, pin: int) -> PlannedCometBlue:
+        """Return the simulated TRV of an address, reached through its adapter."""
+        index = int(device.address.replace(":", "")[-4:], 16)
+        return PlannedCometBlue(
+            device, pin, self.adapters[self.layout[index]], self.simulation
+        )
+
+    async def async_setup(self, hass: Any, options: dict[str, Any]) -> None:
+        """Set up an entry per simulated TRV, one after another."""
+        for index in range(len(self.layout)):
+            entry = create_config_entry(simulated_address(index), options)
+            await hass.config_entries.async_add(entry)
+            coordinator = entry.runtime_data
+            # Polls are driven by the planner at the interval under test
+            coordinator.update_interval = None
+            self.coordinators.append(coordinator)
+        self.simulation.failures = True
+
+    async def async_run(self, interval: float, rounds: int) -> RunResult:
+        """Poll all TRVs at an interval for some rounds."""
+        for adapter in self.adapters.values():
+            adapter.busy = 0
+        start = self.simulation.now()
+        end = start + interval * rounds
+        results = [DeviceResult(adapter) for adapter in self.layout]
+
+        async def drive(coordinator: Any, result: DeviceResult) -> None:
+            # Coordinators set up at different times poll at different phases
+            await self.simulation.sleep(self.simulation.rng.uniform(0, interval))
+            while self.simulation.now() < end:
+                await coordinator.async_refresh()
+                result.polls += 1
+                retry_after = None
+                if coordinator.last_update_success:
+                    result.successes.append(self.simulation.now() - start)
+                else:
+                    result.failed += 1
+                    retry_after = getattr(
+                        coordinator.last_exception, "retry_after", None
+                    )
+                # Home Assistant schedules the next poll after the previous one ended
+                await self.simulation.sleep(retry_after or interval)
+
+        await asyncio.gather(
+            *(
+                drive(coordinator, result)
+                for coordinator, result in zip(self.coordinators, results, strict=True)
+            )
+        )
+        # The last polls end after the planned end of the run
+        elapsed = self.simulation.now() - start
+        return RunResult(
+            interval=interval,
+            devices=results,
+            duration=end - start,
+            utilization={
+                name: adapter.busy / (adapter.spec.slots * elapsed)
+                for name, adapter in self.adapters.items()
+            },
+        )
+
+    def lower_bound(self) -> float:
+        """Return the interval at which the busiest adapter's slots are always in use."""
+        reads = 3  # temperatures, holiday, battery
+        return max(
+            (
+                spec.devices
+                * (spec.connect_latency + reads * spec.operation_latency)
+                / spec.slots
+                for spec in (adapter.spec for adapter in self.adapters.values())
+            ),
+            default=SEARCH_RESOLUTION,
+        )
+
+
+def print_run(result: RunResult) -> None:
+    """Print one line per run."""
+    mean_age, max_age = result.staleness()
+    utilization = ", ".join(
+        f"{name} {share:.0%}" for name, share in result.utilization.items()
+    )
+    print(
+        f"{result.interval:>8.0f}s {result.failed_share:>7.1%} {mean_age:>9.0f}s"
+        f" {max_age:>8.0f}s  {'yes' if result.sustainable else 'no ':<11} {utilization}"
+    )
+
+
+async def plan(
+    adapters: list[AdapterSpec], speed: float, rounds: int, seed: int
+) -> None:
+    """Find the shortest sustainable poll interval of a fleet."""
+    from custom_components.eurotronic_cometblue import coordinator, tuning  # noqa: PLC0415
+
+    scan_interval = tuning.SCAN_INTERVAL.total_seconds()
+    simulation = Simulation(speed=speed, rng=random.Random(seed))
+    planner = CapacityPlanner(adapters, simulation)
+    # Waits between retries pass in simulated time as well
+    retry_policies = {
+        kind: replace(policy, delay=policy.delay / speed)
+        for kind, policy in coordinator.RETRY_POLICIES.items()
+    }
+    options = {"advanced": {"retry_interval": tuning.COMMAND_RETRY_INTERVAL / speed}}
+    with (
+        tempfile.TemporaryDirectory() as config_dir,
+        simulated_bluetooth(0, planner.create_device),
+        patch.dict(coordinator.RETRY_POLICIES, retry_policies),
+    ):
+        hass = await async_create_hass(config_dir)
+        await planner.async_setup(hass, options)
+
+        print(
+            f"{len(planner.layout)} TRVs on {len(adapters)} adapter(s),"
+            f" {rounds} polls per TRV and interval at {speed:g}x speed"
+        )
+        print(
+            f"{'interval':>9} {'failed':>7} {'mean age':>10} {'max age':>9}"
+            f"  {'sustainable':<11} slot utilization"
+        )
+        at_scan_interval = await planner.async_run(scan_interval, rounds)
+        print_run(at_scan_interval)
+
+        # Find an interval the fleet keeps up with, then narrow down
+        high = at_scan_interval
+        while not high.sustainable and high.interval < 8 * scan_interval:
+            high = await planner.async_run(high.interval * 2, rounds)
+            print_run(high)
+        low = max(SEARCH_RESOLUTION, planner.lower_bound())
+        while high.sustainable and high.interval - low > SEARCH_RESOLUTION:
+            result = await planner.async_run(round((low + high.interval) / 2), rounds)
+            print_run(result)
+            if result.sustainable:
+                high = result
+            else:
+                low = result.interval
+        await hass.async_stop(force=True)
+
+    print()
+    if high.sustainable:
+        mean_age, max_age = high.staleness()
+        print(f"Shortest sustainable poll interval: {high.interval:.0f}s")
+        print(f"  data age at that interval: mean {mean_age:.0f}s, max {max_age:.0f}s")
+    else:
+        print(f"Not sustainable even when polling every {high.interval:.0f}s")
+    mean_age, max_age = at_scan_interval.staleness()
+    print(
+        f"Data age at SCAN_INTERVAL ({scan_interval:.0f}s):"
+        f" mean {mean_age:.0f}s, max {max_age:.0f}s"
+    )
+
+
+def main() -> None:
+    """Run the capacity planner and print the results."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--adapter",
+        type=AdapterSpec.parse,
+        action="append",
+        required=True,
+        help="NAME:SLOTS:TRVS[:CONNECT[:OPERATION[:FAILURE_RATE]]]",
+    )
+    parser.add_argument(
+        "--speed", type=float, default=100, help="simulated seconds per real second"
+    )
+    parser.add_argument(
+        "--rounds", type=int, default=4, help="polls per TRV for each interval"
+    )
+    parser.add_argument("--seed", type=int, default=0, help="random seed")
+    args = parser.parse_args()
+    if args.rounds < 2:
+        parser.error("--rounds must be at least 2")
+    # Failed polls are expected, the planner reports them
+    logging.getLogger(PACKAGE).setLevel(logging.CRITICAL)
+    asyncio.run(plan(args.adapter, args.speed, args.rounds, args.seed))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,242 @@
+"""Profile the startup cost of the Eurotronic Comet Blue integration.
+
+Measures the import time of the integration modules and the setup time of
+config entries against simulated TRVs, so changes to the startup path can
+be compared. Run from the repository root in a Home Assistant environment:
+
+    python -m script.profile_startup --entries 10 --latency 0.1
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections.abc import Callable, Iterator
+from contextlib import ExitStack, contextmanager
+from pathlib import Path
+import re
+import subprocess
+import sys
+import tempfile
+from time import monotonic
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any, Self
+from unittest.mock import MagicMock, patch
+
+if TYPE_CHECKING:
+    from homeassistant.config_entries import ConfigEntry
+    from homeassistant.core import HomeAssistant
+
+ROOT = Path(__file__).parent.parent
+PACKAGE = "custom_components.eurotronic_cometblue"
+PLATFORMS = ("climate", "number", "sensor")
+# Loaded by Home Assistant before the integration, not part of its import cost
+DEPENDENCIES = "import homeassistant.components.bluetooth"
+IMPORTTIME_REGEX = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|(\s+)(\S+)")
+
+
+def measure_imports() -> list[tuple[str, int, int]]:
+    """Return (module, self, cumulative) import times in µs of the integration."""
+    code = "; ".join(
+        [DEPENDENCIES, f"import {PACKAGE}"]
+        + [f"import {PACKAGE}.{platform}" for platform in PLATFORMS]
+    )
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return [
+        (match[4], int(match[1]), int(match[2]))
+        for line in result.stderr.splitlines()
+        if (match := IMPORTTIME_REGEX.match(line)) and match[4].startswith(PACKAGE)
+    ]
+
+
+class SimulatedCometBlue:
+    """Stand-in for AsyncCometBlue answering after a fixed latency."""
+
+    def __init__(self, device: Any, pin: int = 0, latency: float = 0.1) -> None:
+        """Initialize the simulated device."""
+        self.device = device
+        self.latency = latency
+        self.connections = 0
+
+    async def _respond(self, value: Any) -> Any:
+        await asyncio.sleep(self.latency)
+        return value
+
+    async def __aenter__(self) -> Self:
+        """Connect, which costs roughly three round trips."""
+        self.connections += 1
+        await asyncio.sleep(self.latency * 3)
+        return self
+
+    async def __aexit__(self, *args: object) -> None:
+        """Disconnect."""
+
+    async def get_device_info_async(self) -> dict[str, str]:
+        """Return device information."""
+        return await self._respond(
+            {"model": "Comet Blue", "manufacturer": "Eurotronic", "version": "0.0.6"}
+        )
+
+    async def get_battery_async(self) -> int:
+        """Return the battery level."""
+        return await self._respond(80)
+
+    async def get_temperature_async(self) -> dict[str, Any]:
+        """Return the temperatures."""
+        return await self._respond(
+            {
+                "currentTemp": 20.0,
+                "manualTemp": 20.0,
+                "targetTempLow": 17.0,
+                "targetTempHigh": 21.0,
+                "tempOffset": 0.0,
+                "windowOpen": False,
+                "windowOpenMinutes": 10,
+            }
+        )
+
+    async def get_holiday_async(self, number: int) -> dict[str, Any]:
+        """Return an empty holiday."""
+        return await self._respond({})
+
+    async def get_multiple_async(self, values: list[str]) -> dict[str, Any]:
+        """Return an empty weekday schedule."""
+        await asyncio.sleep(self.latency * 7)
+        return {}
+
+
+@contextmanager
+def simulated_bluetooth(
+    latency: float,
+    factory: Callable[[Any, int], SimulatedCometBlue] | None = None,
+) -> Iterator[list[SimulatedCometBlue]]:
+    """Patch the Bluetooth stack and the device library with simulations.
+
+    `factory` creates the simulated devices, by default a SimulatedCometBlue
+    with the given latency.
+    """
+    devices: list[SimulatedCometBlue] = []
+
+    def create_device(device: Any, pin: int = 0) -> SimulatedCometBlue:
+        devices.append(
+            factory(device, pin)
+            if factory
+            else SimulatedCometBlue(device, pin, latency)
+        )
+        return devices[-1]
+
+    with ExitStack() as stack:
+        for target, kwargs in (
+            (f"{PACKAGE}.AsyncCometBlue", {"side_effect": create_device}),
+            (
+                f"{PACKAGE}.async_ble_device_from_address",
+                {"side_effect": lambda hass, address: MagicMock(address=address)},
+            ),
+            (
+                f"{PACKAGE}.coordinator.bluetooth.async_register_callback",
+                {"return_value": lambda: None},
+            ),
+            (
+                f"{PACKAGE}.entity.bluetooth.async_address_present",
+                {"return_value": True},
+            ),
+        ):
+            stack.enter_context(patch(target, **kwargs))
+        yield devices
+
+
+async def async_create_hass(config_dir: str) -> HomeAssistant:
+    """Return a minimal Home Assistant instance loading the integration from ROOT."""
+    # Late imports, so the import measurement is not affected
+    from homeassistant import bootstrap, config_entries, loader  # noqa: PLC0415
+    from homeassistant.core import HomeAssistant  # noqa: PLC0415
+
+    (Path(config_dir) / "custom_components").symlink_to(ROOT / "custom_components")
+    hass = HomeAssistant(config_dir)
+    hass.config.skip_pip = True
+    loader.async_setup(hass)
+    hass.config_entries = config_entries.ConfigEntries(hass, {})
+    await bootstrap.async_load_base_functionality(hass)
+    # The bluetooth stack is simulated
+    hass.config.components.add("bluetooth")
+    return hass
+
+
+def create_config_entry(
+    address: str, options: dict[str, Any] | None = None
+) -> ConfigEntry:
+    """Return a config entry of a simulated TRV."""
+    from custom_components.eurotronic_cometblue.config_flow import CometBlueConfigFlow  # noqa: PLC0415
+    from homeassistant import config_entries  # noqa: PLC0415
+
+    return config_entries.ConfigEntry(
+        data={"address": address, "pin": "000000"},
+        discovery_keys=MappingProxyType({}),
+        domain="eurotronic_cometblue",
+        minor_version=CometBlueConfigFlow.MINOR_VERSION,
+        options=options or {},
+        source=config_entries.SOURCE_BLUETOOTH,
+        subentries_data=None,
+        title=address,
+        unique_id=address.lower(),
+        version=CometBlueConfigFlow.VERSION,
+    )
+
+
+def simulated_address(index: int) -> str:
+    """Return the Bluetooth address of the simulated TRV with an index."""
+    return f"AA:BB:CC:DD:{index // 256:02X}:{index % 256:02X}"
+
+
+async def measure_setup(entries: int, latency: float) -> list[float]:
+    """Return the setup time in seconds of each simulated config entry."""
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = await async_create_hass(config_dir)
+        timings: list[float] = []
+        with simulated_bluetooth(latency):
+            for index in range(entries):
+                entry = create_config_entry(simulated_address(index))
+                start = monotonic()
+                await hass.config_entries.async_add(entry)
+                timings.append(monotonic() - start)
+            await hass.async_stop(force=True)
+        return timings
+
+
+def main() -> None:
+    """Run the profiling and print the results."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entries", type=int, default=5, help="simulated TRVs")
+    parser.add_argument(
+        "--latency",
+        type=float,
+        default=0.1,
+        help="simulated seconds per GATT operation",
+    )
+    args = parser.parse_args()
+
+    imports = measure_imports()
+    print("Import time (µs)")
+    print(f"{'module':<55} {'self':>8} {'cumulative':>11}")
+    for module, self_us, cumulative_us in imports:
+        print(f"{module:<55} {self_us:>8} {cumulative_us:>11}")
+    # Cumulative times of the modules Home Assistant imports directly
+    top_level = {PACKAGE, *(f"{PACKAGE}.{platform}" for platform in PLATFORMS)}
+    total = sum(cumulative for module, _, cumulative in imports if module in top_level)
+    print(f"{'total (package and platforms)':<55} {'':>8} {total:>11}")
+
+    timings = asyncio.run(measure_setup(args.entries, args.latency))
+    print()
+    print(f"Setup time of {len(timings)} entries at {args.latency}s latency (s)")
+    print(f"  first: {timings[0]:.3f}  min: {min(timings):.3f}")
+    print(f"  max: {max(timings):.3f}  total: {sum(timings):.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,345 @@
+"""Replay recorded BLE sessions of a Comet Blue TRV against the integration.
+
+Reads a trace file written with the "Record sessions for replay" option
+and makes the same coordinator calls (polls, commands and switch point
+reads) at their recorded times. A stand-in for AsyncCometBlue answers
+each session with the recorded results, errors and latencies, so timing
+and odd device values seen in the field are reproduced offline. Time runs
+`--speed` times faster than recorded. Run from the repository root in a
+Home Assistant environment:
+
+    python -m script.replay_sessions eurotronic_cometblue_traces/AABBCCDDEEFF.jsonl --speed 10
+
+Reports the recorded and replayed duration and outcome of each kind of
+call, and every call that ended differently or used other operations.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections import deque
+from contextvars import ContextVar
+from dataclasses import dataclass, field, replace
+from functools import wraps
+import logging
+from pathlib import Path
+from statistics import fmean
+import tempfile
+from time import monotonic
+from typing import Any, Self
+from unittest.mock import patch
+
+from bleak.exc import BleakError
+from bleak_retry_connector import BleakNotFoundError, BleakOutOfConnectionSlotsError
+from eurotronic_cometblue_ha import InvalidByteValueError
+
+from custom_components.eurotronic_cometblue.errors import CometBlueOperationTimeoutError
+from custom_components.eurotronic_cometblue.session_trace import (
+    RecordedCall,
+    RecordedOperation,
+    RecordedSession,
+    decode_value,
+    encode_error,
+    encode_value,
+    load_trace,
+)
+from homeassistant.util import dt as dt_util
+
+from .profile_startup import (
+    SimulatedCometBlue,
+    async_create_hass,
+    create_config_entry,
+    simulated_bluetooth,
+)
+
+# Recorded errors raised again by type name, others as BleakError
+ERROR_TYPES: dict[str, type[Exception]] = {
+    error.__name__: error
+    for error in (
+        BleakError,
+        BleakNotFoundError,
+        BleakOutOfConnectionSlotsError,
+        CometBlueOperationTimeoutError,
+        InvalidByteValueError,
+        TimeoutError,
+        ValueError,
+    )
+}
+# Calls made by the replay, the command queue is not
+REPLAYED_KINDS = ("poll", "command", "switch_refresh")
+
+
+class ReplayMismatchError(Exception):
+    """The integration did something that is not in the trace."""
+
+
+def decode_error(error: dict[str, str]) -> Exception:
+    """Return an exception like the recorded one."""
+    return ERROR_TYPES.get(error["type"], BleakError)(error["message"])
+
+
+@dataclass
+class ReplayedCall:
+    """Sessions of a recorded call, served to the stand-in one by one."""
+
+    recorded: RecordedCall
+    speed: float
+    sessions: deque[RecordedSession] = field(init=False)
+    operations: deque[RecordedOperation] = field(default_factory=deque)
+    # Differences to the recording, e.g. operations it does not have
+    mismatches: list[str] = field(default_factory=list)
+    duration: float | None = None
+    error: dict[str, str] | None = None
+
+    def __post_init__(self) -> None:
+        """Queue the recorded sessions."""
+        self.sessions = deque(self.recorded.sessions)
+
+    async def async_connect(self) -> None:
+        """Take the next session, connecting like it did."""
+        if not self.sessions:
+            self.mismatches.append("session not recorded")
+            raise ReplayMismatchError("No recorded session left")
+        session = self.sessions.popleft()
+        await asyncio.sleep((session.connect or 0) / self.speed)
+        if session.connect_error:
+            raise decode_error(session.connect_error)
+        self.operations = deque(session.operations)
+
+    def disconnect(self) -> None:
+        """End the session, noting recorded operations that were not made."""
+        self.mismatches.extend(
+            f"{operation.name} not made" for operation in self.operations
+        )
+        self.operations.clear()
+
+    async def async_operation(self, name: str, args: Any, kwargs: Any) -> Any:
+        """Answer an operation with the next recorded one of the same name."""
+        while self.operations and self.operations[0].name != name:
+            self.mismatches.append(f"{self.operations.popleft().name} not made")
+        if not self.operations:
+            self.mismatches.append(f"{name} not recorded")
+            raise ReplayMismatchError(f"{name} not recorded")
+        operation = self.operations.popleft()
+        if (
+            encode_value(list(args)) != operation.args
+            or encode_value(kwargs) != operation.kwargs
+        ):
+            self.mismatches.append(f"{name} called with other arguments")
+        await asyncio.sleep(operation.duration / self.speed)
+        if operation.error:
+            raise decode_error(operation.error)
+        return decode_value(operation.result)
+
+
+# Set in the task replaying a call, unset while the entry is set up
+REPLAYED_CALL: ContextVar[ReplayedCall | None] = ContextVar(
+    "replayed_call", default=None
+)
+
+
+def _replayed(function: Any) -> Any:
+    """Answer from the trace while a call is replayed, else like the simulation."""
+
+    @wraps(function)
+    async def operation(self: ReplayCometBlue, *args: Any, **kwargs: Any) -> Any:
+        if (call := REPLAYED_CALL.get()) is None:
+            return await function(self, *args, **kwargs)
+        return await call.async_operation(function.__name__, args, kwargs)
+
+    return operation
+
+
+class ReplayCometBlue(SimulatedCometBlue):
+    """Stand-in for AsyncCometBlue answering with recorded sessions."""
+
+    def __init__(self, device: Any, pin: int = 0) -> None:
+        """Initialize the stand-in, answering instantly outside of replayed calls."""
+        super().__init__(device, pin, latency=0)
+
+    async def __aenter__(self) -> Self:
+        """Connect like the next recorded session did."""
+        if (call := REPLAYED_CALL.get()) is None:
+            return await super().__aenter__()
+        self.connections += 1
+        await call.async_connect()
+        return self
+
+    async def __aexit__(self, *args: object) -> None:
+        """Disconnect."""
+        if (call := REPLAYED_CALL.get()) is not None:
+            call.disconnect()
+
+    get_device_info_async = _replayed(SimulatedCometBlue.get_device_info_async)
+    get_battery_async = _replayed(SimulatedCometBlue.get_battery_async)
+    get_temperature_async = _replayed(SimulatedCometBlue.get_temperature_async)
+    get_holiday_async = _replayed(SimulatedCometBlue.get_holiday_async)
+    get_multiple_async = _replayed(SimulatedCometBlue.get_multiple_async)
+
+    @_replayed
+    async def set_temperature_async(self, values: dict[str, float]) -> None:
+        """Set temperatures."""
+
+    @_replayed
+    async def set_weekdays_async(self, values: dict[str, Any]) -> None:
+        """Set the weekday schedule."""
+
+    @_replayed
+    async def set_datetime_async(self, date: Any = None) -> None:
+        """Set the date and time."""
+
+    @_replayed
+    async def set_holiday_async(self, number: int, values: dict[str, Any]) -> None:
+        """Set a holiday."""
+
+
+async def async_replay_call(
+    coordinator: Any, call: ReplayedCall, delay: float
+) -> ReplayedCall:
+    """Make a recorded call after a delay in seconds."""
+    await asyncio.sleep(delay)
+    REPLAYED_CALL.set(call)
+    recorded = call.recorded
+    start = monotonic()
+    try:
+        if recorded.kind == "poll":
+            # Read the schedule if it was outdated when the poll was recorded
+            coordinator._schedule_updated = (  # noqa: SLF001
+                None
+                if any(
+                    operation.name == "get_multiple_async"
+                    for session in recorded.sessions
+                    for operation in session.operations
+                )
+                else dt_util.utcnow()
+            )
+            await coordinator.async_refresh()
+            if not coordinator.last_update_success:
+                call.error = encode_error(coordinator.last_exception)
+        elif recorded.kind == "command":
+            await coordinator.send_command(
+                getattr(coordinator.device, recorded.details["function"]),
+                decode_value(recorded.details["payload"]),
+            )
+        else:
+            await coordinator._async_handle_switch_refresh(  # noqa: SLF001
+                recorded.details["comfort"], None
+            )
+    except Exception as ex:  # noqa: BLE001
+        call.error = encode_error(ex)
+    call.duration = (monotonic() - start) * call.speed
+    call.disconnect()
+    call.mismatches.extend("session not made" for _ in call.sessions)
+    return call
+
+
+async def replay(path: Path, speed: float) -> list[ReplayedCall]:
+    """Replay the calls of a trace file, returning their replayed outcome."""
+    from custom_components.eurotronic_cometblue import coordinator, tuning  # noqa: PLC0415
+
+    recorded = [call for call in load_trace(path) if call.kind in REPLAYED_KINDS]
+    if not recorded:
+        return []
+    # Waits between retries pass at the replay speed as well
+    retry_policies = {
+        kind: replace(policy, delay=policy.delay / speed)
+        for kind, policy in coordinator.RETRY_POLICIES.items()
+    }
+    options = {"advanced": {"retry_interval": tuning.COMMAND_RETRY_INTERVAL / speed}}
+    read_plan = coordinator.CometBlueDataUpdateCoordinator.read_plan
+
+    def replayed_read_plan(self: Any) -> set[str]:
+        """Read what the recorded poll read, whatever entities are enabled."""
+        if (call := REPLAYED_CALL.get()) is not None and call.recorded.kind == "poll":
+            return set(call.recorded.details["read_plan"])
+        return read_plan.fget(self)
+
+    with (
+        tempfile.TemporaryDirectory() as config_dir,
+        simulated_bluetooth(0, ReplayCometBlue),
+        patch.dict(coordinator.RETRY_POLICIES, retry_policies),
+        patch.object(
+            coordinator.CometBlueDataUpdateCoordinator,
+            "read_plan",
+            property(replayed_read_plan),
+        ),
+    ):
+        hass = await async_create_hass(config_dir)
+        entry = create_config_entry(recorded[0].address, options)
+        await hass.config_entries.async_add(entry)
+        # Only the recorded calls poll the stand-in
+        entry.runtime_data.update_interval = None
+        start = recorded[0].time
+        calls = await asyncio.gather(
+            *(
+                async_replay_call(
+                    entry.runtime_data,
+                    ReplayedCall(call, speed),
+                    (call.time - start).total_seconds() / speed,
+                )
+                for call in recorded
+            )
+        )
+        await hass.async_stop(force=True)
+    return calls
+
+
+def print_report(calls: list[ReplayedCall]) -> None:
+    """Print the durations by kind of call and the calls that differ."""
+    print(
+        f"{'call':<15} {'count':>6} {'recorded':>10} {'replayed':>10}"
+        f" {'failed':>7} {'replay failed':>14}"
+    )
+    for kind in REPLAYED_KINDS:
+        if not (of_kind := [call for call in calls if call.recorded.kind == kind]):
+            continue
+        recorded = fmean(call.recorded.duration or 0 for call in of_kind)
+        replayed = fmean(call.duration or 0 for call in of_kind)
+        print(
+            f"{kind:<15} {len(of_kind):>6} {recorded:>9.2f}s {replayed:>9.2f}s"
+            f" {sum(call.recorded.error is not None for call in of_kind):>7}"
+            f" {sum(call.error is not None for call in of_kind):>14}"
+        )
+
+    differing = [
+        call
+        for call in calls
+        if call.mismatches
+        or (call.error or {}).get("type") != (call.recorded.error or {}).get("type")
+    ]
+    print()
+    print(f"{len(differing)} of {len(calls)} calls differ from the recording")
+    for call in differing:
+        recorded = call.recorded.error["type"] if call.recorded.error else "ok"
+        replayed = call.error["type"] if call.error else "ok"
+        print(
+            f"  {call.recorded.time.isoformat()} {call.recorded.kind}:"
+            f" recorded {recorded}, replayed {replayed}"
+        )
+        for mismatch in call.mismatches:
+            print(f"    {mismatch}")
+
+
+def main() -> None:
+    """Replay a trace file and print the report."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("trace", type=Path, help="trace file of a TRV")
+    parser.add_argument(
+        "--speed", type=float, default=1, help="replayed seconds per real second"
+    )
+    args = parser.parse_args()
+    if args.speed <= 0:
+        parser.error("--speed must be positive")
+    # Failing calls are expected if they failed when recorded
+    logging.basicConfig(level=logging.CRITICAL)
+
+    calls = asyncio.run(replay(args.trace, args.speed))
+    if not calls:
+        print(f"No replayable calls in {args.trace}")
+        return
+    print_report(calls)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""Tests for the Eurotronic Comet Blue integration."""
+
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any
+
+from bleak.backends.device import BLEDevice
+from eurotronic_cometblue_ha import AsyncCometBlue, Weekday
+from habluetooth import BluetoothServiceInfoBleak
+
+ADDRESS = "AA:BB:CC:DD:EE:FF"
+PACKAGE = "custom_components.eurotronic_cometblue"
+
+
+def service_info(ble_device: BLEDevice) -> BluetoothServiceInfoBleak:
+    """Return an advertisement of the TRV."""
+    return BluetoothServiceInfoBleak(
+        name="Comet Blue",
+        address=ADDRESS,
+        rssi=-60,
+        manufacturer_data={},
+        service_data={},
+        service_uuids=[],
+        source="local",
+        device=ble_device,
+        advertisement=None,
+        connectable=True,
+        time=0,
+        tx_power=None,
+    )
+
+
+class FakeCometBlue(AsyncCometBlue):
+    """AsyncCometBlue answering from memory instead of over BLE.
+
+    Only the GATT operations are replaced, so attributes the library sets
+    while connecting, e.g. `client`, are missing like on the real device.
+    """
+
+    def __init__(self, device: BLEDevice | str, pin: int = 0) -> None:
+        """Initialize the fake device with a weekday schedule."""
+        super().__init__(device, pin)
+        self.connections = 0
+        self.battery = 80
+        self.temperatures: dict[str, Any] = {
+            "currentTemp": 20.0,
+            "manualTemp": 21.0,
+            "targetTempLow": 17.0,
+            "targetTempHigh": 21.0,
+            "tempOffset": 0.0,
+            "windowOpen": False,
+            "windowOpenMinutes": 10,
+        }
+        self.weekdays: dict[str, dict[str, str]] = {
+            weekday.name.lower(): {"start1": "07:00", "end1": "09:00"}
+            for weekday in Weekday
+        }
+        self.holiday: dict[str, Any] = {}
+
+    async def connect_async(self) -> None:
+        """Count the connection."""
+        self.connections += 1
+
+    async def disconnect_async(self) -> None:
+        """Disconnect."""
+
+    async def get_device_info_async(self) -> dict[str, str]:
+        """Return the device information."""
+        return {"model": "Comet Blue", "manufacturer": "Eurotronic", "version": "0.0.6"}
+
+    async def get_battery_async(self) -> int:
+        """Return the battery level."""
+        return self.battery
+
+    async def get_temperature_async(self) -> dict[str, Any]:
+        """Return the temperatures."""
+        return dict(self.temperatures)
+
+    async def set_temperature_async(self, values: dict[str, float]) -> None:
+        """Set the temperatures that are not None."""
+        self.temperatures.update(
+            {key: value for key, value in values.items() if value is not None}
+        )
+
+    async def get_weekday_async(self, weekday: Weekday) -> dict[str, str]:
+        """Return the schedule of a weekday."""
+        return dict(self.weekdays[weekday.name.lower()])
+
+    async def set_weekday_async(self, weekday: Weekday, values: dict) -> None:
+        """Set the schedule of a weekday."""
+        self.weekdays[weekday.name.lower()] = dict(values)
+
+    async def get_holiday_async(self, number: int) -> dict[str, Any]:
+        """Return the holiday."""
+        return dict(self.holiday)
+
+    async def set_holiday_async(self, number: int, values: dict) -> None:
+        """Set the holiday."""
+        self.holiday = dict(values)
+
+    async def set_datetime_async(self, date: datetime | None = None) -> None:
+        """Set the date and time."""
@@ -0,0 +1,83 @@
+"""Fixtures for the Eurotronic Comet Blue tests."""
+
+from __future__ import annotations
+
+from collections.abc import Generator
+from unittest.mock import patch
+
+from bleak.backends.device import BLEDevice
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.eurotronic_cometblue.const import DOMAIN
+from homeassistant.const import CONF_ADDRESS, CONF_PIN
+from homeassistant.core import HomeAssistant
+
+from . import ADDRESS, PACKAGE, FakeCometBlue
+
+pytest_plugins = ["pytest_homeassistant_custom_component"]
+
+
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations(enable_custom_integrations: None) -> None:
+    """Enable the integration in all tests."""
+
+
+@pytest.fixture
+def ble_device() -> BLEDevice:
+    """Return the BLE device of the TRV."""
+    return BLEDevice(ADDRESS, "Comet Blue", None)
+
+
+@pytest.fixture
+def mock_cometblue(ble_device: BLEDevice) -> FakeCometBlue:
+    """Return the fake TRV."""
+    return FakeCometBlue(ble_device, 0)
+
+
+@pytest.fixture
+def mock_bluetooth(
+    hass: HomeAssistant, ble_device: BLEDevice, mock_cometblue: FakeCometBlue
+) -> Generator[None]:
+    """Make the fake TRV reachable for the config flow and the entry setup."""
+    # The integration only needs the Bluetooth helpers patched below
+    hass.config.components.add("bluetooth")
+    with (
+        patch(f"{PACKAGE}.AsyncCometBlue", return_value=mock_cometblue),
+        patch(f"{PACKAGE}.config_flow.AsyncCometBlue", return_value=mock_cometblue),
+        patch(f"{PACKAGE}.async_ble_device_from_address", return_value=ble_device),
+        patch(
+            f"{PACKAGE}.config_flow.async_ble_device_from_address",
+            return_value=ble_device,
+        ),
+        patch(f"{PACKAGE}.async_register_callback", return_value=lambda: None),
+        patch(
+            f"{PACKAGE}.coordinator.bluetooth.async_register_callback",
+            return_value=lambda: None,
+        ),
+        patch(f"{PACKAGE}.entity.bluetooth.async_address_present", return_value=True),
+    ):
+        yield
+
+
+@pytest.fixture
+def mock_config_entry() -> MockConfigEntry:
+    """Return the config entry of the TRV."""
+    return MockConfigEntry(
+        domain=DOMAIN,
+        title=f"Comet Blue {ADDRESS}",
+        data={CONF_ADDRESS: ADDRESS, CONF_PIN: "000000"},
+        unique_id=ADDRESS.lower(),
+        minor_version=2,
+    )
+
+
+@pytest.fixture
+async def init_integration(
+    hass: HomeAssistant, mock_config_entry: MockConfigEntry, mock_bluetooth: None
+) -> MockConfigEntry:
+    """Set up the entry of the fake TRV."""
+    mock_config_entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+    return mock_config_entry
@@ -0,0 +1,140 @@
+"""Tests for the offline command queue of Comet Blue devices."""
+
+from __future__ import annotations
+
+from datetime import UTC, datetime, timedelta
+from typing import Any
+from unittest.mock import AsyncMock, patch
+
+from bleak.backends.device import BLEDevice
+from bleak_retry_connector import BleakNotFoundError
+from freezegun.api import FrozenDateTimeFactory
+import pytest
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
+
+from custom_components.eurotronic_cometblue.command_queue import (
+    SAVE_DELAY,
+    CometBlueCommandQueue,
+)
+from custom_components.eurotronic_cometblue.const import CONF_OFFLINE_QUEUE, DOMAIN
+from custom_components.eurotronic_cometblue.coordinator import COMMAND_QUEUED
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+
+from . import PACKAGE, FakeCometBlue, service_info
+
+MONDAY = {"start1": "07:00", "end1": "09:00"}
+
+
+async def test_queue_merges_commands(
+    hass: HomeAssistant,
+    hass_storage: dict[str, Any],
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Test superseded commands are dropped and the queue survives a restart."""
+    queue = CometBlueCommandQueue(hass, "entry")
+    await queue.async_load()
+    assert not queue
+
+    queue.async_add(
+        "set_temperature_async",
+        {"values": {"manualTemp": 21.0, "targetTempLow": 17.0}},
+    )
+    queue.async_add("set_weekday_async", {"weekday": 0, "values": MONDAY})
+    queue.async_add(
+        "set_datetime_async", {"date": datetime(2026, 10, 19, 8, 0, tzinfo=UTC)}
+    )
+    # Unchanged temperatures are None and keep the pending value
+    queue.async_add(
+        "set_temperature_async",
+        {"values": {"manualTemp": 22.5, "targetTempLow": None}},
+    )
+    queue.async_add("set_weekday_async", {"weekday": 0, "values": MONDAY})
+    queue.async_add("set_weekday_async", {"weekday": 1, "values": MONDAY})
+    queue.async_add(
+        "set_datetime_async", {"date": datetime(2026, 10, 19, 9, 0, tzinfo=UTC)}
+    )
+
+    assert [(command.function, command.payload) for command in queue.commands] == [
+        (
+            "set_temperature_async",
+            {"values": {"manualTemp": 22.5, "targetTempLow": 17.0}},
+        ),
+        ("set_weekday_async", {"weekday": 0, "values": MONDAY}),
+        ("set_weekday_async", {"weekday": 1, "values": MONDAY}),
+        ("set_datetime_async", {"date": datetime(2026, 10, 19, 9, 0, tzinfo=UTC)}),
+    ]
+
+    freezer.tick(timedelta(seconds=SAVE_DELAY))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+    assert f"{DOMAIN}.entry.command_queue" in hass_storage
+
+    restored = CometBlueCommandQueue(hass, "entry")
+    await restored.async_load()
+    assert restored.commands == queue.commands
+
+    assert restored.async_pop().function == "set_temperature_async"
+    restored.async_clear()
+    assert not restored
+
+
+@pytest.mark.usefixtures("mock_bluetooth")
+async def test_command_queued_until_advertisement(
+    hass: HomeAssistant,
+    ble_device: BLEDevice,
+    mock_config_entry: MockConfigEntry,
+    mock_cometblue: FakeCometBlue,
+) -> None:
+    """Test a write to an unreachable TRV is sent when the TRV advertises."""
+    mock_config_entry.add_to_hass(hass)
+    hass.config_entries.async_update_entry(
+        mock_config_entry, options={CONF_OFFLINE_QUEUE: True}
+    )
+    with patch(
+        f"{PACKAGE}.coordinator.bluetooth.async_register_callback",
+        return_value=lambda: None,
+    ) as mock_register:
+        assert await hass.config_entries.async_setup(mock_config_entry.entry_id)
+        await hass.async_block_till_done()
+    advertisement_callback = mock_register.call_args[0][1]
+    coordinator = mock_config_entry.runtime_data
+
+    connect_async = mock_cometblue.connect_async
+    mock_cometblue.connect_async = AsyncMock(side_effect=BleakNotFoundError("gone"))
+    assert (
+        await coordinator.send_command(
+            mock_cometblue.set_temperature_async,
+            {"values": {"manualTemp": 23.0, "targetTempLow": None}},
+        )
+        is COMMAND_QUEUED
+    )
+    assert len(coordinator.command_queue) == 1
+    assert mock_cometblue.temperatures["manualTemp"] == 21.0
+
+    mock_cometblue.connect_async = connect_async
+    advertisement_callback(service_info(ble_device), None)
+    await hass.async_block_till_done()
+
+    assert not coordinator.command_queue
+    assert mock_cometblue.temperatures["manualTemp"] == 23.0
+    assert mock_cometblue.temperatures["targetTempLow"] == 17.0
+
+
+async def test_command_not_queued_without_option(
+    hass: HomeAssistant,
+    init_integration: MockConfigEntry,
+    mock_cometblue: FakeCometBlue,
+) -> None:
+    """Test a write to an unreachable TRV fails unless queueing is enabled."""
+    coordinator = init_integration.runtime_data
+    mock_cometblue.connect_async = AsyncMock(side_effect=BleakNotFoundError("gone"))
+
+    with pytest.raises(HomeAssistantError):
+        await coordinator.send_command(
+            mock_cometblue.set_temperature_async, {"values": {"manualTemp": 23.0}}
+        )
+    assert not coordinator.command_queue
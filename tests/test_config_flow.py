@@ -0,0 +1,56 @@
+"""Tests for the Eurotronic Comet Blue config flow."""
+
+from __future__ import annotations
+
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.const import CONF_ADDRESS, CONF_PIN
+from homeassistant.core import HomeAssistant
+from homeassistant.data_entry_flow import FlowResultType
+
+from . import ADDRESS, FakeCometBlue
+
+
+async def test_reconfigure(
+    hass: HomeAssistant,
+    init_integration: MockConfigEntry,
+    mock_cometblue: FakeCometBlue,
+) -> None:
+    """Test the PIN of a TRV is changed and the entry reloaded."""
+    result = await init_integration.start_reconfigure_flow(hass)
+    assert result["step_id"] == "bluetooth_confirm"
+
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"], {CONF_PIN: "123456"}
+    )
+    await hass.async_block_till_done()
+
+    assert result["type"] is FlowResultType.ABORT
+    assert result["reason"] == "reconfigure_successful"
+    assert init_integration.data == {CONF_ADDRESS: ADDRESS, CONF_PIN: "123456"}
+    assert init_integration.state is ConfigEntryState.LOADED
+    assert len(hass.config_entries.async_entries()) == 1
+
+
+@pytest.mark.usefixtures("init_integration")
+async def test_reconfigure_invalid_pin(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    mock_cometblue: FakeCometBlue,
+) -> None:
+    """Test a PIN the TRV doesn't accept keeps the entry unchanged."""
+
+    async def get_battery_async() -> int:
+        raise TimeoutError
+
+    mock_cometblue.get_battery_async = get_battery_async
+    result = await mock_config_entry.start_reconfigure_flow(hass)
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"], {CONF_PIN: "123456"}
+    )
+
+    assert result["type"] is FlowResultType.FORM
+    assert result["errors"] == {"base": "invalid_pin"}
+    assert mock_config_entry.data[CONF_PIN] == "000000"
@@ -0,0 +1,295 @@
+"""Tests for the Eurotronic Comet Blue coordinator."""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import timedelta
+from typing import Any
+
+from freezegun.api import FrozenDateTimeFactory
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.eurotronic_cometblue.const import (
+    ALL_DATA,
+    DATA_BATTERY,
+    DATA_HOLIDAY,
+    DATA_TEMPERATURES,
+    DOMAIN,
+)
+from custom_components.eurotronic_cometblue.coordinator import (
+    BATTERY_REFRESH_INTERVAL,
+    DEFERRED_HOLIDAY_INTERVAL,
+    battery_connection_budget,
+)
+from custom_components.eurotronic_cometblue.tuning import PerformanceProfile
+from homeassistant.const import Platform
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+
+from . import ADDRESS, FakeCometBlue
+
+
+async def test_read_plan(init_integration: MockConfigEntry) -> None:
+    """Test the entities enabled by default need all data."""
+    assert init_integration.runtime_data.read_plan == ALL_DATA
+
+
+@pytest.mark.usefixtures("mock_bluetooth")
+async def test_read_plan_follows_entities(
+    hass: HomeAssistant,
+    entity_registry: er.EntityRegistry,
+    mock_config_entry: MockConfigEntry,
+    mock_cometblue: FakeCometBlue,
+) -> None:
+    """Test only the data of enabled entities is polled after the first refresh."""
+    mock_config_entry.add_to_hass(hass)
+    entity_registry.async_get_or_create(
+        Platform.CLIMATE,
+        DOMAIN,
+        ADDRESS,
+        config_entry=mock_config_entry,
+        disabled_by=er.RegistryEntryDisabler.USER,
+    )
+    assert await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+    coordinator = mock_config_entry.runtime_data
+    assert coordinator.read_plan == {DATA_TEMPERATURES, DATA_BATTERY}
+    # The first refresh ran before the entities were added
+    assert coordinator.data.schedule
+    assert coordinator.data.holiday == {}
+
+    mock_cometblue.temperatures["currentTemp"] = 21.5
+    mock_cometblue.holiday = {"temperature": 15.0}
+    mock_cometblue.weekdays["monday"] = {}
+    await coordinator.async_refresh()
+
+    assert coordinator.data.temperatures["currentTemp"] == 21.5
+    # Data not needed by any entity keeps its previous value
+    assert coordinator.data.holiday == {}
+    assert coordinator.data.schedule.as_weekdays()["monday"] == {
+        "start1": "07:00",
+        "end1": "09:00",
+    }
+
+
+@pytest.mark.usefixtures("mock_bluetooth")
+async def test_read_plan_without_data_entities(
+    hass: HomeAssistant,
+    entity_registry: er.EntityRegistry,
+    freezer: FrozenDateTimeFactory,
+    mock_config_entry: MockConfigEntry,
+    mock_cometblue: FakeCometBlue,
+) -> None:
+    """Test entities needing no data of the TRV don't make polls read everything."""
+    mock_config_entry.add_to_hass(hass)
+    for platform, unique_id in (
+        (Platform.CLIMATE, ADDRESS),
+        (Platform.SENSOR, f"{ADDRESS}-battery"),
+        (Platform.SENSOR, f"{ADDRESS}-heating_rate"),
+        (Platform.NUMBER, f"{ADDRESS}-target_temp_low"),
+        (Platform.NUMBER, f"{ADDRESS}-target_temp_high"),
+    ):
+        entity_registry.async_get_or_create(
+            platform,
+            DOMAIN,
+            unique_id,
+            config_entry=mock_config_entry,
+            disabled_by=er.RegistryEntryDisabler.USER,
+        )
+    assert await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+    coordinator = mock_config_entry.runtime_data
+    # The connection sensors are enabled but don't need data of the TRV
+    assert coordinator.async_contexts()
+    assert coordinator.read_plan == set()
+
+    connections = mock_cometblue.connections
+    await coordinator.async_refresh()
+    assert coordinator.last_update_success
+    assert mock_cometblue.connections == connections
+
+    freezer.tick(BATTERY_REFRESH_INTERVAL + timedelta(seconds=1))
+    assert coordinator.read_plan == {DATA_BATTERY}
+
+
+@pytest.mark.parametrize(
+    ("battery", "scan_interval", "budget"),
+    [
+        (None, timedelta(minutes=5), 400),
+        (80, timedelta(minutes=5), 400),
+        (40, timedelta(minutes=5), 192),
+        (20, timedelta(minutes=5), 96),
+        (10, timedelta(minutes=5), 48),
+        (80, timedelta(minutes=2), 1000),
+        (10, timedelta(minutes=2), 120),
+        (80, timedelta(minutes=15), 133),
+        (10, timedelta(minutes=15), 16),
+        (10, timedelta(days=1), 1),
+    ],
+)
+def test_battery_connection_budget(
+    battery: int | None, scan_interval: timedelta, budget: int
+) -> None:
+    """Test the budget drops with the battery and scales with the poll interval."""
+    assert battery_connection_budget(battery, scan_interval) == budget
+
+
+async def test_low_battery_stretches_polling(
+    hass: HomeAssistant,
+    init_integration: MockConfigEntry,
+    mock_cometblue: FakeCometBlue,
+) -> None:
+    """Test the poll interval keeps the budget of the battery and profile."""
+    coordinator = init_integration.runtime_data
+    assert coordinator.poll_interval == timedelta(minutes=5)
+    assert not coordinator.budget_constrained
+
+    mock_cometblue.battery = 10
+    await coordinator.async_refresh()
+    assert coordinator.poll_interval == timedelta(minutes=30)
+    assert coordinator.update_interval == timedelta(minutes=30)
+    assert coordinator.budget_constrained
+
+    hass.config_entries.async_update_entry(
+        init_integration,
+        options={"performance_profile": PerformanceProfile.RESPONSIVE},
+    )
+    await hass.async_block_till_done()
+    assert coordinator.poll_interval == timedelta(minutes=12)
+
+
+@pytest.mark.usefixtures("mock_bluetooth")
+async def test_battery_read_without_sensor(
+    hass: HomeAssistant,
+    entity_registry: er.EntityRegistry,
+    freezer: FrozenDateTimeFactory,
+    mock_config_entry: MockConfigEntry,
+    mock_cometblue: FakeCometBlue,
+) -> None:
+    """Test the budget follows the battery if its sensor is disabled."""
+    mock_config_entry.add_to_hass(hass)
+    entity_registry.async_get_or_create(
+        Platform.SENSOR,
+        DOMAIN,
+        f"{ADDRESS}-battery",
+        config_entry=mock_config_entry,
+        disabled_by=er.RegistryEntryDisabler.USER,
+    )
+    assert await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+    coordinator = mock_config_entry.runtime_data
+    assert DATA_BATTERY not in coordinator.read_plan
+
+    mock_cometblue.battery = 10
+    await coordinator.async_refresh()
+    assert coordinator.data.battery == 80
+
+    freezer.tick(BATTERY_REFRESH_INTERVAL + timedelta(seconds=1))
+    assert DATA_BATTERY in coordinator.read_plan
+    await coordinator.async_refresh()
+    assert coordinator.data.battery == 10
+    assert coordinator.poll_interval == timedelta(minutes=30)
+
+
+async def test_low_battery_defers_holiday(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    init_integration: MockConfigEntry,
+    mock_cometblue: FakeCometBlue,
+) -> None:
+    """Test the holiday is read less often while the budget stretches polling."""
+    coordinator = init_integration.runtime_data
+    holiday_reads = 0
+    get_holiday_async = mock_cometblue.get_holiday_async
+
+    async def count_holiday_reads(number: int) -> dict[str, Any]:
+        nonlocal holiday_reads
+        holiday_reads += 1
+        return await get_holiday_async(number)
+
+    count_holiday_reads.__name__ = "get_holiday_async"
+    mock_cometblue.get_holiday_async = count_holiday_reads
+
+    mock_cometblue.battery = 10
+    await coordinator.async_refresh()
+    assert holiday_reads == 1
+    assert coordinator.budget_constrained
+
+    await coordinator.async_refresh()
+    assert holiday_reads == 1
+    assert DATA_HOLIDAY not in coordinator.read_plan
+
+    freezer.tick(DEFERRED_HOLIDAY_INTERVAL + timedelta(seconds=1))
+    await coordinator.async_refresh()
+    assert holiday_reads == 2
+
+
+async def test_shared_read_survives_cancelled_owner(
+    hass: HomeAssistant,
+    init_integration: MockConfigEntry,
+    mock_cometblue: FakeCometBlue,
+) -> None:
+    """Test a read sharing a cancelled poll's read makes it on its own."""
+    coordinator = init_integration.runtime_data
+    reading = asyncio.Event()
+    answer = asyncio.Event()
+    get_temperature_async = mock_cometblue.get_temperature_async
+
+    async def slow_temperature_read() -> dict[str, Any]:
+        reading.set()
+        await answer.wait()
+        return await get_temperature_async()
+
+    slow_temperature_read.__name__ = "get_temperature_async"
+    mock_cometblue.get_temperature_async = slow_temperature_read
+
+    poll = hass.async_create_task(coordinator.async_refresh())
+    await reading.wait()
+    read = hass.async_create_task(
+        coordinator.send_command(mock_cometblue.get_temperature_async, {})
+    )
+    await asyncio.sleep(0)
+
+    poll.cancel()
+    answer.set()
+
+    assert (await read)["currentTemp"] == 20.0
+    assert poll.cancelled()
+
+
+async def test_cancelled_shared_read(
+    hass: HomeAssistant,
+    init_integration: MockConfigEntry,
+    mock_cometblue: FakeCometBlue,
+) -> None:
+    """Test cancelling a read sharing another one doesn't cancel the other."""
+    coordinator = init_integration.runtime_data
+    reading = asyncio.Event()
+    answer = asyncio.Event()
+    get_temperature_async = mock_cometblue.get_temperature_async
+
+    async def slow_temperature_read() -> dict[str, Any]:
+        reading.set()
+        await answer.wait()
+        return await get_temperature_async()
+
+    slow_temperature_read.__name__ = "get_temperature_async"
+    mock_cometblue.get_temperature_async = slow_temperature_read
+
+    connections = mock_cometblue.connections
+    first = hass.async_create_task(
+        coordinator.send_command(mock_cometblue.get_temperature_async, {})
+    )
+    await reading.wait()
+    second = hass.async_create_task(
+        coordinator.send_command(mock_cometblue.get_temperature_async, {})
+    )
+    await asyncio.sleep(0)
+    second.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await second
+
+    answer.set()
+    assert (await first)["currentTemp"] == 20.0
+    assert mock_cometblue.connections == connections + 1
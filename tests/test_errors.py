@@ -0,0 +1,146 @@
+"""Tests for the classification and retries of communication errors."""
+
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import patch
+
+from bleak.exc import BleakError
+from bleak_retry_connector import BleakNotFoundError, BleakOutOfConnectionSlotsError
+from eurotronic_cometblue_ha import InvalidByteValueError
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.eurotronic_cometblue.const import MAX_RETRIES
+from custom_components.eurotronic_cometblue.coordinator import RETRY_POLICIES
+from custom_components.eurotronic_cometblue.errors import (
+    CometBlueErrorKind,
+    CometBlueOperationTimeoutError,
+    classify_error,
+)
+from custom_components.eurotronic_cometblue.latency import MIN_SAMPLES
+from custom_components.eurotronic_cometblue.tuning import (
+    PERFORMANCE_PROFILES,
+    PerformanceProfile,
+)
+from homeassistant.config_entries import SOURCE_REAUTH
+from homeassistant.core import HomeAssistant
+
+from . import PACKAGE, FakeCometBlue
+
+
+@pytest.mark.parametrize(
+    ("error", "connected", "kind"),
+    [
+        (InvalidByteValueError("bad"), True, CometBlueErrorKind.INVALID_DATA),
+        (
+            BleakOutOfConnectionSlotsError("full"),
+            False,
+            CometBlueErrorKind.NO_CONNECTION_SLOT,
+        ),
+        (BleakNotFoundError("gone"), False, CometBlueErrorKind.DEVICE_NOT_FOUND),
+        (TimeoutError(), True, CometBlueErrorKind.WRONG_PIN),
+        (TimeoutError(), False, CometBlueErrorKind.TRANSIENT),
+        (CometBlueOperationTimeoutError(), True, CometBlueErrorKind.TRANSIENT),
+        (BleakError("disconnected"), True, CometBlueErrorKind.TRANSIENT),
+        (BleakError("failed"), False, CometBlueErrorKind.TRANSIENT),
+    ],
+)
+def test_classify_error(
+    error: Exception, connected: bool, kind: CometBlueErrorKind
+) -> None:
+    """Test errors are classified by their cause."""
+    assert classify_error(error, connected) is kind
+
+
+def test_retry_policies() -> None:
+    """Test which errors are retried and how often."""
+    assert RETRY_POLICIES[CometBlueErrorKind.WRONG_PIN].attempts == 1
+    assert RETRY_POLICIES[CometBlueErrorKind.DEVICE_NOT_FOUND].attempts == 1
+    assert RETRY_POLICIES[CometBlueErrorKind.NO_CONNECTION_SLOT].attempts == 2
+
+    balanced = PERFORMANCE_PROFILES[PerformanceProfile.BALANCED]
+    assert balanced.retry_policy(CometBlueErrorKind.TRANSIENT).attempts == MAX_RETRIES
+    assert balanced.retry_policy(CometBlueErrorKind.INVALID_DATA).attempts == 2
+    battery_saver = PERFORMANCE_PROFILES[PerformanceProfile.BATTERY_SAVER]
+    assert battery_saver.retry_policy(CometBlueErrorKind.INVALID_DATA).attempts == 1
+
+
+async def test_slow_read_is_retried(
+    hass: HomeAssistant,
+    init_integration: MockConfigEntry,
+    mock_cometblue: FakeCometBlue,
+) -> None:
+    """Test a read exceeding its timeout doesn't ask for the PIN."""
+    hass.config_entries.async_update_entry(
+        init_integration, options={"advanced": {"retry_interval": 0}}
+    )
+    coordinator = init_integration.runtime_data
+    tracker = coordinator.latency.operation("get_holiday_async")
+    tracker.floor = tracker.ceiling = 0.01
+
+    # The TRV answered the temperature read, so the PIN was accepted
+    async def get_holiday_async(number: int) -> dict:
+        await hass.loop.create_future()
+        return {}
+
+    mock_cometblue.get_holiday_async = get_holiday_async
+    for _ in range(2):
+        await coordinator.async_refresh()
+        # The holiday is optional, the poll keeps its previous value
+        assert coordinator.last_update_success
+
+    assert not coordinator.pin_rejected
+    assert not list(init_integration.async_get_active_flows(hass, {SOURCE_REAUTH}))
+
+
+async def test_unanswered_read_asks_for_pin(
+    hass: HomeAssistant,
+    init_integration: MockConfigEntry,
+    mock_cometblue: FakeCometBlue,
+) -> None:
+    """Test a read the library gives up on hints at a wrong PIN."""
+    coordinator = init_integration.runtime_data
+
+    async def get_temperature_async() -> dict:
+        raise TimeoutError
+
+    mock_cometblue.get_temperature_async = get_temperature_async
+    for _ in range(2):
+        await coordinator.async_refresh()
+        assert not coordinator.last_update_success
+
+    assert coordinator.retry_count == 0
+    assert coordinator.pin_rejected
+    await hass.async_block_till_done()
+    assert list(init_integration.async_get_active_flows(hass, {SOURCE_REAUTH}))
+
+
+async def test_unanswered_read_with_adaptive_timeout(
+    hass: HomeAssistant,
+    init_integration: MockConfigEntry,
+    mock_cometblue: FakeCometBlue,
+) -> None:
+    """Test a fast device not answering after connecting still asks for the PIN."""
+    coordinator = init_integration.runtime_data
+    tracker = coordinator.latency.operation("get_temperature_async")
+    tracker.floor = 0.01
+    for _ in range(MIN_SAMPLES):
+        tracker.add(0.001)
+    assert tracker.timeout == 0.01
+
+    # The library gives up after its own timeout, longer than the adaptive one
+    async def get_temperature_async() -> dict:
+        await asyncio.sleep(0.05)
+        raise TimeoutError
+
+    mock_cometblue.get_temperature_async = get_temperature_async
+    with patch(f"{PACKAGE}.coordinator.PIN_CHECK_TIMEOUT", 1):
+        for _ in range(2):
+            await coordinator.async_refresh()
+            assert not coordinator.last_update_success
+
+    assert coordinator.retry_count == 0
+    assert coordinator.pin_rejected
+    await hass.async_block_till_done()
+    assert list(init_integration.async_get_active_flows(hass, {SOURCE_REAUTH}))
@@ -0,0 +1,51 @@
+"""Tests for the fleet health summary."""
+
+from __future__ import annotations
+
+from datetime import timedelta
+
+from freezegun.api import FrozenDateTimeFactory
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.eurotronic_cometblue.const import DOMAIN
+from custom_components.eurotronic_cometblue.coordinator import BATTERY_REFRESH_INTERVAL
+from custom_components.eurotronic_cometblue.fleet import DATA_FLEET_HEALTH
+from homeassistant.const import Platform
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+
+from . import ADDRESS, FakeCometBlue
+
+
+@pytest.mark.usefixtures("mock_bluetooth")
+async def test_low_battery_without_sensor(
+    hass: HomeAssistant,
+    entity_registry: er.EntityRegistry,
+    freezer: FrozenDateTimeFactory,
+    mock_config_entry: MockConfigEntry,
+    mock_cometblue: FakeCometBlue,
+) -> None:
+    """Test TRVs count as low on battery if their battery sensor is disabled."""
+    mock_config_entry.add_to_hass(hass)
+    entity_registry.async_get_or_create(
+        Platform.SENSOR,
+        DOMAIN,
+        f"{ADDRESS}-battery",
+        config_entry=mock_config_entry,
+        disabled_by=er.RegistryEntryDisabler.USER,
+    )
+    assert await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+    fleet = hass.data[DATA_FLEET_HEALTH]
+    assert fleet.reachable == 1
+    assert fleet.low_battery == 0
+
+    mock_cometblue.battery = 10
+    freezer.tick(BATTERY_REFRESH_INTERVAL + timedelta(seconds=1))
+    await mock_config_entry.runtime_data.async_refresh()
+    assert fleet.low_battery == 1
+
+    assert await hass.config_entries.async_unload(mock_config_entry.entry_id)
+    assert fleet.reachable == 0
+    assert fleet.low_battery == 0
@@ -0,0 +1,102 @@
+"""Tests for the temperature history of Comet Blue devices."""
+
+from __future__ import annotations
+
+from datetime import timedelta
+import math
+
+import pytest
+
+from custom_components.eurotronic_cometblue.history import TemperatureHistory
+
+# Seconds between samples at the regular poll interval
+POLL = 300
+
+
+def _add_ramp(
+    history: TemperatureHistory, start: float, samples: int, rate: float
+) -> float:
+    """Add samples rising by `rate` °C per hour and return the last timestamp."""
+    timestamp = start
+    for i in range(samples):
+        timestamp = start + i * POLL
+        history.add(timestamp, 18.0 + rate * i * POLL / 3600, 21.0)
+    return timestamp
+
+
+def test_heating_rate() -> None:
+    """Test the heating rate is the slope of the current temperature."""
+    history = TemperatureHistory()
+    assert history.heating_rate is None
+
+    history.add(1000.0, 18.0, 21.0)
+    history.add(1000.0 + POLL, 18.5, 21.0)
+    # Too few samples for a meaningful rate
+    assert history.heating_rate is None
+
+    history.add(1000.0 + 2 * POLL, 19.0, 21.0)
+    assert history.heating_rate == pytest.approx(6.0)
+
+
+def test_heating_rate_same_time() -> None:
+    """Test samples without a time span have no heating rate."""
+    history = TemperatureHistory()
+    for current in (18.0, 19.0, 20.0):
+        history.add(1000.0, current, 21.0)
+
+    assert history.heating_rate is None
+
+
+def test_heating_rate_window() -> None:
+    """Test only the samples of the last hour count for the heating rate."""
+    history = TemperatureHistory()
+    timestamp = _add_ramp(history, 1000.0, 24, -1.5)
+    assert history.heating_rate == pytest.approx(-1.5)
+
+    # The TRV starts heating, samples of it cooling down expire
+    current = 18.0 - 1.5 * 23 * POLL / 3600
+    for i in range(1, 13):
+        history.add(timestamp + i * POLL, current + 2.0 * i * POLL / 3600, 21.0)
+        assert history.heating_rate is not None
+
+    assert history.heating_rate == pytest.approx(2.0)
+    assert len(history) == 36
+
+
+def test_heating_rate_after_gap() -> None:
+    """Test samples older than the window expire even after a long pause."""
+    history = TemperatureHistory()
+    timestamp = _add_ramp(history, 1000.0, 12, 3.0)
+
+    # No samples for a day, e.g. while the TRV was out of range
+    history.add(timestamp + 86400, 20.0, 21.0)
+    assert history.heating_rate is None
+    history.add(timestamp + 86400 + POLL, 20.0, 21.0)
+    history.add(timestamp + 86400 + 2 * POLL, 20.0, 21.0)
+    assert history.heating_rate == pytest.approx(0.0, abs=1e-9)
+
+
+def test_ring_buffer() -> None:
+    """Test the oldest samples are overwritten once the history is full."""
+    history = TemperatureHistory(size=4, rate_window=timedelta(hours=8))
+    for i in range(10):
+        history.add(float(i * POLL), 18.0 + i, 20.0 + i)
+
+    assert len(history) == 4
+    assert list(history.samples()) == [
+        (float(i * POLL), 18.0 + i, 20.0 + i) for i in range(6, 10)
+    ]
+    # Overwritten samples leave the heating rate, even within its window
+    assert history.heating_rate == pytest.approx(3600 / POLL)
+
+
+def test_heating_rate_long_running() -> None:
+    """Test the running sums stay accurate over a long uptime."""
+    history = TemperatureHistory()
+    # About a year of samples while the temperature swings
+    for i in range(100_000):
+        history.add(1e6 + i * POLL, 20.0 + 3 * math.sin(i / 7), 21.0)
+
+    _add_ramp(history, 1e6 + 100_000 * POLL, 20, 2.0)
+
+    assert history.heating_rate == pytest.approx(2.0, abs=1e-4)
@@ -0,0 +1,129 @@
+"""Tests for the setup of Eurotronic Comet Blue entries."""
+
+from __future__ import annotations
+
+from unittest.mock import MagicMock, patch
+
+from bleak.backends.device import BLEDevice
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.eurotronic_cometblue.const import DOMAIN
+from homeassistant.config_entries import (
+    SOURCE_BLUETOOTH,
+    ConfigEntryDisabler,
+    ConfigEntryState,
+)
+from homeassistant.const import CONF_PIN
+from homeassistant.core import HomeAssistant
+from homeassistant.data_entry_flow import FlowResultType
+
+from . import ADDRESS, PACKAGE, FakeCometBlue, service_info
+
+
+@pytest.mark.usefixtures("mock_bluetooth")
+async def test_setup_entry(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    mock_cometblue: FakeCometBlue,
+) -> None:
+    """Test the setup reads the device info and refreshes in own sessions."""
+    mock_config_entry.add_to_hass(hass)
+
+    assert await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert mock_config_entry.state is ConfigEntryState.LOADED
+    coordinator = mock_config_entry.runtime_data
+    assert coordinator.address == ADDRESS
+    assert coordinator.data.temperatures["currentTemp"] == 20.0
+    assert mock_cometblue.connections == 2
+
+    assert await hass.config_entries.async_unload(mock_config_entry.entry_id)
+    assert mock_config_entry.state is ConfigEntryState.NOT_LOADED
+
+
+@pytest.mark.usefixtures("mock_bluetooth")
+async def test_setup_from_config_flow_handoff(
+    hass: HomeAssistant, ble_device: BLEDevice, mock_cometblue: FakeCometBlue
+) -> None:
+    """Test the entry is set up from the data read by the config flow."""
+    discovery_info = service_info(ble_device)
+    result = await hass.config_entries.flow.async_init(
+        DOMAIN, context={"source": SOURCE_BLUETOOTH}, data=discovery_info
+    )
+    assert result["step_id"] == "bluetooth_confirm"
+
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"], {CONF_PIN: "000000"}
+    )
+    await hass.async_block_till_done()
+
+    assert result["type"] is FlowResultType.CREATE_ENTRY
+    entry = result["result"]
+    assert entry.state is ConfigEntryState.LOADED
+    # Only the config flow connected, the setup took over its data
+    assert mock_cometblue.connections == 1
+    assert not hasattr(mock_cometblue, "client")
+    coordinator = entry.runtime_data
+    assert coordinator.address == ADDRESS
+    assert coordinator.data.battery == 80
+    assert coordinator.data.schedule.as_weekdays()["monday"] == {
+        "start1": "07:00",
+        "end1": "09:00",
+    }
+
+
+@pytest.mark.usefixtures("mock_bluetooth")
+async def test_setup_on_advertisement(
+    hass: HomeAssistant, ble_device: BLEDevice, mock_config_entry: MockConfigEntry
+) -> None:
+    """Test an entry waiting for its TRV is set up when the TRV advertises."""
+    mock_config_entry.add_to_hass(hass)
+    unsub = MagicMock()
+    with (
+        patch(f"{PACKAGE}.async_ble_device_from_address", return_value=None),
+        patch(
+            f"{PACKAGE}.async_register_callback", return_value=unsub
+        ) as mock_register,
+    ):
+        await hass.config_entries.async_setup(mock_config_entry.entry_id)
+        await hass.async_block_till_done()
+    assert mock_config_entry.state is ConfigEntryState.SETUP_RETRY
+    advertisement_callback = mock_register.call_args[0][1]
+
+    advertisement_callback(service_info(ble_device), None)
+    await hass.async_block_till_done()
+
+    assert mock_config_entry.state is ConfigEntryState.LOADED
+    unsub.assert_called_once()
+
+
+@pytest.mark.usefixtures("mock_bluetooth")
+async def test_unload_while_waiting_for_advertisement(
+    hass: HomeAssistant, ble_device: BLEDevice, mock_config_entry: MockConfigEntry
+) -> None:
+    """Test unloading an entry waiting for its TRV stops waiting."""
+    mock_config_entry.add_to_hass(hass)
+    unsub = MagicMock()
+    with (
+        patch(f"{PACKAGE}.async_ble_device_from_address", return_value=None),
+        patch(
+            f"{PACKAGE}.async_register_callback", return_value=unsub
+        ) as mock_register,
+    ):
+        await hass.config_entries.async_setup(mock_config_entry.entry_id)
+        await hass.async_block_till_done()
+    assert mock_config_entry.state is ConfigEntryState.SETUP_RETRY
+    advertisement_callback = mock_register.call_args[0][1]
+
+    await hass.config_entries.async_set_disabled_by(
+        mock_config_entry.entry_id, ConfigEntryDisabler.USER
+    )
+    await hass.async_block_till_done()
+    assert mock_config_entry.state is ConfigEntryState.NOT_LOADED
+    unsub.assert_called_once()
+
+    advertisement_callback(service_info(ble_device), None)
+    await hass.async_block_till_done()
+    assert mock_config_entry.state is ConfigEntryState.NOT_LOADED
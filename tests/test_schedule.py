@@ -0,0 +1,194 @@
+"""Tests for the Comet Blue weekday schedule helpers."""
+
+from __future__ import annotations
+
+from datetime import UTC, datetime
+
+import pytest
+
+from custom_components.eurotronic_cometblue.const import CONF_WEEKDAYS
+from custom_components.eurotronic_cometblue.schedule import (
+    WeekSchedule,
+    next_schedule_switch,
+)
+
+WORKDAY = {"start1": "06:00", "end1": "08:30", "start2": "17:00", "end2": "22:00"}
+
+
+def _week(**days: dict[str, str]) -> WeekSchedule:
+    """Return a schedule with the given days and all other days empty."""
+    return WeekSchedule.from_weekdays(
+        {weekday: days.get(weekday, {}) for weekday in CONF_WEEKDAYS}
+    )
+
+
+@pytest.mark.parametrize(
+    "day",
+    [
+        {},
+        {"start1": "07:00", "end1": "09:00"},
+        WORKDAY,
+        {
+            "start1": "00:00",
+            "end1": "01:00",
+            "start2": "06:00",
+            "end2": "08:00",
+            "start3": "12:00",
+            "end3": "13:00",
+            "start4": "18:00",
+            "end4": "23:50",
+        },
+    ],
+)
+def test_weekdays_round_trip(day: dict[str, str]) -> None:
+    """Test a day written by the TRV is read back unchanged."""
+    schedule = WeekSchedule.from_weekdays({"monday": day})
+
+    assert schedule.as_weekdays() == {"monday": day}
+    assert WeekSchedule.from_storage(schedule.as_storage()) == schedule
+
+
+def test_weekdays_normalized() -> None:
+    """Test schedules heating at the same times are equal."""
+    schedule = WeekSchedule.from_weekdays(
+        {
+            "monday": {
+                # Out of order, adjacent and truncated to 10 minutes
+                "start1": "17:00",
+                "end1": "22:05",
+                "start2": "06:00",
+                "end2": "07:00",
+                "start3": "07:00",
+                "end3": "08:30",
+                # Empty periods are ignored
+                "start4": "12:00",
+                "end4": "12:00",
+            }
+        }
+    )
+
+    assert schedule == WeekSchedule.from_weekdays({"monday": WORKDAY})
+    assert schedule.as_weekdays() == {"monday": WORKDAY}
+
+
+@pytest.mark.parametrize(
+    "day",
+    [
+        # Not a multiple of 10 minutes
+        {"start1": "07:00", "end1": "09:05"},
+        {"start1": "07:00:30", "end1": "09:00"},
+        # Merged into one period
+        {"start1": "06:00", "end1": "07:00", "start2": "07:00", "end2": "08:00"},
+        # Shorter than a slot
+        {"start1": "07:00", "end1": "07:05"},
+    ],
+)
+def test_weekdays_not_exact(day: dict[str, str]) -> None:
+    """Test periods the TRV would store differently are refused if exact."""
+    WeekSchedule.from_weekdays({"monday": day})
+
+    with pytest.raises(ValueError, match="monday can't be stored"):
+        WeekSchedule.from_weekdays({"monday": day}, exact=True)
+
+
+def test_weekdays_exact() -> None:
+    """Test periods the TRV stores as requested are accepted if exact."""
+    schedule = WeekSchedule.from_weekdays(
+        {"monday": {"start2": "06:00:00", "end2": "08:30:00"}, "tuesday": {}},
+        exact=True,
+    )
+
+    assert schedule.as_weekdays() == {
+        "monday": {"start1": "06:00", "end1": "08:30"},
+        "tuesday": {},
+    }
+
+
+def test_too_many_periods() -> None:
+    """Test a day with more periods than the TRV stores is refused."""
+    schedule = WeekSchedule.from_storage(["5555", None, None, None, None, None, None])
+
+    with pytest.raises(ValueError, match="monday has 8 heating periods"):
+        schedule.as_weekdays()
+
+
+def test_merge_and_changes() -> None:
+    """Test only the days differing from the TRV are written."""
+    current = _week(monday=WORKDAY, tuesday=WORKDAY)
+    update = WeekSchedule.from_weekdays(
+        {"monday": WORKDAY, "tuesday": {"start1": "08:00", "end1": "20:00"}}
+    )
+
+    assert bool(update)
+    assert not WeekSchedule()
+    assert current.changes(update) == ["tuesday"]
+    merged = current.merge(update)
+    assert merged.as_weekdays()["tuesday"] == {"start1": "08:00", "end1": "20:00"}
+    assert merged.days[2:] == current.days[2:]
+    assert merged.changes(update) == []
+
+
+@pytest.mark.parametrize(
+    ("now", "expected"),
+    [
+        # 2026-10-19 is a Monday
+        (datetime(2026, 10, 19, 5, 0, tzinfo=UTC), (6, 0, True)),
+        (datetime(2026, 10, 19, 6, 0, tzinfo=UTC), (8, 30, False)),
+        (datetime(2026, 10, 19, 12, 0, tzinfo=UTC), (17, 0, True)),
+        (datetime(2026, 10, 19, 21, 59, tzinfo=UTC), (22, 0, False)),
+    ],
+)
+def test_next_schedule_switch_today(
+    now: datetime, expected: tuple[int, int, bool]
+) -> None:
+    """Test the next switch point later the same day."""
+    hour, minute, comfort = expected
+    schedule = _week(monday=WORKDAY)
+
+    assert next_schedule_switch(schedule, now) == (
+        now.replace(hour=hour, minute=minute),
+        comfort,
+    )
+
+
+def test_next_schedule_switch_later_day() -> None:
+    """Test the next switch point is searched on the following days."""
+    schedule = _week(monday=WORKDAY, thursday={"start1": "07:00", "end1": "09:00"})
+    now = datetime(2026, 10, 19, 23, 0, tzinfo=UTC)
+
+    assert next_schedule_switch(schedule, now) == (
+        datetime(2026, 10, 22, 7, 0, tzinfo=UTC),
+        True,
+    )
+
+
+def test_next_schedule_switch_next_week() -> None:
+    """Test the switch point of the same weekday a week later is found."""
+    schedule = _week(monday=WORKDAY)
+    now = datetime(2026, 10, 19, 22, 0, tzinfo=UTC)
+
+    assert next_schedule_switch(schedule, now) == (
+        datetime(2026, 10, 26, 6, 0, tzinfo=UTC),
+        True,
+    )
+
+
+def test_next_schedule_switch_across_midnight() -> None:
+    """Test heating into the next day switches at its first period."""
+    schedule = _week(
+        monday={"start1": "18:00", "end1": "23:50"},
+        tuesday={"start1": "00:00", "end1": "06:00"},
+    )
+
+    assert next_schedule_switch(
+        schedule, datetime(2026, 10, 19, 23, 50, tzinfo=UTC)
+    ) == (datetime(2026, 10, 20, 0, 0, tzinfo=UTC), True)
+    assert next_schedule_switch(schedule, datetime(2026, 10, 20, 0, 0, tzinfo=UTC)) == (
+        datetime(2026, 10, 20, 6, 0, tzinfo=UTC),
+        False,
+    )
+
+
+def test_no_schedule_switch() -> None:
+    """Test a schedule without heating periods has no switch point."""
+    assert next_schedule_switch(_week(), datetime(2026, 10, 19, tzinfo=UTC)) is None
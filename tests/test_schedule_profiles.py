@@ -0,0 +1,132 @@
+"""Tests for the schedule profiles of Eurotronic Comet Blue devices."""
+
+from __future__ import annotations
+
+from typing import Any
+from unittest.mock import AsyncMock, patch
+
+from bleak.backends.device import BLEDevice
+from bleak_retry_connector import BleakNotFoundError
+from freezegun.api import FrozenDateTimeFactory
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.eurotronic_cometblue.const import CONF_OFFLINE_QUEUE, DOMAIN
+from custom_components.eurotronic_cometblue.coordinator import QUEUE_REPLAY_COOLDOWN
+from custom_components.eurotronic_cometblue.schedule_profiles import (
+    DATA_SCHEDULE_PROFILES,
+)
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import ServiceValidationError
+
+from . import ADDRESS, PACKAGE, FakeCometBlue, service_info
+
+ENTITY_ID = "climate.comet_blue_aa_bb_cc_dd_ee_ff"
+WORKDAY = {"start1": "06:00", "end1": "08:00"}
+
+
+@pytest.mark.usefixtures("mock_bluetooth")
+async def test_queued_profile_assigned_once_sent(
+    hass: HomeAssistant,
+    ble_device: BLEDevice,
+    freezer: FrozenDateTimeFactory,
+    mock_config_entry: MockConfigEntry,
+    mock_cometblue: FakeCometBlue,
+) -> None:
+    """Test a profile queued for an unreachable TRV is assigned once it was sent."""
+    mock_config_entry.add_to_hass(hass)
+    hass.config_entries.async_update_entry(
+        mock_config_entry, options={CONF_OFFLINE_QUEUE: True}
+    )
+    with patch(
+        f"{PACKAGE}.coordinator.bluetooth.async_register_callback",
+        return_value=lambda: None,
+    ) as mock_register:
+        assert await hass.config_entries.async_setup(mock_config_entry.entry_id)
+        await hass.async_block_till_done()
+    advertisement_callback = mock_register.call_args[0][1]
+    coordinator = mock_config_entry.runtime_data
+    schedule_profiles = hass.data[DATA_SCHEDULE_PROFILES]
+    await hass.services.async_call(
+        DOMAIN,
+        "set_schedule_profile",
+        {"profile": "work", "monday": WORKDAY},
+        blocking=True,
+    )
+
+    connect_async = mock_cometblue.connect_async
+    mock_cometblue.connect_async = AsyncMock(side_effect=BleakNotFoundError("gone"))
+    response = await hass.services.async_call(
+        DOMAIN,
+        "apply_schedule_profile",
+        {"profile": "work"},
+        blocking=True,
+        return_response=True,
+    )
+
+    assert response == {
+        "written": [],
+        "unchanged": [],
+        "queued": [ENTITY_ID],
+        "errors": {},
+    }
+    assert ADDRESS not in schedule_profiles.assignments
+    assert coordinator.data.schedule.as_weekdays()["monday"] == {
+        "start1": "07:00",
+        "end1": "09:00",
+    }
+
+    mock_cometblue.connect_async = connect_async
+    advertisement_callback(service_info(ble_device), None)
+    await hass.async_block_till_done()
+
+    assert mock_cometblue.weekdays["monday"] == WORKDAY
+    assert coordinator.data.schedule.as_weekdays()["monday"] == WORKDAY
+    assert schedule_profiles.assignments[ADDRESS] == "work"
+    assert hass.states.get(ENTITY_ID).attributes["schedule_profile"] == "work"
+
+    # An own schedule replaces the profile once it was sent as well
+    mock_cometblue.connect_async = AsyncMock(side_effect=BleakNotFoundError("gone"))
+    await hass.services.async_call(
+        DOMAIN,
+        "set_schedule",
+        {"entity_id": ENTITY_ID, "tuesday": WORKDAY},
+        blocking=True,
+    )
+    assert schedule_profiles.assignments[ADDRESS] == "work"
+
+    mock_cometblue.connect_async = connect_async
+    freezer.tick(QUEUE_REPLAY_COOLDOWN)
+    advertisement_callback(service_info(ble_device), None)
+    await hass.async_block_till_done()
+
+    assert mock_cometblue.weekdays["tuesday"] == WORKDAY
+    assert ADDRESS not in schedule_profiles.assignments
+    assert not schedule_profiles.pending
+
+
+@pytest.mark.usefixtures("init_integration")
+@pytest.mark.parametrize(
+    ("service", "data"),
+    [
+        ("set_schedule", {"entity_id": ENTITY_ID}),
+        ("set_schedule_profile", {"profile": "work"}),
+    ],
+)
+async def test_schedule_not_exact(
+    hass: HomeAssistant,
+    mock_cometblue: FakeCometBlue,
+    service: str,
+    data: dict[str, Any],
+) -> None:
+    """Test a schedule the TRV can't store as requested is refused."""
+    with pytest.raises(ServiceValidationError, match="monday can't be stored"):
+        await hass.services.async_call(
+            DOMAIN,
+            service,
+            {**data, "monday": {"start1": "06:00", "end1": "08:05"}},
+            blocking=True,
+        )
+
+    assert mock_cometblue.weekdays["monday"] == {"start1": "07:00", "end1": "09:00"}
+    assert not hass.data[DATA_SCHEDULE_PROFILES].profiles
@@ -0,0 +1,62 @@
+"""Tests for polling in sweep mode."""
+
+from __future__ import annotations
+
+from datetime import timedelta
+from unittest.mock import patch
+
+from freezegun.api import FrozenDateTimeFactory
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
+
+from custom_components.eurotronic_cometblue.const import CONF_SWEEP_POLLING
+from custom_components.eurotronic_cometblue.sweep import DATA_SWEEP_POLLER
+from custom_components.eurotronic_cometblue.tuning import PerformanceProfile
+from homeassistant.core import HomeAssistant
+
+from . import PACKAGE, FakeCometBlue
+
+
+async def test_sweep_follows_poll_interval(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    init_integration: MockConfigEntry,
+    mock_cometblue: FakeCometBlue,
+) -> None:
+    """Test the sweep runs as often as the performance profile polls."""
+    coordinator = init_integration.runtime_data
+    hass.config_entries.async_update_entry(
+        init_integration,
+        options={
+            CONF_SWEEP_POLLING: True,
+            "performance_profile": PerformanceProfile.RESPONSIVE,
+        },
+    )
+    await hass.async_block_till_done()
+    poller = hass.data[DATA_SWEEP_POLLER]
+    assert coordinator.update_interval is None
+    assert poller.interval == timedelta(minutes=2)
+
+    connections = mock_cometblue.connections
+    with patch(f"{PACKAGE}.sweep.bluetooth.async_last_service_info", return_value=None):
+        freezer.tick(timedelta(minutes=2))
+        async_fire_time_changed(hass)
+        await hass.async_block_till_done()
+    assert mock_cometblue.connections == connections + 1
+
+    hass.config_entries.async_update_entry(
+        init_integration,
+        options={
+            CONF_SWEEP_POLLING: True,
+            "performance_profile": PerformanceProfile.BATTERY_SAVER,
+        },
+    )
+    await hass.async_block_till_done()
+    assert poller.interval == timedelta(minutes=15)
+
+    hass.config_entries.async_update_entry(init_integration, options={})
+    await hass.async_block_till_done()
+    assert DATA_SWEEP_POLLER not in hass.data
+    assert coordinator.update_interval == timedelta(minutes=5)